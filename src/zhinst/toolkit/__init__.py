@@ -12,11 +12,12 @@ especially for device management and multiple AWG distributed control.
 """
 
 from zhinst.toolkit.command_table import CommandTable
+from zhinst.toolkit.compiler_cache import CompilerCache
 from zhinst.toolkit.driver.modules.pid_advisor_module import PIDMode
 from zhinst.toolkit.interface import AveragingMode, SHFQAChannelMode
 from zhinst.toolkit.sequence import Sequence
 from zhinst.toolkit.session import PollFlags, Session
-from zhinst.toolkit.waveform import Waveforms
+from zhinst.toolkit.waveform import ArenaWaveforms, LazyWave, Waveforms
 
 try:
     from zhinst.toolkit._version import version as __version__
@@ -24,8 +25,11 @@ except ModuleNotFoundError:  # pragma: no cover
     pass
 
 __all__ = [
+    "ArenaWaveforms",
     "AveragingMode",
     "CommandTable",
+    "CompilerCache",
+    "LazyWave",
     "PIDMode",
     "PollFlags",
     "SHFQAChannelMode",
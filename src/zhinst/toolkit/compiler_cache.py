@@ -0,0 +1,275 @@
+"""Persistent cache for compiled sequencer programs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import typing as t
+from collections import namedtuple
+from pathlib import Path
+
+from zhinst.core import __version__ as core_version
+from zhinst.core import compile_seqc
+
+from zhinst.toolkit.sequence import Sequence
+
+logger = logging.getLogger(__name__)
+
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "entries", "size"])
+
+_ELF_SUFFIX = ".elf"
+_INFO_SUFFIX = ".json"
+
+
+class CompilerCache:
+    """Content addressed on-disk cache for compiled sequencer programs.
+
+    Every entry consists of the ELF and the compiler output of a sequencer
+    program. The key of an entry is a hash of everything that influences
+    the compilation: the sequencer program, the device type and options,
+    the AWG index, the compiler arguments (e.g. samplerate or sequencer) and
+    the version of the compiler.
+
+    If the total size of the cache exceeds ``max_size`` the least recently
+    used entries are removed. The cache directory can be shared between
+    processes.
+
+    Warning:
+        The content of waveform files referenced by the sequencer program
+        (e.g. through ``wavepath``) is not part of the key.
+
+    Args:
+        directory: Directory of the cache.
+            (default = ``~/.cache/zhinst-toolkit/seqc``)
+        max_size: Maximum size of the cache in bytes. (default = 256 MiB)
+
+    Example:
+        >>> cache = CompilerCache()
+        >>> CompilerCache.set_default(cache)
+        >>> device.awgs[0].load_sequencer_program(seqc)  # compiled
+        >>> device.awgs[0].load_sequencer_program(seqc)  # loaded from the cache
+        >>> cache.stats
+        CacheStats(hits=1, misses=1, entries=1, size=1304)
+    """
+
+    _default: t.Optional[CompilerCache] = None
+
+    def __init__(
+        self,
+        directory: t.Optional[t.Union[str, Path]] = None,
+        *,
+        max_size: int = 256 * 1024**2,
+    ):
+        self._directory = (
+            Path(directory)
+            if directory is not None
+            else Path.home() / ".cache" / "zhinst-toolkit" / "seqc"
+        )
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"CompilerCache({str(self._directory)!r})"
+
+    @classmethod
+    def set_default(cls, cache: t.Optional[CompilerCache]) -> None:
+        """Set the cache used by all AWGs without a cache of their own.
+
+        Args:
+            cache: Default cache. ``None`` disables the default cache.
+        """
+        cls._default = cache
+
+    @classmethod
+    def default(cls) -> t.Optional[CompilerCache]:
+        """Cache used by all AWGs without a cache of their own."""
+        return cls._default
+
+    @staticmethod
+    def key(
+        sequencer_program: t.Union[str, Sequence],
+        device_type: str,
+        device_options: t.Union[str, t.Sequence[str]],
+        index: int,
+        **kwargs: t.Union[str, float],
+    ) -> str:
+        """Key of a compilation.
+
+        Takes the same arguments as ``zhinst.core.compile_seqc``. The program
+        only enters the key through its hash, which is reused for ``Sequence``
+        objects (``Sequence.content_hash``).
+
+        Returns:
+            Hex digest that identifies the compilation.
+        """
+        if isinstance(sequencer_program, Sequence):
+            program_hash = sequencer_program.content_hash
+        else:
+            program_hash = hashlib.sha256(str(sequencer_program).encode()).hexdigest()
+        if not isinstance(device_options, str):
+            device_options = "\n".join(device_options)
+        content = json.dumps(
+            [
+                program_hash,
+                device_type.upper(),
+                sorted(device_options.upper().split()),
+                int(index),
+                sorted((key, str(value)) for key, value in kwargs.items()),
+                core_version,
+            ],
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self._directory / f"{key}{suffix}"
+
+    def get(self, key: str) -> t.Optional[tuple[bytes, dict[str, t.Any]]]:
+        """Look up a compilation.
+
+        Args:
+            key: Key of the compilation (see ``key``).
+
+        Returns:
+            ELF and compiler output or ``None`` if the key is not cached.
+        """
+        elf_path = self._path(key, _ELF_SUFFIX)
+        try:
+            info = json.loads(self._path(key, _INFO_SUFFIX).read_text())
+            elf = elf_path.read_bytes()
+            os.utime(elf_path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return elf, info
+
+    def put(self, key: str, elf: bytes, info: dict[str, t.Any]) -> None:
+        """Add a compilation to the cache.
+
+        Args:
+            key: Key of the compilation (see ``key``).
+            elf: Binary ELF data of the sequencer program.
+            info: Compiler output.
+        """
+        # The info is written last, since it marks the entry as complete.
+        self._write(self._path(key, _ELF_SUFFIX), elf)
+        self._write(self._path(key, _INFO_SUFFIX), json.dumps(info).encode())
+        self._evict()
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Atomically write a file of the cache."""
+        file, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(file, "wb") as stream:
+                stream.write(data)
+            Path(temp_path).replace(path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """Modification time, size and key of all entries."""
+        entries = []
+        for elf_path in self._directory.glob(f"*{_ELF_SUFFIX}"):
+            info_path = elf_path.with_suffix(_INFO_SUFFIX)
+            try:
+                stat = elf_path.stat()
+                size = stat.st_size + info_path.stat().st_size
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, size, elf_path.stem))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the size bound holds."""
+        entries = sorted(self._entries())
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, key in entries:
+            if size <= self._max_size:
+                break
+            self._remove(key)
+            size -= entry_size
+
+    def _remove(self, key: str) -> None:
+        for suffix in (_INFO_SUFFIX, _ELF_SUFFIX):
+            self._path(key, suffix).unlink(missing_ok=True)
+
+    def compile(
+        self,
+        sequencer_program: str,
+        device_type: str,
+        device_options: t.Union[str, t.Sequence[str]],
+        index: int,
+        **kwargs: t.Union[str, float],
+    ) -> tuple[bytes, dict[str, t.Any]]:
+        """Compile a sequencer program or load it from the cache.
+
+        Takes the same arguments as ``zhinst.core.compile_seqc``.
+
+        Returns:
+            elf: Binary ELF data for sequencer.
+            extra: Extra dictionary with compiler output.
+
+        Raises:
+            RuntimeError: If the compilation failed.
+        """
+        key = self.key(sequencer_program, device_type, device_options, index, **kwargs)
+        cached = self.get(key)
+        if cached is not None:
+            logger.debug(f"Loaded sequencer program {key} from the compiler cache.")
+            return cached
+        elf, info = compile_seqc(
+            sequencer_program,
+            device_type,
+            device_options,
+            index,
+            **kwargs,
+        )
+        try:
+            self.put(key, elf, info)
+        except OSError as error:
+            logger.warning(f"Unable to add {key} to the compiler cache: {error}")
+        return elf, info
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        for _, _, key in self._entries():
+            self._remove(key)
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    @property
+    def directory(self) -> Path:
+        """Directory of the cache."""
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        """Maximum size of the cache in bytes."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int) -> None:
+        self._max_size = value
+        self._evict()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hits and misses since the creation and current number/size of entries."""
+        entries = self._entries()
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            entries=len(entries),
+            size=sum(entry[1] for entry in entries),
+        )
@@ -19,9 +19,12 @@ from zhinst.core import __version__ as zhinst_version_str
 from zhinst.utils._version import version as utils_version_str
 
 from zhinst.toolkit._min_version import _MIN_DEVICE_UTILS_VERSION, _MIN_LABONE_VERSION
+from zhinst.toolkit.driver.nodes.awg import AWG
 from zhinst.toolkit.driver.parsers import node_parser
 from zhinst.toolkit.exceptions import ToolkitError
 from zhinst.toolkit.nodetree import Node, NodeTree
+from zhinst.toolkit.nodetree.helper import NodeDoc
+from zhinst.toolkit.nodetree.node import NodeList
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +46,10 @@ class BaseInstrument(Node):
             The serial number can be found on the back panel of the instrument.
         device_type: Type of the device.
         session: Session to the Data Server
+        options: Enabled options of the device. If not specified they are read
+            from the device. (default = None)
+        preloaded_json: Optional preloaded node information of the device.
+            If not specified it is read from the data server. (default = None)
     """
 
     def __init__(
@@ -50,19 +57,23 @@ class BaseInstrument(Node):
         serial: str,
         device_type: str,
         session: Session,
+        *,
+        options: t.Optional[str] = None,
+        preloaded_json: t.Optional[NodeDoc] = None,
     ):
         self._serial = serial
         self._device_type = device_type
         self._session = session
-        try:
-            self._options = session.daq_server.getString(f"/{serial}/features/options")
-        except RuntimeError:
-            self._options = ""
+        if options is None:
+            try:
+                options = session.daq_server.getString(f"/{serial}/features/options")
+            except RuntimeError:
+                options = ""
+        self._options = options
 
         # HF2 does not support listNodesJSON so we have the information hardcoded
         # (the node of HF2 will not change any more so this is safe)
-        preloaded_json = None
-        if "HF2" in self._device_type:
+        if preloaded_json is None and "HF2" in self._device_type:
             preloaded_json = self._load_preloaded_json(
                 Path(__file__).parent / "../../resources/nodedoc_hf2.json",
             )
@@ -106,6 +117,9 @@ class BaseInstrument(Node):
                 given timeout.
         """
         self.system.preset.load(1, deep=deep)
+        # The preset removes the sequencer programs and waveforms
+        for awg in self._created_awgs():
+            awg.reset_upload_state()
         self.system.preset.busy.wait_for_state_change(0, timeout=timeout)
         if self.system.preset.error(deep=True)[1]:
             msg = f"Failed to load factory preset to device {self.serial.upper()}."
@@ -114,6 +128,32 @@ class BaseInstrument(Node):
             )
         logger.info(f"Factory preset is loaded to device {self.serial.upper()}.")
 
+    def _created_awgs(self) -> list[AWG]:
+        """AWG cores of the device that have been created so far.
+
+        AWG cores are created lazily by the device specific drivers (e.g.
+        ``awgs`` or ``sgchannels[0].awg``). Cores that have not been created
+        yet have no state to reset.
+
+        Returns:
+            AWG core nodes.
+        """
+        awgs: list[AWG] = []
+        visited = {id(self)}
+        pending: list[t.Any] = list(vars(self).values())
+        while pending:
+            value = pending.pop()
+            if id(value) in visited or isinstance(value, BaseInstrument):
+                continue
+            visited.add(id(value))
+            if isinstance(value, AWG):
+                awgs.append(value)
+            elif isinstance(value, NodeList):
+                pending.extend(value._elements)
+            elif isinstance(value, Node):
+                pending.extend(vars(value).values())
+        return awgs
+
     @staticmethod
     def _version_string_to_tuple(version: str) -> tuple[int, int, int, int]:
         """Converts a version string into a version tuple.
@@ -88,6 +88,7 @@ class HDAWG(BaseInstrument):
                     i,
                     self.device_type,
                     self.device_options,
+                    session=self._session,
                 )
                 for i in range(len(self["awgs"]))
             ],
@@ -9,7 +9,7 @@ from functools import cached_property
 import zhinst.utils.shfqa as utils
 
 from zhinst.toolkit.driver.devices.shf import SHF
-from zhinst.toolkit.driver.nodes.awg import AWG
+from zhinst.toolkit.driver.nodes.awg import _UPLOAD_BATCH_BYTES, AWG
 from zhinst.toolkit.driver.nodes.readout import Readout
 from zhinst.toolkit.driver.nodes.shfqa_scope import SHFScope
 from zhinst.toolkit.driver.nodes.spectroscopy import Spectroscopy
@@ -21,7 +21,7 @@ from zhinst.toolkit.nodetree.helper import (
     not_callable_in_transactions,
 )
 from zhinst.toolkit.nodetree.node import NodeList
-from zhinst.toolkit.waveform import Waveforms
+from zhinst.toolkit.waveform import UploadStats, Waveforms
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +49,7 @@ class Generator(AWG):
         max_qubits_per_channel: Max qubits per channel
         device_type: Type of the device.
         device_options: Options of the device.
+        session: Session of the device. (default = None)
     """
 
     def __init__(
@@ -60,8 +61,18 @@ class Generator(AWG):
         max_qubits_per_channel: int,
         device_type: str,
         device_options: str,
+        *,
+        session: t.Optional[Session] = None,
     ):
-        super().__init__(root, tree, serial, index, device_type, device_options)
+        super().__init__(
+            root,
+            tree,
+            serial,
+            index,
+            device_type,
+            device_options,
+            session=session,
+        )
         self._max_qubits_per_channel = max_qubits_per_channel
 
     def write_to_waveform_memory(
@@ -69,13 +80,24 @@ class Generator(AWG):
         pulses: t.Union[Waveforms, dict],
         *,
         clear_existing: bool = True,
-    ) -> None:
+        skip_unchanged: bool = False,
+    ) -> UploadStats:
         """Writes pulses to the waveform memory.
 
+        ``Waveforms`` are converted and uploaded in batches of up to 64 MiB,
+        one transaction per batch (see ``AWG.write_to_waveform_memory``). The
+        waveform memory is cleared in the transaction of the first batch.
+
         Args:
             pulses: Waveforms that should be uploaded.
             clear_existing: Flag whether to clear the waveform memory before the
                 present upload. (default = True)
+            skip_unchanged: Flag if pulses that did not change since their last
+                upload are skipped (see ``AWG.write_to_waveform_memory``). Has
+                no effect if ``clear_existing`` is set. (default = False)
+
+        Returns:
+            Number of uploaded and skipped pulses and their size in bytes.
         """
         if (
             len(pulses.keys()) > 0
@@ -88,17 +110,32 @@ class Generator(AWG):
             raise ToolkitError(
                 msg,
             )
-        with create_or_append_set_transaction(self._root):
-            if clear_existing:
-                self.clearwave(1)
-            if isinstance(pulses, Waveforms):
-                for slot in pulses:
-                    self.waveforms[slot].wave(
-                        pulses.get_raw_vector(slot, complex_output=True),
-                    )
-            else:
-                for slot, waveform in pulses.items():
-                    self.waveforms[slot].wave(waveform)
+        batches: t.Iterable[dict[int, t.Any]] = [dict(pulses)]
+        if isinstance(pulses, Waveforms):
+            batches = pulses.iter_raw_vectors(
+                complex_output=True,
+                max_bytes=_UPLOAD_BATCH_BYTES,
+            )
+        stats = UploadStats(0, 0, 0, 0)
+        clear = clear_existing
+        for vectors in batches:
+            with create_or_append_set_transaction(self._root):
+                if clear:
+                    self.clearwave(1)
+                    self._waveform_digests.clear()
+                    clear = False
+                batch_stats = self._upload_waveforms(
+                    vectors,
+                    lambda slot: self.waveforms[slot].wave,
+                    skip_unchanged=skip_unchanged and not clear_existing,
+                )
+            stats = UploadStats(
+                *(a + b for a, b in zip(stats, batch_stats, strict=True)),
+            )
+        if clear:
+            self.clearwave(1)
+            self._waveform_digests.clear()
+        return stats
 
     def read_from_waveform_memory(
         self,
@@ -119,11 +156,9 @@ class Generator(AWG):
                 nodes.append(self.waveforms[slot].wave.node_info.path)
         else:
             nodes.append(self.waveforms["*"].wave.node_info.path)
-        nodes_str = ",".join(nodes)
-        waveforms_raw = self._daq_server.get(nodes_str, settingsonly=False, flat=True)
         waveforms = Waveforms()
-        for slot, waveform in enumerate(waveforms_raw.values()):
-            waveforms[slot] = waveform[0]["vector"]
+        for slot, vector in self._read_vectors(nodes).items():
+            waveforms[slot] = vector
         return waveforms
 
     def configure_sequencer_triggering(
@@ -228,6 +263,7 @@ class QAChannel(Node):
             self._device.max_qubits_per_channel,
             self._device.device_type,
             self._device.device_options,
+            session=self._device._session,
         )
 
     @cached_property
@@ -254,6 +254,7 @@ class SGChannel(Node):
             self._index,
             self._device.device_type,
             self._device.device_options,
+            session=self._device._session,
         )
 
 
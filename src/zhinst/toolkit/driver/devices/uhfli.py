@@ -40,6 +40,7 @@ class UHFLI(BaseInstrument):
                     i,
                     self.device_type,
                     self.device_options,
+                    session=self._session,
                 )
                 for i in range(len(self["awgs"]))
             ],
@@ -57,10 +57,8 @@ class Integration(Node):
             If only real or imaginary part is defined, the number of defined samples
             from the other one is zeroed.
         """
-        waveform_dict = {}
         if isinstance(weights, Waveforms):
-            for slot in weights:
-                waveform_dict[slot] = weights.get_raw_vector(slot, complex_output=True)
+            waveform_dict = weights.get_raw_vectors(complex_output=True)
         else:
             waveform_dict = weights
         with create_or_append_set_transaction(self._root):
@@ -7,6 +7,12 @@ from zhinst.toolkit.driver.modules.daq_module import DAQModule
 from zhinst.toolkit.driver.modules.data_streaming_module import DataStreamingModule
 from zhinst.toolkit.driver.modules.device_settings_module import DeviceSettingsModule
 from zhinst.toolkit.driver.modules.impedance_module import ImpedanceModule
+from zhinst.toolkit.driver.modules.multi_shfqa_sweeper import MultiSHFQASweeper
+from zhinst.toolkit.driver.modules.nested_sweeper import (
+    NestedSweeper,
+    NestedSweepResult,
+    SweepAxis,
+)
 from zhinst.toolkit.driver.modules.pid_advisor_module import PIDAdvisorModule
 from zhinst.toolkit.driver.modules.precompensation_advisor_module import (
     PrecompensationAdvisorModule,
@@ -37,10 +43,14 @@ __all__ = [
     "DeviceSettingsModule",
     "ImpedanceModule",
     "ModuleType",
+    "MultiSHFQASweeper",
+    "NestedSweepResult",
+    "NestedSweeper",
     "PIDAdvisorModule",
     "PrecompensationAdvisorModule",
     "SHFQASweeper",
     "ScopeModule",
+    "SweepAxis",
     "SweeperModule",
     "TimelineModule",
 ]
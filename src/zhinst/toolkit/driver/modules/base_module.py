@@ -6,16 +6,20 @@ the module specific nodetree.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 import time
 import typing as t
+from concurrent.futures import CancelledError, Future
 from functools import partial
 from os import PathLike, fspath
 
 from zhinst.core import ModuleBase
 
 from zhinst.toolkit.nodetree import Node, NodeTree
-from zhinst.toolkit.nodetree.helper import NodeDict
+from zhinst.toolkit.nodetree.helper import NodeDict, NodeDoc
+from zhinst.toolkit.streaming import resolve_clockbases, to_structured
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,10 @@ if t.TYPE_CHECKING:  # pragma: no cover
     from zhinst.toolkit.session import Session
 
 ZIModule = t.TypeVar("ZIModule", bound=ModuleBase)
+ProgressCallback = t.Callable[[float], None]
+
+# Initial interval in seconds between two state checks of a module
+MIN_SLEEP_TIME = 0.01
 
 
 class BaseModule(Node):
@@ -38,12 +46,21 @@ class BaseModule(Node):
     Args:
         raw_module: zhinst.core module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module. If
+            specified the nodes are not listed from the module.
+            (default = None)
     """
 
-    def __init__(self, raw_module: ZIModule, session: Session):
+    def __init__(
+        self,
+        raw_module: ZIModule,
+        session: Session,
+        *,
+        preloaded_json: t.Optional[NodeDoc] = None,
+    ):
         self._raw_module = raw_module
         self._session = session
-        super().__init__(NodeTree(raw_module), ())
+        super().__init__(NodeTree(raw_module, preloaded_json=preloaded_json), ())
         self.root.update_nodes(
             {
                 "/device": {
@@ -153,33 +170,141 @@ class BaseModule(Node):
             path = path.absolute()  # type: ignore[union-attr]
         return fspath(path)
 
-    def wait_done(self, *, timeout: float = 20.0, sleep_time: float = 0.5) -> None:
+    def _wait(
+        self,
+        state: t.Callable[[], tuple[bool, float]],
+        *,
+        timeout: float,
+        sleep_time: float,
+        progress_callback: t.Optional[ProgressCallback] = None,
+        cancel: t.Optional[threading.Event] = None,
+    ) -> bool:
+        """Wait engine shared by the modules.
+
+        The state of the module is checked with a short interval first, which
+        is increased exponentially up to ``sleep_time``. That way short
+        executions return almost immediately while long executions do not
+        flood the data server with requests.
+
+        Args:
+            state: Function that returns whether the module is done and its
+                current progress. Called exactly once per check.
+            timeout: The maximum waiting time in seconds.
+            sleep_time: Maximum time in seconds to wait between two checks.
+            progress_callback: Function called with the progress (between 0
+                and 1) every time it changes. (default = None)
+            cancel: Event that aborts the waiting when set. (default = None)
+
+        Returns:
+            Flag if the module is done. (``False`` if the timeout was reached)
+
+        Raises:
+            CancelledError: The waiting was canceled through ``cancel``.
+        """
+        cancel = cancel or threading.Event()
+        deadline = time.monotonic() + timeout
+        interval = min(MIN_SLEEP_TIME, sleep_time)
+        last_progress = None
+        while True:
+            done, progress = state()
+            if progress != last_progress:
+                last_progress = progress
+                logger.info(f"Progress: {(progress * 100):.1f}%")
+                if progress_callback is not None:
+                    progress_callback(progress)
+            remaining = deadline - time.monotonic()
+            if done or remaining < 0:
+                return done
+            if cancel.wait(min(interval, remaining)):
+                msg = f"Waiting for {self._raw_module.__class__.__name__} canceled."
+                raise CancelledError(msg)
+            interval = min(interval * 2, sleep_time)
+
+    def wait_done(
+        self,
+        *,
+        timeout: float = 20.0,
+        sleep_time: float = 0.5,
+        progress_callback: t.Optional[ProgressCallback] = None,
+        cancel: t.Optional[threading.Event] = None,
+    ) -> None:
         """Waits until the module is finished.
 
         Warning: Only usable for modules that make use of the `/finished` node.
 
+        The state is checked with a short interval first, which is increased
+        up to ``sleep_time``, so that short executions return without delay.
+
         Args:
             timeout (float): The maximum waiting time in seconds for the
                 measurement (default: 20).
-            sleep_time (int): Time in seconds to wait between
-                requesting sweeper state. (default: 0.5)
+            sleep_time (int): Maximum time in seconds to wait between
+                requesting the module state. (default: 0.5)
+            progress_callback: Function called with the progress (between 0
+                and 1) every time it changes. (default = None)
+            cancel: Event that aborts the waiting when set. (default = None)
 
         Raises:
             TimeoutError: The measurement is not completed before
                 timeout.
+            CancelledError: The waiting was canceled through ``cancel``.
         """
-        start_time = time.time()
-        while (
-            start_time + timeout >= time.time()
-            and not self._raw_module.finished()
-            and self.progress() != 1
+
+        def state() -> tuple[bool, float]:
+            finished = self._raw_module.finished()
+            progress = self.progress()
+            return bool(finished) or progress == 1, progress
+
+        if not self._wait(
+            state,
+            timeout=timeout,
+            sleep_time=sleep_time,
+            progress_callback=progress_callback,
+            cancel=cancel,
         ):
-            logger.info(f"Progress: {(self.progress() * 100):.1f}%")
-            time.sleep(sleep_time)
-        if not self._raw_module.finished() and self.progress() != 1:
             msg = f"{self._raw_module.__class__.__name__} timed out."
             raise TimeoutError(msg)
-        logger.info(f"Progress: {(self.progress() * 100):.1f}%")
+
+    def wait_done_future(self, *args, **kwargs) -> Future:
+        """Wait until the module is finished in a background thread.
+
+        Takes the same arguments as ``wait_done``.
+
+        Returns:
+            Future that is resolved once ``wait_done`` returns or raises.
+        """
+        future: Future = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                self.wait_done(*args, **kwargs)
+                future.set_result(None)
+            except BaseException as error:  # noqa: BLE001
+                future.set_exception(error)
+
+        threading.Thread(
+            target=run,
+            name="zhinst-toolkit-wait-done",
+            daemon=True,
+        ).start()
+        return future
+
+    async def wait_done_async(self, *args, **kwargs) -> None:
+        """Awaitable version of ``wait_done``.
+
+        Takes the same arguments as ``wait_done``. The module state is
+        checked in a background thread, so that the event loop is not
+        blocked. Canceling the awaiting task also stops the waiting thread.
+        """
+        cancel = kwargs.pop("cancel", None) or threading.Event()
+        future = self.wait_done_future(*args, cancel=cancel, **kwargs)
+        try:
+            await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
 
     def progress(self) -> float:
         """Progress of the execution.
@@ -223,15 +348,38 @@ class BaseModule(Node):
         """
         self._raw_module.execute()
 
-    def read(self) -> NodeDict:
+    def read(self, *, structured: bool = False) -> NodeDict:
         """Read scope data.
 
         If the recording is still ongoing only a subset of data is returned.
 
+        Args:
+            structured: Flag if the data of each node should be converted
+                into a numpy structured array (see
+                ``zhinst.toolkit.streaming.to_structured_array``).
+                (default = False)
+
         Returns:
             Scope data.
         """
-        return NodeDict(self._raw_module.read(flat=True))
+        result = self._raw_module.read(flat=True)
+        if structured:
+            result = self._to_structured(result)
+        return NodeDict(result)
+
+    def _to_structured(self, result: dict[str, t.Any]) -> dict[str, t.Any]:
+        """Convert a flat read result into numpy structured arrays.
+
+        Args:
+            result: Flat read result of the module.
+
+        Returns:
+            Result with the data of each node converted.
+        """
+        return to_structured(
+            result,
+            resolve_clockbases(result, self._session.clockbase),
+        )
 
     @property
     def raw_module(self) -> ZIModule:  # type: ignore [type-var]
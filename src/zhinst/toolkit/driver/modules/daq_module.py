@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 import typing as t
 from collections import namedtuple
 
@@ -11,12 +12,19 @@ from zhinst.core import DataAcquisitionModule as ZIDAQModule
 
 from zhinst.toolkit.driver.modules.base_module import BaseModule
 from zhinst.toolkit.nodetree.helper import NodeDict
+from zhinst.toolkit.streaming import device_serial, timestamps_to_seconds
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
+DEFAULT_CLK_RATE = 60e6
 DAQResult = namedtuple("DAQResult", ["header", "value", "time", "frequency", "shape"])
+DAQStackedResult = namedtuple(
+    "DAQStackedResult",
+    ["header", "value", "time", "frequency", "timestamp", "shape"],
+)
 
 
 class DAQModule(BaseModule):
@@ -34,10 +42,19 @@ class DAQModule(BaseModule):
     Args:
         daq_module: Instance of the core DAQ module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, daq_module: ZIDAQModule, session: Session):
-        super().__init__(daq_module, session)
+    def __init__(
+        self,
+        daq_module: ZIDAQModule,
+        session: Session,
+        *,
+        preloaded_json: t.Optional[NodeDoc] = None,
+    ):
+        super().__init__(daq_module, session, preloaded_json=preloaded_json)
+        self._last_burst: dict[str, int] = {}
         self.root.update_nodes(
             {
                 "/triggernode": {
@@ -48,6 +65,82 @@ class DAQModule(BaseModule):
             raise_for_invalid_node=False,
         )
 
+    @staticmethod
+    def _fft_frequency(node: str, burst: dict[str, t.Any]) -> np.ndarray:
+        """Frequency axis of a FFT burst.
+
+        Args:
+            node: Name of the node of the burst.
+            burst: raw burst data.
+
+        Returns:
+            Frequency of each bin.
+        """
+        bin_count = len(burst["value"][0])
+        bin_resolution = burst["header"]["gridcoldelta"]
+        frequency = np.arange(bin_count)
+        bandwidth = bin_resolution * len(frequency)
+        frequency = frequency * bin_resolution
+        if "xiy" in node:
+            frequency = frequency - bandwidth / 2.0 + bin_resolution / 2.0
+        return frequency
+
+    @staticmethod
+    def _stack_bursts(
+        node: str,
+        bursts: list[dict[str, t.Any]],
+        clk_rate: float,
+    ) -> DAQStackedResult:
+        """Stack all bursts of a node into a single DAQStackedResult object.
+
+        The value array is allocated once with the grid shape of the first
+        burst. The time or frequency axis is shared by all bursts and
+        therefore only computed once.
+
+        Args:
+            node: Name of the node of the bursts.
+            bursts: raw burst data.
+            clk_rate: Clock rate [Hz] for converting the timestamps.
+
+        Returns:
+            Stacked burst data.
+
+        Raises:
+            ValueError: If the bursts have different shapes.
+        """
+        first = bursts[0]
+        shape = first["value"].shape
+        value = np.empty((len(bursts), *shape), dtype=first["value"].dtype)
+        timestamp = np.zeros(len(bursts), dtype=np.uint64)
+        for index, burst in enumerate(bursts):
+            if burst["value"].shape != shape:
+                msg = (
+                    f"Bursts of {node} have different shapes ({shape} and "
+                    f"{burst['value'].shape}) and can not be stacked."
+                )
+                raise ValueError(msg)
+            value[index] = burst["value"]
+            if "timestamp" in burst:
+                timestamp[index] = burst["timestamp"].flat[0]
+        if "fft" in node:
+            time = None
+            frequency = DAQModule._fft_frequency(node, first)
+        else:
+            time = timestamps_to_seconds(
+                first["timestamp"][0],
+                clk_rate,
+                origin=first["timestamp"][0][0],
+            )
+            frequency = None
+        return DAQStackedResult(
+            [burst.get("header", {}) for burst in bursts],
+            value,
+            time,
+            frequency,
+            timestamp,
+            value.shape,
+        )
+
     @staticmethod
     def _process_burst(
         node: str,
@@ -66,25 +159,18 @@ class DAQModule(BaseModule):
                 Processed and formatted burst data.
         """
         if "fft" in node:
-            bin_count = len(burst["value"][0])
-            bin_resolution = burst["header"]["gridcoldelta"]
-            frequency = np.arange(bin_count)
-            bandwidth = bin_resolution * len(frequency)
-            frequency = frequency * bin_resolution
-            if "xiy" in node:
-                frequency = frequency - bandwidth / 2.0 + bin_resolution / 2.0
             return DAQResult(
                 burst.get("header", {}),
                 burst["value"],
                 None,
-                frequency,
+                DAQModule._fft_frequency(node, burst),
                 burst["value"].shape,
             )
         timestamp = burst["timestamp"]
         return DAQResult(
             burst.get("header", {}),
             burst["value"],
-            (timestamp[0] - timestamp[0][0]) / clk_rate,
+            timestamps_to_seconds(timestamp[0], clk_rate, origin=timestamp[0][0]),
             None,
             burst["value"].shape,
         )
@@ -94,7 +180,9 @@ class DAQModule(BaseModule):
         node: str,
         data: list[dict[str, t.Any]],
         clk_rate: float,
-    ) -> list[t.Union[dict[str, t.Any], DAQResult]]:
+        *,
+        stacked: bool = False,
+    ) -> t.Union[list[t.Union[dict[str, t.Any], DAQResult]], DAQStackedResult]:
         """Process the data of a node.
 
         Only subscribed sample nodes are processed. Other nodes (module native nodes)
@@ -105,14 +193,148 @@ class DAQModule(BaseModule):
             data: raw data for the node.
             clk_rate: Clock rate [Hz] for converting the timestamps. Only
                 applies if the raw flag is reset.
+            stacked: Flag if all bursts should be stacked into a single
+                DAQStackedResult. (default = False)
 
         Returns:
                 Processed and formatted node data.
         """
         if data and isinstance(data[0], dict):
+            if stacked:
+                return DAQModule._stack_bursts(node, data, clk_rate)
             return [DAQModule._process_burst(node, burst, clk_rate) for burst in data]
         return data
 
+    def _clk_rate(self, node: str) -> float:
+        """Clock rate of the device a node belongs to.
+
+        Falls back to the default clock rate of 60 MHz if the clockbase can not
+        be resolved.
+
+        Args:
+            node: Name of the node.
+
+        Returns:
+            Clock rate [Hz] for converting the timestamps.
+        """
+        serial = device_serial(node)
+        if serial is None:
+            return DEFAULT_CLK_RATE
+        try:
+            return self._session.clockbase(serial)
+        except RuntimeError:
+            logger.warning(
+                f"Could not read the clockbase of {serial}. "
+                f"Using {DEFAULT_CLK_RATE:.0f} Hz instead.",
+            )
+            return DEFAULT_CLK_RATE
+
+    @staticmethod
+    def _burst_timestamp(burst: dict[str, t.Any]) -> t.Optional[int]:
+        """First timestamp of a raw burst (``None`` if not available)."""
+        timestamp = np.asarray(burst.get("timestamp", ()))
+        return int(timestamp.flat[0]) if timestamp.size else None
+
+    def _new_bursts(self, node: str, data: t.Any) -> t.Any:
+        """Filter the bursts of a node that were not returned before.
+
+        Bursts are identified by their first timestamp. If the bursts have no
+        timestamp, the number of already returned bursts is used instead.
+        Module native nodes are returned unchanged.
+
+        Args:
+            node: Name of the node.
+            data: Raw data of the node.
+
+        Returns:
+            Raw bursts that arrived since the previous call.
+        """
+        if not data or not isinstance(data, list) or not isinstance(data[0], dict):
+            return data
+        timestamps = [self._burst_timestamp(burst) for burst in data]
+        last = self._last_burst.get(node)
+        if None in timestamps:
+            self._last_burst[node] = len(data)
+            return data[last or 0 :]
+        known = t.cast("list[int]", timestamps)
+        self._last_burst[node] = max(known)
+        if last is None:
+            return data
+        return [
+            burst
+            for burst, timestamp in zip(data, known, strict=True)
+            if timestamp > last
+        ]
+
+    def reset_read(self) -> None:
+        """Reset the tracking of the already returned bursts.
+
+        The next call to ``read(new_only=True)`` returns all bursts held by
+        the module. Done automatically by ``execute``.
+        """
+        self._last_burst.clear()
+
+    def execute(self) -> None:
+        """Start the module execution.
+
+        Subscription or unsubscription is not possible until the execution is
+        finished. The tracking of the already returned bursts is reset (see
+        ``read``).
+        """
+        self.reset_read()
+        super().execute()
+
+    def iter_bursts(
+        self,
+        *,
+        raw: bool = False,
+        clk_rate: t.Optional[float] = None,
+        timeout: float = 20.0,
+        sleep_time: float = 0.1,
+    ) -> t.Iterator[tuple[str, t.Union[dict[str, t.Any], DAQResult]]]:
+        """Yield the bursts as they are acquired until the module is finished.
+
+        Only new bursts are processed in every iteration (see
+        ``read(new_only=True)``), so the processing cost stays proportional
+        to the newly acquired data.
+
+        Args:
+            raw: Flag if the raw bursts should be yielded instead of the
+                DAQResult format. (default = False)
+            clk_rate: Clock rate [Hz] for converting the timestamps. Only
+                applies if the raw flag is reset. By default the clockbase of
+                the device is used (see ``Session.clockbase``).
+                (default = None)
+            timeout: The maximum waiting time in seconds for the acquisition
+                to finish. (default = 20)
+            sleep_time: Time in seconds to wait between reading the bursts.
+                (default = 0.1)
+
+        Yields:
+            Node name and the burst.
+
+        Raises:
+            TimeoutError: The acquisition is not finished before timeout.
+        """
+        start_time = time.time()
+        while True:
+            finished = self.finished()
+            for node, data in self.read(
+                raw=raw,
+                clk_rate=clk_rate,
+                new_only=True,
+            ).items():
+                if isinstance(data, list):
+                    for burst in data:
+                        if isinstance(burst, (dict, DAQResult)):
+                            yield node, burst
+            if finished:
+                return
+            if time.time() - start_time > timeout:
+                msg = f"{self._raw_module.__class__.__name__} timed out."
+                raise TimeoutError(msg)
+            time.sleep(sleep_time)
+
     def finish(self) -> None:
         """Stop the module."""
         self._raw_module.finish()
@@ -129,27 +351,63 @@ class DAQModule(BaseModule):
         """Execute a manual trigger."""
         self._raw_module.trigger()
 
-    def read(self, *, raw: bool = False, clk_rate: float = 60e6) -> NodeDict:
+    def read(
+        self,
+        *,
+        raw: bool = False,
+        clk_rate: t.Optional[float] = None,
+        structured: bool = False,
+        new_only: bool = False,
+        stacked: bool = False,
+    ) -> NodeDict:
         """Read the acquired data from the module.
 
         The data is split into bursts.
 
+        With ``new_only`` only the bursts that arrived since the previous
+        ``read(new_only=True)`` are processed and returned. This keeps the
+        cost of repeatedly reading during a long acquisition proportional to
+        the new data. The tracking is reset by ``execute`` or ``reset_read``.
+
         Args:
             raw: Flag if the acquired data from the subscribed device
                 device nodes should be converted into the DAQResult format
                 (raw = False) or not. (default = False)
             clk_rate: Clock rate [Hz] for converting the timestamps. Only
-                applies if the raw flag is reset.
+                applies if the raw flag is reset. By default the clockbase of
+                the device the node belongs to is used (see
+                ``Session.clockbase``). (default = None)
+            structured: Flag if the raw data of each node should be converted
+                into a numpy structured array (see ``BaseModule.read``). Only
+                applies if the raw flag is set. (default = False)
+            new_only: Flag if only the bursts that were not returned by a
+                previous call should be returned. (default = False)
+            stacked: Flag if all bursts of a node should be returned as a
+                single DAQStackedResult, with the values of all bursts in one
+                (n_bursts x rows x cols) array, the shared time or frequency
+                axis and the first timestamp of each burst. Only applies if
+                the raw flag is reset. (default = False)
 
         Returns:
             Result of the burst grouped by the signals.
         """
         raw_result = self._raw_module.read(flat=True)
+        if new_only:
+            raw_result = {
+                node: self._new_bursts(node, data) for node, data in raw_result.items()
+            }
         if raw:
-            return NodeDict(raw_result)
+            return NodeDict(
+                self._to_structured(raw_result) if structured else raw_result,
+            )
         return NodeDict(
             {
-                node: self._process_node_data(node, data, clk_rate)
+                node: self._process_node_data(
+                    node,
+                    data,
+                    self._clk_rate(node) if clk_rate is None else clk_rate,
+                    stacked=stacked,
+                )
                 for node, data in raw_result.items()
             },
         )
@@ -10,6 +10,7 @@ from zhinst.core import DataStreamingModule as ZIDataStreamingModule
 from zhinst.toolkit.driver.modules.base_module import BaseModule
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
@@ -30,10 +31,18 @@ class DataStreamingModule(BaseModule):
     Args:
         data_streaming_module: Instance of the core DAQ module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, data_streaming_module: ZIDataStreamingModule, session: Session):
-        super().__init__(data_streaming_module, session)
+    def __init__(
+        self,
+        data_streaming_module: ZIDataStreamingModule,
+        session: Session,
+        *,
+        preloaded_json: t.Optional[NodeDoc] = None,
+    ):
+        super().__init__(data_streaming_module, session, preloaded_json=preloaded_json)
 
     def finish(self) -> None:
         """Stop the module."""
@@ -6,17 +6,122 @@ import logging
 import typing as t
 from pathlib import Path
 
+import numpy as np
 from zhinst.core import DeviceSettingsModule as ZIDeviceSettingsModule
 
 from zhinst.toolkit.driver.modules.base_module import BaseModule
+from zhinst.toolkit.nodetree import Node
 from zhinst.toolkit.nodetree.helper import NodeDict
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst import core
     from zhinst.toolkit.driver.devices import DeviceType
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
 
+# Value types of a snapshot. Each type is stored as one array of paths, one
+# array of values and one array with the position of the settings in the
+# wildcard get per device. Vectors are stored as individual arrays.
+_SNAPSHOT_TYPES = ("int", "float", "complex", "str")
+
+
+def _serial(device: t.Union[DeviceType, str]) -> str:
+    """Lower case serial of a device (serial)."""
+    return getattr(device, "serial", device).lower()
+
+
+def _snapshot_type(value: t.Any) -> t.Optional[str]:
+    """Type of a setting value in a snapshot (``None`` if not supported)."""
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, (bool, int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    if isinstance(value, (complex, np.complexfloating)):
+        return "complex"
+    if isinstance(value, np.ndarray):
+        return "vector"
+    return None
+
+
+def _read_settings(daq_server: core.ziDAQServer, serial: str) -> dict[str, np.ndarray]:
+    """Read all settings of a device with a single wildcard get.
+
+    Args:
+        daq_server: Connection to the data server.
+        serial: Serial of the device.
+
+    Returns:
+        Snapshot arrays of the device (see ``save_snapshot``).
+    """
+    raw = daq_server.get(f"/{serial}/*", settingsonly=True, flat=True)
+    settings: dict[str, list[tuple[int, str, t.Any]]] = {
+        value_type: [] for value_type in (*_SNAPSHOT_TYPES, "vector")
+    }
+    for order, (path, raw_value) in enumerate(raw.items()):
+        _, value = Node._parse_get_entry(raw_value)
+        value_type = _snapshot_type(value)
+        if value_type is None:
+            logger.debug(f"{path} with value {value!r} is not part of the snapshot.")
+            continue
+        settings[value_type].append((order, path.lower(), value))
+    arrays = {}
+    for value_type in (*_SNAPSHOT_TYPES, "vector"):
+        arrays[f"{serial}/{value_type}/order"] = np.array(
+            [order for order, _, _ in settings[value_type]],
+            dtype=np.int64,
+        )
+        arrays[f"{serial}/{value_type}/paths"] = np.array(
+            [path for _, path, _ in settings[value_type]],
+            dtype=str,
+        )
+    for value_type in _SNAPSHOT_TYPES:
+        arrays[f"{serial}/{value_type}/values"] = np.array(
+            [value for _, _, value in settings[value_type]],
+            dtype=str if value_type == "str" else value_type,
+        )
+    for index, (_, _, value) in enumerate(settings["vector"]):
+        arrays[f"{serial}/vector/{index}"] = value
+    return arrays
+
+
+def _snapshot_settings(
+    snapshot: t.Mapping[str, np.ndarray],
+    serial: str,
+) -> list[tuple[str, t.Any]]:
+    """Settings of a device stored in a snapshot.
+
+    Args:
+        snapshot: Loaded snapshot file.
+        serial: Serial of the device.
+
+    Returns:
+        List of (path, value) pairs in the order the wildcard get returned
+        them when the snapshot was saved.
+    """
+    settings: list[tuple[str, t.Any]] = []
+    orders: list[np.ndarray] = []
+    for value_type in (*_SNAPSHOT_TYPES, "vector"):
+        paths = snapshot[f"{serial}/{value_type}/paths"].tolist()
+        if value_type == "vector":
+            values = [
+                snapshot[f"{serial}/vector/{index}"] for index in range(len(paths))
+            ]
+        else:
+            values = snapshot[f"{serial}/{value_type}/values"].tolist()
+        settings.extend(zip(paths, values, strict=True))
+        order_key = f"{serial}/{value_type}/order"
+        if order_key in snapshot:
+            orders.append(snapshot[order_key])
+    # Snapshots without order keep the settings grouped by value type
+    if len(orders) == len(_SNAPSHOT_TYPES) + 1:
+        order = np.argsort(np.concatenate(orders), kind="stable")
+        settings = [settings[index] for index in order]
+    return settings
+
 
 class DeviceSettingsModule(BaseModule):
     """Implements the device settings module for storing and loading settings.
@@ -27,6 +132,10 @@ class DeviceSettingsModule(BaseModule):
     For simple save and load two helper functions exist `save_to_file` and
     `load_from_file`.
 
+    In addition `save_snapshot` and `load_snapshot` store and restore the
+    settings of multiple devices in a toolkit specific binary format. They
+    do not use the LabOne module and handle all devices in parallel.
+
     Note:
         It is not recommend to use this function to read the
         device settings. Instead one can use the zhinst-toolkit functionality
@@ -38,14 +147,18 @@ class DeviceSettingsModule(BaseModule):
     Args:
         device_settings_module: Instance of the core Impedance Module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
     def __init__(
         self,
         device_settings_module: ZIDeviceSettingsModule,
         session: Session,
+        *,
+        preloaded_json: t.Optional[NodeDoc] = None,
     ):
-        super().__init__(device_settings_module, session)
+        super().__init__(device_settings_module, session, preloaded_json=preloaded_json)
         self.root.update_nodes(
             {
                 "/path": {
@@ -64,9 +177,9 @@ class DeviceSettingsModule(BaseModule):
     ) -> None:
         """Execute a command on a clean module.
 
-        This function creates an new module instance to avoid misconfiguration.
-        It is also synchronous, meaning it will block until command has
-        finished.
+        This function borrows a module with default settings from the module
+        pool of the session to avoid misconfiguration. It is also synchronous,
+        meaning it will block until command has finished.
 
         Args:
             command:  The command to execute. (`save`, `load`, `read`)
@@ -78,21 +191,21 @@ class DeviceSettingsModule(BaseModule):
             TimeoutError: If the loading of the settings timed out.
         """
         filename = Path(filename)
-        temp_module = self._session.modules.create_device_settings_module()
-        temp_module.device(device)
-        temp_module.filename(filename.stem)
-        temp_module.path(filename.parent)
-        temp_module.command(command)
-        temp_module.execute()
-        try:
-            # Use finish node instead of function to make advantage of the
-            # wait for state change functionality.
-            temp_module.finished.wait_for_state_change(1, timeout=timeout)
-        except TimeoutError as e:
-            msg = f"Unable to load device settings after {timeout} seconds."
-            raise TimeoutError(
-                msg,
-            ) from e
+        with self._session.modules.pooled("device_settings") as temp_module:
+            temp_module.device(device)
+            temp_module.filename(filename.stem)
+            temp_module.path(filename.parent)
+            temp_module.command(command)
+            temp_module.execute()
+            try:
+                # Use finish node instead of function to make advantage of the
+                # wait for state change functionality.
+                temp_module.finished.wait_for_state_change(1, timeout=timeout)
+            except TimeoutError as e:
+                msg = f"Unable to load device settings after {timeout} seconds."
+                raise TimeoutError(
+                    msg,
+                ) from e
 
     def load_from_file(
         self,
@@ -102,7 +215,8 @@ class DeviceSettingsModule(BaseModule):
     ) -> None:
         """Load a LabOne settings file to a device.
 
-        This function creates an new module instance to avoid misconfiguration.
+        This function uses a module from the module pool to avoid
+        misconfiguration.
         It is also synchronous, meaning it will block until loading the
         settings has finished.
 
@@ -124,7 +238,8 @@ class DeviceSettingsModule(BaseModule):
     ) -> None:
         """Save the device settings to a LabOne settings file.
 
-        This function creates an new module instance to avoid misconfiguration.
+        This function uses a module from the module pool to avoid
+        misconfiguration.
         It is also synchronous, meaning it will block until save operation has
         finished.
 
@@ -138,7 +253,72 @@ class DeviceSettingsModule(BaseModule):
         """
         self._simple_execution("save", filename, device, timeout)
 
-    def read(self) -> NodeDict:
+    def save_snapshot(
+        self,
+        filename: t.Union[str, Path],
+        devices: t.Union[DeviceType, str, t.Iterable[t.Union[DeviceType, str]]],
+    ) -> None:
+        """Save the settings of devices into a snapshot file.
+
+        The settings of each device are read with a single wildcard get. The
+        devices are read in parallel on the connections of the session's
+        ``connection_pool``. The snapshot is a numpy ``.npz`` file that
+        contains no python objects.
+
+        Args:
+            filename: Path of the snapshot file.
+            devices: Device (serial) or multiple devices whose settings
+                should be saved.
+        """
+        if isinstance(devices, str) or hasattr(devices, "serial"):
+            devices = [devices]  # type: ignore[list-item]
+        serials = [_serial(device) for device in devices]  # type: ignore[union-attr]
+        snapshot: dict[str, np.ndarray] = {}
+        for arrays in self._session.connection_pool.map(_read_settings, serials):
+            snapshot.update(arrays)
+        with Path(filename).open("wb") as file:
+            np.savez(file, **snapshot)
+
+    def load_snapshot(
+        self,
+        filename: t.Union[str, Path],
+        devices: t.Optional[t.Iterable[t.Union[DeviceType, str]]] = None,
+    ) -> list[str]:
+        """Restore the settings of devices from a snapshot file.
+
+        The settings of each device are applied in a single transaction. The
+        devices are restored in parallel on the connections of the session's
+        ``connection_pool``.
+
+        Args:
+            filename: Path of a snapshot file created with ``save_snapshot``.
+            devices: Devices (serials) to restore. Restores all devices of the
+                snapshot if not specified. (default = None)
+
+        Returns:
+            Serials of the restored devices.
+
+        Raises:
+            KeyError: If a device is not part of the snapshot.
+        """
+        with np.load(Path(filename), allow_pickle=False) as file:
+            snapshot = {key: file[key] for key in file.files}
+        available = sorted({key.split("/", maxsplit=1)[0] for key in snapshot})
+        serials = (
+            available if devices is None else [_serial(device) for device in devices]
+        )
+        for serial in serials:
+            if serial not in available:
+                msg = f"{serial} is not part of the snapshot {filename}."
+                raise KeyError(msg)
+
+        def restore(daq_server: core.ziDAQServer, serial: str) -> None:
+            daq_server.set(_snapshot_settings(snapshot, serial))
+
+        self._session.connection_pool.map(restore, serials)
+        return serials
+
+    def read(self, *, structured: bool = False) -> NodeDict:
         """Read device settings.
 
         Note: It is not recommend to use this function to read the
@@ -153,7 +333,12 @@ class DeviceSettingsModule(BaseModule):
         demods_settings = device.demods()
         ```
 
+        Args:
+            structured: Flag if the data of each node should be converted
+                into a numpy structured array (see ``BaseModule.read``).
+                (default = False)
+
         Returns:
             Device settings.
         """
-        return super().read()
+        return super().read(structured=structured)
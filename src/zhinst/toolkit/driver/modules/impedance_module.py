@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 import logging
-import time
 import typing as t
 from collections.abc import Sequence
 
 from zhinst.core import ImpedanceModule as ZIImpedanceModule
 
-from zhinst.toolkit.driver.modules.base_module import BaseModule
+from zhinst.toolkit.driver.modules.base_module import BaseModule, ProgressCallback
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    import threading
+
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
@@ -76,10 +78,18 @@ class ImpedanceModule(BaseModule):
     Args:
         impedance_module: Instance of the core Impedance Module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, impedance_module: ZIImpedanceModule, session: Session):
-        super().__init__(impedance_module, session)
+    def __init__(
+        self,
+        impedance_module: ZIImpedanceModule,
+        session: Session,
+        *,
+        preloaded_json: t.Optional[NodeDoc] = None,
+    ):
+        super().__init__(impedance_module, session, preloaded_json=preloaded_json)
         self.root.update_nodes(
             {
                 "/expectedstatus": {"GetParser": CalibrationStatus},
@@ -94,6 +104,8 @@ class ImpedanceModule(BaseModule):
         *,
         timeout: float = 20.0,
         sleep_time: float = 0.5,
+        progress_callback: t.Optional[ProgressCallback] = None,
+        cancel: t.Optional[threading.Event] = None,
     ) -> None:
         """Waits until the specified compensation step is complete.
 
@@ -101,24 +113,35 @@ class ImpedanceModule(BaseModule):
             step: The compensation step to wait for completion.
             timeout: The maximum waiting time in seconds for the compensation
                 to complete (default: 20).
-            sleep_time: Time in seconds to wait between
+            sleep_time: Maximum time in seconds to wait between
                 requesting the state. (default: 0.5)
+            progress_callback: Function called with the progress (between 0
+                and 1) every time it changes. (default = None)
+            cancel: Event that aborts the waiting when set. (default = None)
 
         Raises:
             TimeoutError: The compensation is not completed before timeout.
+            CancelledError: The waiting was canceled through ``cancel``.
         """
-        start_time = time.time()
-        while (
-            start_time + timeout >= time.time()
-            and self.calibrate()
-            and not self.finished(step)
-        ):
-            logger.info(f"Progress: {(self.progress() * 100):.1f}%")
-            time.sleep(sleep_time)
+        finished = False
+
+        def state() -> tuple[bool, float]:
+            nonlocal finished
+            calibrating = self.calibrate()
+            finished = self.finished(step)
+            return not calibrating or finished, self.progress()
+
+        self._wait(
+            state,
+            timeout=timeout,
+            sleep_time=sleep_time,
+            progress_callback=progress_callback,
+            cancel=cancel,
+        )
         if self.progress() < 1:
             msg = "Impedance module timed out."
             raise TimeoutError(msg)
-        if not self.finished(step):
+        if not finished:
             if step is None:
                 msg = (
                     "Impedance module did not reach the status "
@@ -0,0 +1,188 @@
+"""Concurrent SHFQA sweeps on multiple channels and devices."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from zhinst.toolkit.driver.modules.shfqa_sweeper import SHFQASweeper
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.driver.devices import DeviceType
+    from zhinst.toolkit.session import Session
+
+logger = logging.getLogger(__name__)
+
+ChannelKey = tuple[str, int]
+
+
+class MultiSHFQASweeper:
+    """Run SHFQA sweeps on multiple channels and devices concurrently.
+
+    Holds one ``SHFQASweeper`` per channel. Every sweeper has its own
+    session to the data server, which allows running the sweeps of all
+    channels in parallel. A sweep of all channels therefore takes about as
+    long as the sweep of a single channel.
+
+    The software trigger is shared by all channels of a device. Channels of
+    a device with a software triggered sweeper are therefore swept one after
+    the other, while different devices are still swept in parallel.
+
+    Settings that are common to all channels (e.g. trigger or averaging) can
+    be applied to all sweepers at once with ``shared``. The sweeper of a
+    single channel is accessible by its ``(serial, channel)`` key for channel
+    specific settings.
+
+    Args:
+        session: Session to the Data Server.
+        channels: Pairs of device (serial) and QA channel index.
+        shared: Settings applied to all sweepers. Maps the node path relative
+            to the sweeper (e.g. ``"average/num_averages"``) to its value.
+            (default = None)
+
+    Example:
+        >>> multi_sweeper = MultiSHFQASweeper(
+        ...     session,
+        ...     [(device, channel) for channel in range(4)],
+        ...     shared={"average/num_averages": 100, "sweep/num_points": 501},
+        ... )
+        >>> multi_sweeper[device.serial, 0].rf.center_freq(5e9)
+        >>> results = multi_sweeper.run()
+        >>> results[device.serial, 0]["vector"]
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        channels: t.Iterable[tuple[t.Union[DeviceType, str], int]],
+        *,
+        shared: t.Optional[t.Mapping[str, t.Any]] = None,
+    ):
+        self._session = session
+        self._sweepers: dict[ChannelKey, SHFQASweeper] = {}
+        for device, channel in channels:
+            serial = getattr(device, "serial", device).lower()
+            key = (serial, int(channel))
+            if key in self._sweepers:
+                msg = f"Channel {channel} of {serial} is specified twice."
+                raise ValueError(msg)
+            sweeper = SHFQASweeper(session)
+            sweeper.device(serial)
+            sweeper.rf.channel(int(channel))
+            self._sweepers[key] = sweeper
+        if shared:
+            self.shared(shared)
+
+    def __repr__(self):
+        return f"MultiSHFQASweeper({list(self._sweepers)})"
+
+    def __getitem__(self, key: ChannelKey) -> SHFQASweeper:
+        serial, channel = key
+        return self._sweepers[getattr(serial, "serial", serial).lower(), channel]
+
+    def __iter__(self) -> t.Iterator[ChannelKey]:
+        return iter(self._sweepers)
+
+    def __len__(self) -> int:
+        return len(self._sweepers)
+
+    def shared(self, settings: t.Mapping[str, t.Any]) -> None:
+        """Apply settings to the sweepers of all channels.
+
+        Args:
+            settings: Maps the node path relative to the sweeper
+                (e.g. ``"trigger/source"``) to its value.
+        """
+        for sweeper in self._sweepers.values():
+            for path, value in settings.items():
+                sweeper[path](value)
+
+    @staticmethod
+    def _uses_sw_trigger(sweeper: SHFQASweeper) -> bool:
+        """Check if a sweeper issues software triggers.
+
+        The software trigger is device wide and would also trigger the sweeps
+        of the other channels of the device.
+
+        Args:
+            sweeper: Sweeper of a channel.
+
+        Returns:
+            Flag if the sweeper uses the software trigger.
+        """
+        source = sweeper.trigger.source()
+        mode = sweeper.trigger.sw_trigger_mode()
+        return (
+            getattr(source, "name", source) == "software_trigger0"
+            or getattr(mode, "name", mode) == "force"
+        )
+
+    def _execute(self, function: str) -> dict[ChannelKey, t.Any]:
+        """Call a function of all sweepers concurrently.
+
+        Channels of a device with a software triggered sweeper are called
+        one after the other.
+
+        Args:
+            function: Name of the ``SHFQASweeper`` function.
+
+        Returns:
+            Result per channel.
+
+        Raises:
+            Exception: The first error raised by a sweeper. All other sweeps
+                are completed before the error is raised.
+        """
+        device_locks = {
+            serial: threading.Lock()
+            for (serial, _), sweeper in self._sweepers.items()
+            if self._uses_sw_trigger(sweeper)
+        }
+
+        def call(key: ChannelKey) -> t.Any:
+            with device_locks.get(key[0], nullcontext()):
+                return getattr(self._sweepers[key], function)()
+
+        with ThreadPoolExecutor(
+            max_workers=max(len(self._sweepers), 1),
+            thread_name_prefix="zhinst-toolkit-shfqa-sweeper",
+        ) as executor:
+            futures = {key: executor.submit(call, key) for key in self._sweepers}
+        errors = {
+            key: future.exception()
+            for key, future in futures.items()
+            if future.exception() is not None
+        }
+        for key, error in errors.items():
+            logger.error(f"Sweep of channel {key[1]} of {key[0]} failed: {error}")
+        if errors:
+            raise next(iter(errors.values()))  # type: ignore[misc]
+        return {key: future.result() for key, future in futures.items()}
+
+    def run(self) -> dict[ChannelKey, dict]:
+        """Perform the sweeps of all channels concurrently.
+
+        Returns:
+            Measurement data of the sweep per ``(serial, channel)``.
+
+        Raises:
+            Exception: The first error raised by a sweep. All other sweeps
+                are completed before the error is raised.
+        """
+        return self._execute("run")
+
+    def get_result(self) -> dict[ChannelKey, dict]:
+        """Get the measurement data of the last sweep of all channels.
+
+        Returns:
+            Measurement data of the last sweep per ``(serial, channel)``.
+        """
+        return self._execute("get_result")
+
+    @property
+    def sweepers(self) -> dict[ChannelKey, SHFQASweeper]:
+        """Sweeper per ``(serial, channel)``."""
+        return dict(self._sweepers)
@@ -0,0 +1,220 @@
+"""Multi-dimensional sweeps on top of the Sweeper Module."""
+
+from __future__ import annotations
+
+import logging
+import typing as t
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from zhinst.toolkit.nodetree import Node
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.driver.modules.base_module import ProgressCallback
+    from zhinst.toolkit.driver.modules.sweeper_module import SweeperModule
+    from zhinst.toolkit.nodetree.helper import NodeDict
+    from zhinst.toolkit.session import Session
+
+logger = logging.getLogger(__name__)
+
+SweepAxis = namedtuple("SweepAxis", ["target", "values"])
+NestedSweepResult = namedtuple("NestedSweepResult", ["axes", "grid", "data"])
+
+
+class NestedSweeper:
+    """N-dimensional sweep that runs the innermost axis on the Sweeper Module.
+
+    The inner axis is the native sweep configured on the sweeper module
+    (``gridnode``, ``start``, ``stop``, ``samplecount``, ...). For every point
+    of the outer axes the outer values are applied and a native sweep is
+    executed. The outer axes are iterated in row major order (the last axis
+    changes fastest) and only the values that changed since the previous
+    point are written. All node targets are written in a single transaction,
+    callable targets are called afterwards in the order of the axes.
+
+    The result of a sweep is copied into the preallocated result arrays on a
+    background thread, while the next point is already configured and swept.
+
+    Args:
+        session: Session to the Data Server.
+        axes: Outer axes, the slowest axis first. Every axis is a pair of
+            target (toolkit node or callable taking the value) and values.
+        signal: Node whose data is recorded, e.g. ``device.demods[0].sample``.
+        sweeper: Sweeper module that performs the inner sweep. Uses the
+            managed sweeper module of the session if not specified.
+            (default = None)
+        fields: Fields of the signal stored in the result.
+            (default = ("x", "y"))
+
+    Example:
+        >>> sweeper = session.modules.sweeper
+        >>> sweeper.device(device)
+        >>> sweeper.gridnode(device.oscs[0].freq)
+        >>> sweeper.start(1e6)
+        >>> sweeper.stop(10e6)
+        >>> sweeper.samplecount(100)
+        >>> nested = NestedSweeper(
+        ...     session,
+        ...     [
+        ...         SweepAxis(set_flux, np.linspace(0, 1, 11)),
+        ...         SweepAxis(device.sigouts[0].amplitudes[0], [0.1, 0.2, 0.5]),
+        ...     ],
+        ...     device.demods[0].sample,
+        ... )
+        >>> result = nested.run()
+        >>> result.data["x"].shape
+        (11, 3, 100)
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        axes: t.Sequence[tuple[t.Union[Node, t.Callable[[t.Any], t.Any]], t.Any]],
+        signal: t.Union[Node, str],
+        *,
+        sweeper: t.Optional[SweeperModule] = None,
+        fields: t.Sequence[str] = ("x", "y"),
+    ):
+        self._session = session
+        self._axes = [SweepAxis(target, np.asarray(values)) for target, values in axes]
+        for axis in self._axes:
+            if axis.values.ndim != 1 or not axis.values.size:
+                msg = f"The values of the axis {axis.target} must be a 1-D sequence."
+                raise ValueError(msg)
+        self._signal = signal
+        self._sweeper = sweeper
+        self._fields = list(fields)
+
+    def __repr__(self):
+        return (
+            f"NestedSweeper({[str(axis.target) for axis in self._axes]}, {self.shape})"
+        )
+
+    @property
+    def sweeper(self) -> SweeperModule:
+        """Sweeper module that performs the inner sweep."""
+        if self._sweeper is None:
+            self._sweeper = self._session.modules.sweeper
+        return self._sweeper
+
+    @property
+    def axes(self) -> list[SweepAxis]:
+        """Outer axes, the slowest axis first."""
+        return list(self._axes)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """Number of points of the outer axes."""
+        return tuple(len(axis.values) for axis in self._axes)
+
+    def _apply(
+        self,
+        index: tuple[int, ...],
+        previous: t.Optional[tuple[int, ...]],
+    ) -> None:
+        """Apply the outer values of a point.
+
+        Args:
+            index: Index of the point.
+            previous: Index of the previous point. ``None`` for the first
+                point.
+        """
+        changed = [
+            (axis.target, axis.values[position].item())
+            for axis_index, (axis, position) in enumerate(
+                zip(self._axes, index, strict=True),
+            )
+            if previous is None or previous[axis_index] != position
+        ]
+        nodes = [
+            (target, value) for target, value in changed if isinstance(target, Node)
+        ]
+        if nodes:
+            with self._session.set_transaction():
+                for node, value in nodes:
+                    node(value)
+        for target, value in changed:
+            if not isinstance(target, Node):
+                target(value)
+
+    def _store(
+        self,
+        result: NestedSweepResult,
+        index: tuple[int, ...],
+        data: NodeDict,
+    ) -> None:
+        """Copy the result of a single sweep into the result arrays.
+
+        Args:
+            result: Result of the nested sweep.
+            index: Index of the point.
+            data: Read result of the sweeper module.
+        """
+        try:
+            sweep = data[self._signal][-1][0]
+        except (KeyError, IndexError):
+            logger.warning(f"No data for {self._signal} at point {index}.")
+            return
+        grid = np.asarray(sweep["grid"])
+        result.grid[: grid.size] = grid
+        for field in self._fields:
+            values = np.asarray(sweep[field])
+            result.data[field][index][: values.size] = values
+
+    def run(
+        self,
+        *,
+        timeout: float = 20.0,
+        progress_callback: t.Optional[ProgressCallback] = None,
+    ) -> NestedSweepResult:
+        """Execute the nested sweep.
+
+        Args:
+            timeout: Maximum time in seconds for a single inner sweep.
+                (default = 20)
+            progress_callback: Function called with the fraction of completed
+                points (between 0 and 1) after every inner sweep.
+                (default = None)
+
+        Returns:
+            Result with the values of the outer axes, the grid of the inner
+            axis and the data of every field. The data of a field has the
+            shape ``(*shape, samplecount)``. Points without data are NaN.
+
+        Raises:
+            TimeoutError: If an inner sweep is not finished within the timeout.
+        """
+        sweeper = self.sweeper
+        samplecount = int(sweeper.samplecount())
+        result = NestedSweepResult(
+            axes=[axis.values for axis in self._axes],
+            grid=np.full(samplecount, np.nan),
+            data={
+                field: np.full((*self.shape, samplecount), np.nan)
+                for field in self._fields
+            },
+        )
+        num_points = int(np.prod(self.shape))
+        sweeper.subscribe(self._signal)
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending: t.Optional[Future] = None
+                previous: t.Optional[tuple[int, ...]] = None
+                for count, index in enumerate(np.ndindex(self.shape), start=1):
+                    self._apply(index, previous)
+                    previous = index
+                    sweeper.execute()
+                    sweeper.wait_done(timeout=timeout)
+                    data = sweeper.read()
+                    if pending is not None:
+                        pending.result()
+                    pending = executor.submit(self._store, result, index, data)
+                    if progress_callback is not None:
+                        progress_callback(count / num_points)
+                if pending is not None:
+                    pending.result()
+        finally:
+            sweeper.unsubscribe(self._signal)
+        return result
@@ -1,15 +1,16 @@
 """PID Advisor Module."""
 
 import logging
-import time
+import threading
 import typing as t
 from enum import IntFlag
 
 from zhinst.core import PidAdvisorModule as ZIPidAdvisorModule
 
-from zhinst.toolkit.driver.modules.base_module import BaseModule
+from zhinst.toolkit.driver.modules.base_module import BaseModule, ProgressCallback
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
@@ -48,10 +49,18 @@ class PIDAdvisorModule(BaseModule):
     Args:
         pid_advisor_module: Instance of the core PID advisor module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, pid_advisor_module: ZIPidAdvisorModule, session: "Session"):
-        super().__init__(pid_advisor_module, session)
+    def __init__(
+        self,
+        pid_advisor_module: ZIPidAdvisorModule,
+        session: "Session",
+        *,
+        preloaded_json: t.Optional["NodeDoc"] = None,
+    ):
+        super().__init__(pid_advisor_module, session, preloaded_json=preloaded_json)
         self.root.update_nodes(
             {
                 "/pid/mode": {
@@ -64,39 +73,51 @@ class PIDAdvisorModule(BaseModule):
             raise_for_invalid_node=False,
         )
 
-    def wait_done(self, *, timeout: float = 20.0, sleep_time: float = 2) -> None:
+    def wait_done(
+        self,
+        *,
+        timeout: float = 20.0,
+        sleep_time: float = 2,
+        progress_callback: t.Optional[ProgressCallback] = None,
+        cancel: t.Optional[threading.Event] = None,
+    ) -> None:
         """Waits until the pid advisor is finished.
 
         Args:
             timeout (float): The maximum waiting time in seconds for the
                 measurement (default: 20).
-            sleep_time (int): Time in seconds to wait between
-                requesting sweeper state. (default: 0.5)
+            sleep_time (int): Maximum time in seconds to wait between
+                requesting the advisor state. (default: 2)
+            progress_callback: Function called with the progress (between 0
+                and 1) every time it changes. (default = None)
+            cancel: Event that aborts the waiting when set. (default = None)
 
         Raises:
             TimeoutError: The measurement is not completed before
                 timeout.
+            CancelledError: The waiting was canceled through ``cancel``.
         """
-        start_time = time.time()
-        while start_time + timeout >= time.time() and (
-            self.calculate()
-            or (not self._raw_module.finished() and self.progress() != 1)
-        ):
+
+        def state() -> tuple[bool, float]:
+            calculating = self.calculate()
+            finished = self._raw_module.finished()
+            progress = self.progress()
+            done = not calculating and (bool(finished) or progress == 1)
             # When the advisor is started it takes some time to reset the
             # progress (and finished) node. This causes weird behavior when
-            # restarted. This if statement just ignores the progress until it
-            # is smaller than 100%
-            if self.progress() < 1:
-                logger.info(f"Progress: {(self.progress() * 100):.1f}%")
-            else:
-                logger.info("Progress: 0.0%")
-            time.sleep(sleep_time)
-        if self.calculate() or (
-            not self._raw_module.finished() and self.progress() != 1
+            # restarted. Therefore the progress is ignored until it is
+            # smaller than 100%
+            return done, progress if done or progress < 1 else 0.0
+
+        if not self._wait(
+            state,
+            timeout=timeout,
+            sleep_time=sleep_time,
+            progress_callback=progress_callback,
+            cancel=cancel,
         ):
             msg = f"{self._raw_module.__class__.__name__} timed out."
             raise TimeoutError(msg)
-        logger.info(f"Progress: {(self.progress() * 100):.1f}%")
 
     def finish(self) -> None:
         """Stop the module."""
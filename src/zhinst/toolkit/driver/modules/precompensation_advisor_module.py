@@ -12,6 +12,7 @@ from zhinst.toolkit.nodetree import Node, NodeTree
 logger = logging.getLogger(__name__)
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 
@@ -40,12 +41,20 @@ class PrecompensationAdvisorModule(Node):
     Args:
         raw_module: zhinst.core module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, raw_module: TKPrecompensationAdvisorModule, session: "Session"):
+    def __init__(
+        self,
+        raw_module: TKPrecompensationAdvisorModule,
+        session: "Session",
+        *,
+        preloaded_json: t.Optional["NodeDoc"] = None,
+    ):
         self._raw_module = raw_module
         self._session = session
-        super().__init__(NodeTree(raw_module), ())
+        super().__init__(NodeTree(raw_module, preloaded_json=preloaded_json), ())
         self.root.update_nodes(
             {
                 "/device": {
@@ -8,6 +8,7 @@ from zhinst.core import ScopeModule as ZIScopeModule
 from zhinst.toolkit.driver.modules.base_module import BaseModule
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
@@ -53,10 +54,18 @@ class ScopeModule(BaseModule):
     Args:
         scope_module: Instance of the core scope module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, scope_module: ZIScopeModule, session: "Session"):
-        super().__init__(scope_module, session)
+    def __init__(
+        self,
+        scope_module: ZIScopeModule,
+        session: "Session",
+        *,
+        preloaded_json: t.Optional["NodeDoc"] = None,
+    ):
+        super().__init__(scope_module, session, preloaded_json=preloaded_json)
 
     def finish(self) -> None:
         """Stop the module."""
@@ -32,6 +32,18 @@ if t.TYPE_CHECKING:  # pragma: no cover
 logger = logging.getLogger(__name__)
 
 
+class _ChangeTrackingDict(dict):
+    """Dictionary that records the keys of all values set since the last reset."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.changed: set[str] = set()
+
+    def __setitem__(self, key: str, value: t.Any) -> None:
+        super().__setitem__(key, value)
+        self.changed.add(key)
+
+
 class SHFQASweeper(Node):
     """Toolkit adaption for the zhinst.utils.SHFSweeper.
 
@@ -53,8 +65,10 @@ class SHFQASweeper(Node):
     * envelope: Settings for defining a complex envelope for pulsed spectroscopy
 
     The underlying module is updated with the parameter changes automatically.
-    Every functions from the underlying SHFSweeper module is exposed and can be
-    used in the same way.
+    Only the configuration sections with changed parameters are rebuilt and
+    the underlying module is not reconfigured at all if nothing changed since
+    the last configuration. Every functions from the underlying SHFSweeper
+    module is exposed and can be used in the same way.
 
     Args:
         session: Session to the Data Server.
@@ -73,6 +87,8 @@ class SHFQASweeper(Node):
             "use_sequencer": "mode",
             "force_sw_trigger": "sw_trigger_mode",
         }
+        self._values = _ChangeTrackingDict()
+        self._configs: dict[str, t.Any] = {}
         super().__init__(self._create_nodetree(), ())
         self._daq_server = session.clone_underlying_session()
         self._raw_module = CoreSweeper(self._daq_server, "")
@@ -125,6 +141,8 @@ class SHFQASweeper(Node):
         except AttributeError:
             serial = value
         self._raw_module = CoreSweeper(self._daq_server, serial)
+        # The new module needs the complete configuration
+        self._configs.clear()
         return serial
 
     def _create_nodetree(self) -> NodeTree:
@@ -187,71 +205,92 @@ class SHFQASweeper(Node):
         info["/predicted_cycle_time"] = raw_info["/predicted_cycle_time"]
         values["/predicted_cycle_time"] = lambda: self._raw_module.predicted_cycle_time
 
-        return NodeTree(ConnectionDict(values, info))
+        self._values.update(values)
+        self._values.changed.clear()
+        return NodeTree(ConnectionDict(self._values, info))
+
+    def _build_config(self, config_class: type, section: str) -> t.Any:
+        """Build a SHFSweeper configuration from a section of the node tree.
+
+        Args:
+            config_class: SHFSweeper configuration class.
+            section: Name of the node tree section.
+
+        Returns:
+            Configuration object.
+        """
+        config = OrderedDict()
+        for parameter in asdict(config_class()):
+            value = self[section][self._renamed_nodes.get(parameter, parameter)]()
+            if isinstance(value, IntEnum):
+                value = value.name
+            config[parameter] = value
+        result = config_class(**config)
+        if config_class is SweepConfig:
+            # special treatment for mode
+            try:
+                result.use_sequencer = result.use_sequencer == "sequencer-based"
+            except AttributeError:
+                logger.warning(
+                    "use_sequencer setting is no longer available in the "
+                    "shf_sweeper class.",
+                )
+        if config_class is TriggerConfig:
+            # special treatment for the imp50
+            try:
+                result.imp50 = result.imp50 == "imp50"
+            except AttributeError:
+                logger.warning(
+                    "imp50 setting is no longer available in the shf_sweeper class.",
+                )
+            # special treatment for trigger source
+            try:
+                result.source = result.source if result.source != "auto" else None
+            except AttributeError:
+                logger.warning(
+                    "source setting is no longer available in the shf_sweeper class.",
+                )
+            # special treatment for the force_sw_trigger
+            try:
+                result.force_sw_trigger = result.force_sw_trigger == "force"
+            except AttributeError:
+                logger.warning(
+                    "force_sw_trigger setting is no longer available in the "
+                    "shf_sweeper.",
+                )
+        return result
 
     def _update_settings(self) -> None:
         """Update the ShfSweeper settings from the node tree.
 
         Converts the nodetree into a valid configuration for the SHFSweeper.
+        Only the sections with changed nodes are rebuilt and passed to the
+        SHFSweeper. Nothing is done if no node changed since the last update.
         """
-        if not self.device():
+        if not self._values["/device"]:
             msg = "The device serial needs to be set before using the module."
             raise ToolkitError(
                 msg,
             )
+        changed = {path.split("/")[1] for path in self._values.changed}
+        if self._configs and not changed:
+            return
         data = OrderedDict()
-        for config_class, parent_name in self._config_classes.items():
-            config = OrderedDict()
-            for parameter in asdict(config_class()):
-                value = self[parent_name[0]][
-                    self._renamed_nodes.get(parameter, parameter)
-                ]()
-                if isinstance(value, IntEnum):
-                    value = value.name
-                config[parameter] = value
-            data[parent_name[1]] = config_class(**config)
-
-        # special treatment for the envelope config
-        if not self.envelope.enable():
-            data.pop("envelope_config")
-
-        # special treatment for the imp50
+        for config_class, (section, argument) in self._config_classes.items():
+            if argument not in self._configs or section in changed:
+                self._configs[argument] = self._build_config(config_class, section)
+                data[argument] = self._configs[argument]
+        # the envelope is disabled if the config is not passed
+        if self._values["/envelope/enable"]:
+            data["envelope_config"] = self._configs["envelope_config"]
+        else:
+            data.pop("envelope_config", None)
         try:
-            data["trig_config"].imp50 = data["trig_config"].imp50 == "imp50"
-        except AttributeError:
-            logger.warning(
-                "imp50 setting is no longer available in the shf_sweeper class.",
-            )
-        # special treatment for mode
-        try:
-            data["sweep_config"].use_sequencer = (
-                data["sweep_config"].use_sequencer == "sequencer-based"
-            )
-        except AttributeError:
-            logger.warning(
-                "use_sequencer setting is no longer available in the shf_sweeper class.",
-            )
-        # special treatment for trigger source
-        try:
-            data["trig_config"].source = (
-                data["trig_config"].source
-                if data["trig_config"].source != "auto"
-                else None
-            )
-        except AttributeError:
-            logger.warning(
-                "source setting is no longer available in the shf_sweeper class.",
-            )
-        # special treatment for the force_sw_trigger
-        try:
-            data["trig_config"].force_sw_trigger = (
-                data["trig_config"].force_sw_trigger == "force"
-            )
-        except AttributeError:
-            logger.warning(
-                "force_sw_trigger setting is no longer available in the shf_sweeper.",
-            )
-        self._raw_module.configure(**data)
+            self._raw_module.configure(**data)
+        except Exception:
+            self._configs.clear()
+            raise
+        self._values.changed.clear()
 
     def run(self) -> dict:
         """Perform a sweep with the specified settings.
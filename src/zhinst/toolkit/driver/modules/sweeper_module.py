@@ -8,6 +8,7 @@ from zhinst.core import SweeperModule as ZISweeperModule
 from zhinst.toolkit.driver.modules.base_module import BaseModule
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
@@ -27,10 +28,18 @@ class SweeperModule(BaseModule):
     Args:
         sweeper_module: Instance of the core Sweeper Module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, sweeper_module: ZISweeperModule, session: "Session"):
-        super().__init__(sweeper_module, session)
+    def __init__(
+        self,
+        sweeper_module: ZISweeperModule,
+        session: "Session",
+        *,
+        preloaded_json: t.Optional["NodeDoc"] = None,
+    ):
+        super().__init__(sweeper_module, session, preloaded_json=preloaded_json)
         self.root.update_nodes(
             {
                 "/gridnode": {
@@ -10,6 +10,7 @@ from zhinst.core import TimelineModule as ZITimelineModule
 from zhinst.toolkit.driver.modules.base_module import BaseModule
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree.helper import NodeDoc
     from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
@@ -25,10 +26,18 @@ class TimelineModule(BaseModule):
     Args:
         timeline_module: Instance of the core Timeline module.
         session: Session to the Data Server.
+        preloaded_json: Optional node documentation of the module.
+            (default = None)
     """
 
-    def __init__(self, timeline_module: ZITimelineModule, session: Session):
-        super().__init__(timeline_module, session)
+    def __init__(
+        self,
+        timeline_module: ZITimelineModule,
+        session: Session,
+        *,
+        preloaded_json: t.Optional[NodeDoc] = None,
+    ):
+        super().__init__(timeline_module, session, preloaded_json=preloaded_json)
 
     def finish(self) -> None:
         """Stop the module."""
@@ -2,23 +2,46 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import math
 import typing as t
+from collections import namedtuple
 from functools import cached_property
 
+import numpy as np
 from zhinst.core import compile_seqc
 
+from zhinst.toolkit.compiler_cache import CompilerCache
 from zhinst.toolkit.driver.nodes.command_table_node import CommandTableNode
 from zhinst.toolkit.nodetree import Node, NodeTree
 from zhinst.toolkit.nodetree.helper import (
     create_or_append_set_transaction,
 )
 from zhinst.toolkit.sequence import Sequence
-from zhinst.toolkit.waveform import Waveforms
+from zhinst.toolkit.waveform import (
+    SlotDigests,
+    UploadStats,
+    Waveforms,
+    parse_waveform_descriptors,
+)
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.session import Session
 
 logger = logging.getLogger(__name__)
 
+# Waveforms are converted and uploaded in transactions of at most this size.
+_UPLOAD_BATCH_BYTES = 64 * 1024**2
+
+# Waveform memory reads larger than this are split across pooled connections.
+_READBACK_BYTES_PER_REQUEST = 8 * 1024**2
+
+_LoadedProgram = namedtuple(
+    "_LoadedProgram",
+    ["key", "digest", "length", "checksum", "info"],
+)
+
 
 class AWG(Node):
     """AWG node.
@@ -35,6 +58,11 @@ class AWG(Node):
         index: Index of the corresponding awg channel
         device_type: Device type
         device_options: Device options
+        compiler_cache: Cache for compiled sequencer programs. Uses the
+            default cache (``CompilerCache.default``) if not specified.
+            (default = None)
+        session: Session of the device. Large reads of the waveform memory
+            are distributed over its connection pool. (default = None)
     """
 
     def __init__(
@@ -45,6 +73,9 @@ class AWG(Node):
         index: int,
         device_type: str,
         device_options: str,
+        *,
+        compiler_cache: t.Optional[CompilerCache] = None,
+        session: t.Optional[Session] = None,
     ):
         Node.__init__(self, root, tree)
         self._daq_server = root.connection
@@ -52,6 +83,25 @@ class AWG(Node):
         self._index = index
         self._device_type = device_type
         self._device_options = device_options
+        self._compiler_cache = compiler_cache
+        self._session = session
+        self._loaded_program: t.Optional[_LoadedProgram] = None
+        self._waveform_digests = SlotDigests()
+
+    @property
+    def compiler_cache(self) -> t.Optional[CompilerCache]:
+        """Cache for compiled sequencer programs (``None`` if disabled).
+
+        Falls back to the default cache (``CompilerCache.default``) if the
+        AWG has no cache of its own.
+        """
+        if self._compiler_cache is not None:
+            return self._compiler_cache
+        return CompilerCache.default()
+
+    @compiler_cache.setter
+    def compiler_cache(self, cache: t.Optional[CompilerCache]) -> None:
+        self._compiler_cache = cache
 
     def enable_sequencer(self, *, single: bool) -> None:
         """Starts the sequencer of a specific channel.
@@ -120,6 +170,10 @@ class AWG(Node):
     ) -> tuple[bytes, dict[str, t.Any]]:
         """Compiles a sequencer program for the specific device.
 
+        If the AWG has a compiler cache (see ``compiler_cache``) the program is
+        only compiled if the cache holds no result for the same program,
+        device and compiler arguments.
+
         Args:
             sequencer_program: The sequencer program to compile.
 
@@ -151,26 +205,76 @@ class AWG(Node):
             RuntimeError: `sequencer_program` is empty.
             RuntimeError: If the compilation failed.
         """
+        args, kwargs = self._compile_arguments(sequencer_program, **kwargs)
+        return self._compile(args, kwargs)
+
+    def _compile(
+        self,
+        args: tuple[str, str, str, int],
+        kwargs: dict[str, t.Any],
+    ) -> tuple[bytes, dict[str, t.Any]]:
+        """Compile with the compiler cache of the AWG (if any).
+
+        Args:
+            args: Positional arguments of ``zhinst.core.compile_seqc``.
+            kwargs: Keyword arguments of ``zhinst.core.compile_seqc``.
+
+        Returns:
+            elf: Binary ELF data for sequencer.
+            extra: Extra dictionary with compiler output.
+        """
+        cache = self.compiler_cache
+        if cache is not None:
+            return cache.compile(*args, **kwargs)
+        return compile_seqc(*args, **kwargs)
+
+    def _compile_arguments(
+        self,
+        sequencer_program: t.Union[str, Sequence],
+        **kwargs: t.Union[str, int],
+    ) -> tuple[tuple[str, str, str, int], dict[str, t.Any]]:
+        """Arguments of ``zhinst.core.compile_seqc`` for a sequencer program.
+
+        Adds the device specific keyword arguments (sequencer of the SHFQC,
+        samplerate of the HDAWG).
+
+        Args:
+            sequencer_program: The sequencer program to compile.
+            kwargs: Additional compiler arguments.
+
+        Returns:
+            Positional and keyword arguments.
+        """
         if "SHFQC" in self._device_type:
             kwargs["sequencer"] = "sg" if "sgchannels" in self._tree else "qa"
         elif "HDAWG" in self._device_type and "samplerate" not in kwargs:
             kwargs["samplerate"] = self.root.system.clocks.sampleclock.freq()
-
-        return compile_seqc(
+        args = (
             str(sequencer_program),
             self._device_type,
             self._device_options,
             self._index,
-            **kwargs,
         )
+        return args, kwargs
 
     def load_sequencer_program(
         self,
         sequencer_program: t.Union[str, Sequence],
+        *,
+        force: bool = False,
+        verify: bool = True,
         **kwargs: t.Union[str, int],
     ) -> dict[str, t.Any]:
         """Compiles the given sequencer program on the AWG Core.
 
+        The AWG remembers the last program it uploaded in this session. If the
+        same program (or a program that compiles to the same ELF) is loaded
+        again, the upload is skipped, since it would force the device to
+        reload the program and reset its ready state. By default the upload is
+        only skipped after checking the device, so that uploads that bypass
+        this function (e.g. writing ``elf.data`` directly, loading a preset or
+        another session) are detected.
+
         Warning:
             After uploading the sequencer program one needs to wait before for
             the awg core to become ready before it can be enabled.
@@ -179,6 +283,13 @@ class AWG(Node):
 
         Args:
             sequencer_program: Sequencer program to be uploaded.
+            force: Flag if the program is uploaded even if it is already
+                loaded. (default = False)
+            verify: Flag if the device is checked before an upload is skipped.
+                The AWG core must be ready and its ELF length and checksum
+                (if the core has a checksum node) must match the ones of the
+                last upload. Without it the upload is skipped based on the
+                state of this session only. (default = True)
 
         Keyword Args:
             samplerate (int): Target sample rate of the sequencer. Only allowed/
@@ -202,33 +313,188 @@ class AWG(Node):
             RuntimeError: `sequencer_program` is empty.
             RuntimeError: If the upload or compilation failed.
         """
-        elf, compiler_info = self.compile_sequencer_program(sequencer_program, **kwargs)
+        args, kwargs = self._compile_arguments(sequencer_program, **kwargs)
+        key = CompilerCache.key(sequencer_program, *args[1:], **kwargs)
+        loaded = self._loaded_program
+        if (
+            not force
+            and loaded is not None
+            and loaded.key == key
+            and (not verify or self._verify_loaded())
+        ):
+            logger.debug(f"{self!r}: Sequencer program is already loaded.")
+            return loaded.info
+        elf, compiler_info = self._compile(args, kwargs)
+        if (
+            not force
+            and loaded is not None
+            and loaded.digest == hashlib.blake2b(elf).hexdigest()
+        ):
+            # Different compiler arguments that result in the same ELF
+            self._loaded_program = loaded._replace(key=key, info=compiler_info)
+            if not verify or self._verify_loaded():
+                logger.debug(f"{self!r}: ELF of the sequencer program is loaded.")
+                return compiler_info
+        self._loaded_program = None
         self.elf.data(elf)
+        self._remember_upload(key, elf, compiler_info)
         return compiler_info
 
+    def _remember_upload(
+        self,
+        key: str,
+        elf: bytes,
+        compiler_info: dict[str, t.Any],
+    ) -> None:
+        """Remember the program uploaded to the AWG core.
+
+        Args:
+            key: Compiler cache key of the program (see ``CompilerCache.key``).
+            elf: Uploaded ELF data.
+            compiler_info: Compiler output of the program.
+        """
+        # Loading a program resets the waveform memory
+        self._waveform_digests.clear()
+        self._loaded_program = _LoadedProgram(
+            key=key,
+            digest=hashlib.blake2b(elf).hexdigest(),
+            length=len(elf),
+            checksum=None,
+            info=compiler_info,
+        )
+
+    def _verify_loaded(self) -> bool:
+        """Check that the last uploaded program is still loaded on the device.
+
+        The AWG core must be ready and the length of its ELF must match the
+        last upload. The checksum of the ELF is recorded on the first
+        verification and must not change afterwards. Cores without a checksum
+        node (e.g. the SHFQA generator) are only checked for the ready state
+        and the length.
+
+        Returns:
+            Flag if the program is still loaded.
+        """
+        paths = [self.ready.node_info.path, self.elf.length.node_info.path]
+        has_checksum = self.elf.checksum.is_valid()
+        if has_checksum:
+            paths.append(self.elf.checksum.node_info.path)
+        raw = self._daq_server.get(",".join(paths), settingsonly=False, flat=True)
+        try:
+            values = [int(raw[path]["value"][-1]) for path in paths]
+        except (KeyError, IndexError):
+            return False
+        ready, length = values[:2]
+        loaded = self._loaded_program
+        if loaded is None or not ready or length != loaded.length:
+            return False
+        if not has_checksum:
+            return True
+        checksum = values[2]
+        if loaded.checksum is None:
+            self._loaded_program = loaded._replace(checksum=checksum)
+            return True
+        return checksum == loaded.checksum
+
+    def reset_upload_state(self) -> None:
+        """Forget the sequencer program and waveforms uploaded by the toolkit.
+
+        Needs to be called if the AWG core is changed outside of the toolkit
+        and ``load_sequencer_program`` is used without verification or
+        ``write_to_waveform_memory`` with ``skip_unchanged``. It is called
+        automatically by ``factory_reset``.
+        """
+        self._loaded_program = None
+        self._waveform_digests.clear()
+
     def write_to_waveform_memory(
         self,
         waveforms: Waveforms,
         indexes: t.Optional[list] = None,
-    ) -> None:
+        *,
+        skip_unchanged: bool = False,
+    ) -> UploadStats:
         """Writes waveforms to the waveform memory.
 
         The waveforms must already be assigned in the sequencer program.
 
+        The waveforms are converted and uploaded in batches of up to 64 MiB,
+        one transaction per batch. Large libraries (e.g. ``ArenaWaveforms``
+        backed by a file) are therefore never held in memory as a whole.
+        Inside an outer transaction all batches are part of it.
+
+        The AWG core remembers a digest of every waveform it uploaded since
+        the last sequencer program was loaded. With ``skip_unchanged`` only
+        the waveforms whose content changed since their last upload are
+        sent to the device. Waveforms written to the device in any other way
+        (e.g. writing the wave nodes directly) are not tracked.
+
         Args:
             waveforms: Waveforms that should be uploaded.
             indexes: Specify a list of indexes that should be uploaded. If
                 nothing is specified all available indexes in waveforms will
                 be uploaded. (default = None)
+            skip_unchanged: Flag if waveforms that did not change since their
+                last upload are skipped. (default = False)
+
+        Returns:
+            Number of uploaded and skipped waveforms and their size in bytes.
         """
-        with create_or_append_set_transaction(self._root):
-            for waveform_index in waveforms:
-                if indexes and waveform_index not in indexes:
-                    continue
-                self.root.transaction.add(
-                    self.waveform.waves[waveform_index],
-                    waveforms.get_raw_vector(waveform_index),
+        slots = [
+            waveform_index
+            for waveform_index in waveforms
+            if not indexes or waveform_index in indexes
+        ]
+        stats = UploadStats(0, 0, 0, 0)
+        for vectors in waveforms.iter_raw_vectors(
+            slots,
+            max_bytes=_UPLOAD_BATCH_BYTES,
+        ):
+            batch_stats = self._upload_waveforms(
+                vectors,
+                lambda slot: self.waveform.waves[slot],
+                skip_unchanged=skip_unchanged,
+            )
+            stats = UploadStats(
+                *(a + b for a, b in zip(stats, batch_stats, strict=True)),
+            )
+        return stats
+
+    def _upload_waveforms(
+        self,
+        vectors: dict[int, np.ndarray],
+        node: t.Callable[[int], Node],
+        *,
+        skip_unchanged: bool,
+    ) -> UploadStats:
+        """Upload the changed raw vectors in a transaction.
+
+        Args:
+            vectors: Raw vector per slot.
+            node: Function that returns the wave node of a slot.
+            skip_unchanged: Flag if slots that did not change since their last
+                upload are skipped.
+
+        Returns:
+            Upload statistics.
+        """
+        changed, stats, digests = self._waveform_digests.select(
+            vectors,
+            skip_unchanged=skip_unchanged,
+        )
+        try:
+            with create_or_append_set_transaction(self._root):
+                for slot, vector in changed.items():
+                    self.root.transaction.add(node(slot), vector)
+                # An outer transaction may still be aborted
+                self.root.transaction.add_commit_callback(
+                    lambda: self._waveform_digests.update(digests),
                 )
+        except Exception:
+            # The state of the waveform memory is unknown
+            self._waveform_digests.clear()
+            raise
+        return stats
 
     def read_from_waveform_memory(
         self,
@@ -243,28 +509,85 @@ class AWG(Node):
         Returns:
             Waveform object with the downloaded waveforms.
         """
-        waveform_info = json.loads(self.waveform.descriptors()).get("waveforms", [])
-        nodes = [
-            self.waveform.node_info.path + f"/waves/{index}"
-            for index in range(len(waveform_info))
-            if (indexes is None or index in indexes)
-            # Entries that have a play_config equals to zero ar dummies/fillers
-            # and can therefore be ignored.
-            and int(waveform_info[index]["play_config"])
-        ]
-        nodes_str = ",".join(nodes)
-        waveforms_raw = self._daq_server.get(nodes_str, settingsonly=False, flat=True)
+        table, _ = parse_waveform_descriptors(self.waveform.descriptors())
+        # Entries that have a play_config equals to zero ar dummies/fillers
+        # and can therefore be ignored.
+        selected = table["play_config"] != 0
+        if indexes is not None:
+            selected &= np.isin(np.arange(len(table)), indexes)
+        slots = np.flatnonzero(selected)
+        frames = table["channels"][slots] + (table["marker_bits"][slots] & 1)
+        vectors = self._read_vectors(
+            [self.waveform.node_info.path + f"/waves/{slot}" for slot in slots],
+            sizes=(2 * table["length"][slots] * frames).tolist(),
+        )
         waveforms = Waveforms()
-        for node, waveform in waveforms_raw.items():
-            slot = int(node.rsplit("/", 1)[-1])
-            waveforms.assign_native_awg_waveform(
-                slot,
-                waveform[0]["vector"],
-                channels=int(waveform_info[slot].get("channels", 1)),
-                markers_present=bool(int(waveform_info[slot].get("marker_bits")[0])),
-            )
+        waveforms.assign_native_awg_waveforms(
+            {
+                slot: (
+                    vector,
+                    int(table["channels"][slot]),
+                    bool(table["marker_bits"][slot] & 1),
+                )
+                for slot, vector in vectors.items()
+            },
+        )
         return waveforms
 
+    def _read_vectors(
+        self,
+        nodes: list[str],
+        *,
+        sizes: t.Optional[list[int]] = None,
+    ) -> dict[int, np.ndarray]:
+        """Read the vectors of waveform slot nodes.
+
+        If the AWG knows its session and the expected total size exceeds
+        ``_READBACK_BYTES_PER_REQUEST``, the nodes are distributed over
+        multiple requests of similar size that run in parallel on the
+        connection pool of the session.
+
+        Args:
+            nodes: Paths of the nodes. A wildcard for the slot is allowed.
+            sizes: Expected size of every node in bytes. The nodes are read
+                in a single request if not specified. (default = None)
+
+        Returns:
+            Vector per slot index. The slot index is parsed from the node
+            path of the result.
+        """
+        pool = self._session.connection_pool if self._session else None
+        groups = [nodes]
+        if pool is not None and sizes is not None:
+            num_requests = min(
+                pool.max_size,
+                len(nodes),
+                math.ceil(sum(sizes) / _READBACK_BYTES_PER_REQUEST),
+            )
+            if num_requests > 1:
+                groups = [[] for _ in range(num_requests)]
+                loads = [0] * num_requests
+                for size, node in sorted(
+                    zip(sizes, nodes, strict=True),
+                    reverse=True,
+                ):
+                    target = loads.index(min(loads))
+                    groups[target].append(node)
+                    loads[target] += size
+
+        def read(daq_server, group: list[str]) -> dict:
+            return daq_server.get(",".join(group), settingsonly=False, flat=True)
+
+        if pool is None or len(groups) == 1:
+            results = [read(self._daq_server, nodes)]
+        else:
+            results = pool.map(read, groups)
+        return {
+            _slot_index(node): value[0]["vector"]
+            for result in results
+            for node, value in result.items()
+        }
+
     @cached_property
     def commandtable(self) -> t.Optional[CommandTableNode]:
         """Command table module.
@@ -279,3 +602,17 @@ class AWG(Node):
                 self._device_type,
             )
         return None
+
+
+def _slot_index(node: str) -> int:
+    """Index of the waveform slot a node belongs to.
+
+    Args:
+        node: Path of an AWG wave node (``.../waves/<slot>``) or of a
+            generator wave node (``.../waveforms/<slot>/wave``).
+
+    Returns:
+        Index of the slot.
+    """
+    parts = node.rstrip("/").split("/")
+    return int(parts[-1]) if parts[-1].isdigit() else int(parts[-2])
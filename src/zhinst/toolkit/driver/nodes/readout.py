@@ -9,12 +9,16 @@ from functools import cached_property
 import numpy as np
 import zhinst.utils.shfqa as utils
 
+from zhinst.toolkit.driver.nodes.awg import _UPLOAD_BATCH_BYTES
 from zhinst.toolkit.driver.nodes.multistate import MultiState
 from zhinst.toolkit.exceptions import ToolkitError
 from zhinst.toolkit.interface import AveragingMode
 from zhinst.toolkit.nodetree import Node, NodeTree
-from zhinst.toolkit.nodetree.helper import not_callable_in_transactions
-from zhinst.toolkit.waveform import Waveforms
+from zhinst.toolkit.nodetree.helper import (
+    create_or_append_set_transaction,
+    not_callable_in_transactions,
+)
+from zhinst.toolkit.waveform import SlotDigests, UploadStats, Waveforms
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,7 @@ class Readout(Node):
         self._serial = serial
         self._index = index
         self._max_qubits_per_channel = max_qubits_per_channel
+        self._weight_digests = SlotDigests()
 
     def configure_result_logger(
         self,
@@ -169,9 +174,18 @@ class Readout(Node):
         integration_delay: float = 0.0,
         integration_length: t.Optional[int] = None,
         clear_existing: bool = True,
-    ) -> None:
+        skip_unchanged: bool = False,
+    ) -> UploadStats:
         """Configures the weighted integration.
 
+        ``Waveforms`` are converted and uploaded in batches of up to 64 MiB,
+        one transaction per batch (see ``AWG.write_to_waveform_memory``).
+
+        The readout remembers a digest of every weight it uploaded. With
+        ``skip_unchanged`` only the weights whose content changed since their
+        last upload are sent to the device. Weights written to the device in
+        any other way are not tracked.
+
         Args:
             weights: Dictionary containing the complex weight vectors, where
                 keys correspond to the indices of the integration units to be
@@ -182,6 +196,12 @@ class Readout(Node):
                 length of the first weights vector.
             clear_existing: Flag whether to clear the waveform memory before
                 the present upload.
+            skip_unchanged: Flag if weights that did not change since their
+                last upload are skipped. Has no effect if ``clear_existing`` is
+                set. (default = False)
+
+        Returns:
+            Number of uploaded and skipped weights and their size in bytes.
         """
         if (
             len(weights.keys()) > 0
@@ -194,22 +214,87 @@ class Readout(Node):
             raise ToolkitError(
                 msg,
             )
-        waveform_dict = {}
-        if isinstance(weights, Waveforms):
-            for slot in weights:
-                waveform_dict[slot] = weights.get_raw_vector(slot, complex_output=True)
-        else:
-            waveform_dict = weights
+        batches: t.Iterable[t.Mapping[int, t.Any]] = [weights]
+        if isinstance(weights, Waveforms) and len(weights) > 0:
+            batches = weights.iter_raw_vectors(
+                complex_output=True,
+                max_bytes=_UPLOAD_BATCH_BYTES,
+            )
+        if clear_existing:
+            self._weight_digests.clear()
+        stats = UploadStats(0, 0, 0, 0)
+        for index, vectors in enumerate(batches):
+            if integration_length is None:
+                integration_length = len(next(iter(vectors.values()), []))
+            batch_stats = self._upload_weights(
+                vectors,
+                integration_delay=integration_delay,
+                integration_length=integration_length,
+                clear_existing=clear_existing and index == 0,
+                skip_unchanged=skip_unchanged and not clear_existing,
+            )
+            stats = UploadStats(
+                *(a + b for a, b in zip(stats, batch_stats, strict=True)),
+            )
+        return stats
 
+    def _upload_weights(
+        self,
+        weights: t.Mapping[int, t.Any],
+        *,
+        integration_delay: float,
+        integration_length: int,
+        clear_existing: bool,
+        skip_unchanged: bool,
+    ) -> UploadStats:
+        """Upload the changed integration weights in a transaction.
+
+        Args:
+            weights: Complex weight vector per integration unit.
+            integration_delay: Delay in seconds before starting the readout.
+            integration_length: Number of samples over which the weighted
+                integration runs.
+            clear_existing: Flag whether to clear the waveform memory before
+                the upload.
+            skip_unchanged: Flag if weights that did not change since their
+                last upload are skipped.
+
+        Returns:
+            Upload statistics.
+        """
         settings = utils.get_configure_weighted_integration_settings(
             self._serial,
             self._index,
-            weights=waveform_dict,
+            weights=weights,
             integration_delay=integration_delay,
             integration_length=integration_length,
             clear_existing=clear_existing,
         )
-        self._send_set_list(settings)
+        changed, stats, digests = self._weight_digests.select(
+            weights,
+            skip_unchanged=skip_unchanged,
+        )
+        skipped = {
+            self.integration.weights[slot].wave.node_info.path
+            for slot in weights
+            if slot not in changed
+        }
+        try:
+            with create_or_append_set_transaction(self._root):
+                self._send_set_list(
+                    [
+                        setting
+                        for setting in settings
+                        if setting[0].lower() not in skipped
+                    ],
+                )
+                self.root.transaction.add_commit_callback(
+                    lambda: self._weight_digests.update(digests),
+                )
+        except Exception:
+            self._weight_digests.clear()
+            raise
+        return stats
 
     def read_integration_weights(
         self,
@@ -67,6 +67,7 @@ class Transaction:
         self._queue: t.Optional[list[tuple[str, t.Any]]] = None
         self._root = nodetree
         self._add_callback: t.Optional[t.Callable[[str, t.Any], None]] = None
+        self._commit_callbacks: list[t.Callable[[], None]] = []
 
     def start(
         self,
@@ -92,11 +93,13 @@ class Transaction:
             )
         self._queue = []
         self._add_callback = add_callback
+        self._commit_callbacks = []
 
     def stop(self) -> None:
         """Stop the transaction."""
         self._queue = None
         self._add_callback = None
+        self._commit_callbacks = []
 
     def add(self, node: t.Union[Node, str], value: t.Any) -> None:
         """Adds a single node set command to the set transaction.
@@ -141,6 +144,29 @@ class Transaction:
             msg = "No set transaction is in progress."
             raise ToolkitError(msg) from exception
 
+    def add_commit_callback(self, callback: t.Callable[[], None]) -> None:
+        """Adds a function that is called once the transaction has been set.
+
+        The function is not called if the transaction is aborted (e.g. by an
+        exception inside the transaction) or the set fails.
+
+        Args:
+            callback: Function without arguments.
+
+        Raises:
+            AttributeError: If no transaction is in progress.
+        """
+        if not self.in_progress():
+            msg = "No set transaction is in progress."
+            raise AttributeError(msg)
+        self._commit_callbacks.append(callback)
+
+    def committed(self) -> None:
+        """Call the commit callbacks after the transaction has been set."""
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
     def in_progress(self) -> bool:
         """Flag if the transaction is in progress."""
         return self._queue is not None
@@ -539,6 +565,7 @@ class NodeTree:
         try:
             yield
             self.connection.set(self._transaction.result())  # type: ignore[arg-type]
+            self._transaction.committed()
         finally:
             self._transaction.stop()
 
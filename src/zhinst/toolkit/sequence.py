@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
 import re
 import typing as t
+from collections import namedtuple
 
 from zhinst.toolkit.command_table import CommandTable
 from zhinst.toolkit.waveform import Waveforms
 
+# Marks the value of a constant inside the template. Never part of seqC code.
+_SLOT_MARK = "\x00"
+_SLOT_REGEX = re.compile(rf"{_SLOT_MARK}(\d+){_SLOT_MARK}")
+
+_Template = namedtuple("_Template", ["code", "keys", "segments", "slots", "missing"])
+
 
 class Sequence:
     r"""A representation of a ZI sequencer code.
@@ -22,6 +30,12 @@ class Sequence:
     * Link Waveforms to the sequence. This adds the waveform placeholder
         definitions to the top of the resulting sequencer code.
 
+    The code is parsed once into a template with a slot for the value of
+    every constant it defines. The template is only parsed again if the code
+    or the names of the constants change. Changing the value of a constant
+    (e.g. in a parameter sweep) therefore only requires joining the template
+    with the new values.
+
     Note:
         This class is only for convenience. The same functionality can be
         achieved with a simple string.
@@ -68,6 +82,8 @@ class Sequence:
         self._constants = constants or {}
         self._waveforms = waveforms
         self._command_table = command_table
+        self._template: t.Optional[_Template] = None
+        self._content_hash: tuple[str, str] = ("", hashlib.sha256().hexdigest())
 
     def __str__(self) -> str:
         return self.to_string()
@@ -82,31 +98,85 @@ class Sequence:
         Returns:
             String representation of the sequence.
         """
-        sequence = self._partial_seq
+        template = self._get_template()
+        parts = []
+        if template.missing:
+            parts.append(
+                "// Constants\n"
+                + "\n".join(
+                    [
+                        f"const {key} = {self._constants[key]};"
+                        for key in template.missing
+                    ],
+                )
+                + "\n",
+            )
         if waveform_snippet and self._waveforms:
-            sequence = (
+            parts.append(
                 "// Waveforms declaration\n"
                 + self._waveforms.get_sequence_snippet()
-                + "\n"
-                + sequence
+                + "\n",
             )
-        new_constants = {}
-        for key, value in self._constants.items():
+        parts.append(template.segments[0])
+        for key, segment in zip(template.slots, template.segments[1:], strict=True):
+            parts.append(f"{self._constants[key]}")
+            parts.append(segment)
+        return "".join(parts)
+
+    def _get_template(self) -> _Template:
+        """Template of the code for the current constants.
+
+        Existing definitions of a constant in the code (``const NAME = ...;``)
+        become slots for its value. Constants without a definition in the
+        code are listed in ``missing`` and are added to the top.
+
+        Returns:
+            Template of the code.
+        """
+        keys = tuple(self._constants)
+        template = self._template
+        if (
+            template is not None
+            and template.keys == keys
+            and template.code == self._partial_seq
+        ):
+            return template
+        code = self._partial_seq
+        missing = []
+        for index, key in enumerate(keys):
             constant_regex = re.compile(rf"(const {key} *= *)(.*);")
-            if constant_regex.search(sequence):
-                sequence = constant_regex.sub(rf"\g<1>{value};", sequence)
-            else:
-                new_constants[key] = value
-        if len(new_constants) > 0:
-            sequence = (
-                "// Constants\n"
-                + "\n".join(
-                    [f"const {key} = {value};" for key, value in new_constants.items()],
+            if constant_regex.search(code):
+                code = constant_regex.sub(
+                    rf"\g<1>{_SLOT_MARK}{index}{_SLOT_MARK};",
+                    code,
                 )
-                + "\n"
-                + sequence
+            else:
+                missing.append(key)
+        parts = _SLOT_REGEX.split(code)
+        template = _Template(
+            code=self._partial_seq,
+            keys=keys,
+            segments=parts[::2],
+            slots=[keys[int(index)] for index in parts[1::2]],
+            missing=missing,
+        )
+        self._template = template
+        return template
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 hex digest of the sequencer code (``to_string()``).
+
+        Equal sequencer code results in the same hash. It is used by the
+        ``CompilerCache`` to identify the program.
+        """
+        sequence = self.to_string()
+        if sequence != self._content_hash[0]:
+            self._content_hash = (
+                sequence,
+                hashlib.sha256(sequence.encode()).hexdigest(),
             )
-        return sequence
+        return self._content_hash[1]
 
     @property
     def code(self) -> str:
@@ -3,21 +3,57 @@
 from __future__ import annotations
 
 import json
+import logging
+import multiprocessing
+import os
 import re
+import threading
+import time
 import typing as t
+from collections import namedtuple
 from collections.abc import MutableMapping
-from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from enum import IntFlag
 from functools import cached_property
 from pathlib import Path
 
+import numpy as np
+
 import zhinst.toolkit.driver.devices as tk_devices
 import zhinst.toolkit.driver.modules as tk_modules
 from zhinst import core
+from zhinst.toolkit.compiler_cache import CompilerCache
 from zhinst.toolkit.exceptions import ToolkitError
 from zhinst.toolkit.nodetree import Node, NodeTree
-from zhinst.toolkit.nodetree.helper import NodeDict
+from zhinst.toolkit.nodetree.helper import NodeDict, NodeDoc
 from zhinst.toolkit.nodetree.nodetree import Transaction
+from zhinst.toolkit.streaming import (
+    PollDispatcher,
+    PollStream,
+    resolve_clockbases,
+    to_structured,
+)
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.driver.nodes.awg import AWG
+    from zhinst.toolkit.sequence import Sequence
+
+logger = logging.getLogger(__name__)
+
+DeviceTiming = namedtuple("DeviceTiming", ["connect", "create"])
+BulkConnection = namedtuple("BulkConnection", ["devices", "timing"])
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+
+def _compile_seqc(
+    arguments: tuple[tuple, dict[str, t.Any]],
+) -> tuple[bytes, dict[str, t.Any]]:
+    """Call ``zhinst.core.compile_seqc`` (picklable for process pools)."""
+    args, kwargs = arguments
+    return core.compile_seqc(*args, **kwargs)
 
 
 class Devices(MutableMapping):
@@ -41,14 +77,10 @@ class Devices(MutableMapping):
         key = key.lower()
         if key in self.connected():
             if key not in self._devices:
-                self._devices[key] = self._create_device(key)
-                # start a transaction if the session has a ongoing one
-                if self._session.multi_transaction.in_progress():
-                    self._devices[key].root.transaction.start(
-                        self._session.multi_transaction.add,
-                    )
+                self._add_device(key, self._create_device(key))
             return self._devices[key]
         self._devices.pop(key, None)
+        self._session._clockbases.pop(key, None)
         raise KeyError(key)
 
     def __setitem__(self, *_):
@@ -62,6 +94,7 @@ class Devices(MutableMapping):
 
     def __delitem__(self, key):
         self._devices.pop(key, None)
+        self._session._clockbases.pop(key, None)
 
     def __iter__(self):
         return iter(self.connected())
@@ -69,7 +102,33 @@ class Devices(MutableMapping):
     def __len__(self):
         return len(self.connected())
 
-    def _create_device(self, serial: str) -> tk_devices.DeviceType:
+    def _add_device(
+        self,
+        serial: str,
+        device: tk_devices.DeviceType,
+    ) -> tk_devices.DeviceType:
+        """Register a created device object.
+
+        Args:
+            serial: Device serial
+            device: Device object
+
+        Returns:
+            Registered device object
+        """
+        self._devices[serial] = device
+        # start a transaction if the session has a ongoing one
+        if self._session.multi_transaction.in_progress():
+            device.root.transaction.start(self._session.multi_transaction.add)
+        return device
+
+    def _create_device(
+        self,
+        serial: str,
+        *,
+        dev_type: t.Optional[str] = None,
+        **kwargs,
+    ) -> tk_devices.DeviceType:
         """Creates a new device object.
 
         Maps the device type to the correct instrument class (The default is
@@ -81,6 +140,9 @@ class Devices(MutableMapping):
 
         Args:
             serial: Device serial
+            dev_type: Device type. If not specified it is read from the
+                device. (default = None)
+            **kwargs: Additional arguments passed to the instrument class.
 
         Returns:
             Newly created instrument object
@@ -88,13 +150,17 @@ class Devices(MutableMapping):
         Raises:
             RuntimeError: If the device is not connected to the data server
         """
-        dev_type = self._session.daq_server.getString(f"/{serial}/features/devtype")
+        if dev_type is None:
+            dev_type = self._session.daq_server.getString(
+                f"/{serial}/features/devtype",
+            )
         # Strip trailing channel number
         dev_type_base = re.sub(r"\d+$", "", dev_type)
         return self._device_classes.get(dev_type_base, tk_devices.BaseInstrument)(
             serial,
             dev_type,
             self._session,
+            **kwargs,
         )
 
     def connected(self) -> list[str]:
@@ -147,7 +213,7 @@ class HF2Devices(Devices):
     behavior of the new data server used for the other devices.
     """
 
-    def _create_device(self, serial: str) -> tk_devices.BaseInstrument:
+    def _create_device(self, serial: str, **kwargs) -> tk_devices.BaseInstrument:
         """Creates a new device object.
 
         Maps the device type to the correct instrument class (The default is
@@ -159,6 +225,7 @@ class HF2Devices(Devices):
 
         Args:
             serial: Device serial
+            **kwargs: Additional arguments passed to the instrument class.
 
         Returns:
             Newly created instrument object
@@ -168,7 +235,7 @@ class HF2Devices(Devices):
             ToolkitError: DataServer is HF2, but the device is not.
         """
         try:
-            return super()._create_device(serial)
+            return super()._create_device(serial, **kwargs)
         except RuntimeError as error:
             if "ZIAPINotFoundException" in error.args[0]:
                 discovery = core.ziDiscovery()
@@ -236,12 +303,21 @@ class ModuleHandler:
     each LabOne module. These functions create a unmanaged instance of that
     module (unmanaged means toolkit does not hold an instance of that module).
 
+    Code that needs a module only temporarily (e.g. in a loop) can borrow one
+    from the module pool with ``pooled``. Released modules are reset to their
+    default settings and reused, which avoids the costly creation of a new
+    module. The node documentation is only listed once per module type.
+
     Args:
         session: Active user session
     """
 
     def __init__(self, session: Session):
         self._session = session
+        self._nodedocs: dict[str, NodeDoc] = {}
+        self._pool: dict[str, list[tk_modules.BaseModule]] = {}
+        self._defaults: dict[int, tuple[str, dict[str, t.Any]]] = {}
+        self._lock = threading.Lock()
 
     def __repr__(self):
         return str(
@@ -249,6 +325,28 @@ class ModuleHandler:
             f"{self._session.daq_server.host}:{self._session.daq_server.port})",
         )
 
+    def _nodedoc(self, module_type: str, raw_module: core.ModuleBase) -> NodeDoc:
+        """Node documentation of a module type.
+
+        The nodes are only listed for the first module of each type. Every
+        module gets its own copy since the node parsers are bound to the
+        module instance.
+
+        Args:
+            module_type: Name of the zhinst.core module factory.
+            raw_module: zhinst.core module of that type.
+
+        Returns:
+            Node documentation of the module.
+        """
+        with self._lock:
+            nodedoc = self._nodedocs.get(module_type)
+        if nodedoc is None:
+            nodedoc = json.loads(raw_module.listNodesJSON("*"))
+            with self._lock:
+                self._nodedocs.setdefault(module_type, nodedoc)
+        return {path: dict(info) for path, info in nodedoc.items()}
+
     def create_awg_module(self) -> tk_modules.BaseModule:
         """Create an instance of the AwgModule.
 
@@ -266,9 +364,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.awgModule()
         return tk_modules.BaseModule(
-            self._session.daq_server.awgModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("awgModule", raw_module),
         )
 
     def create_daq_module(self) -> tk_modules.DAQModule:
@@ -288,9 +388,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.dataAcquisitionModule()
         return tk_modules.DAQModule(
-            self._session.daq_server.dataAcquisitionModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("dataAcquisitionModule", raw_module),
         )
 
     def create_data_streaming_module(self) -> tk_modules.DataStreamingModule:
@@ -310,9 +412,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.dataStreamingModule()
         return tk_modules.DataStreamingModule(
-            self._session.daq_server.dataStreamingModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("dataStreamingModule", raw_module),
         )
 
     def create_device_settings_module(self) -> tk_modules.DeviceSettingsModule:
@@ -332,9 +436,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.deviceSettings()
         return tk_modules.DeviceSettingsModule(
-            self._session.daq_server.deviceSettings(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("deviceSettings", raw_module),
         )
 
     def create_impedance_module(self) -> tk_modules.ImpedanceModule:
@@ -354,9 +460,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.impedanceModule()
         return tk_modules.ImpedanceModule(
-            self._session.daq_server.impedanceModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("impedanceModule", raw_module),
         )
 
     def create_mds_module(self) -> tk_modules.BaseModule:
@@ -376,9 +484,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.multiDeviceSyncModule()
         return tk_modules.BaseModule(
-            self._session.daq_server.multiDeviceSyncModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("multiDeviceSyncModule", raw_module),
         )
 
     def create_pid_advisor_module(self) -> tk_modules.PIDAdvisorModule:
@@ -398,9 +508,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.pidAdvisor()
         return tk_modules.PIDAdvisorModule(
-            self._session.daq_server.pidAdvisor(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("pidAdvisor", raw_module),
         )
 
     def create_precompensation_advisor_module(
@@ -421,9 +533,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.precompensationAdvisor()
         return tk_modules.PrecompensationAdvisorModule(
-            self._session.daq_server.precompensationAdvisor(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("precompensationAdvisor", raw_module),
         )
 
     def create_qa_module(self) -> tk_modules.BaseModule:
@@ -443,9 +557,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.quantumAnalyzerModule()
         return tk_modules.BaseModule(
-            self._session.daq_server.quantumAnalyzerModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("quantumAnalyzerModule", raw_module),
         )
 
     def create_scope_module(self) -> tk_modules.ScopeModule:
@@ -465,9 +581,11 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.scopeModule()
         return tk_modules.ScopeModule(
-            self._session.daq_server.scopeModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("scopeModule", raw_module),
         )
 
     def create_sweeper_module(self) -> tk_modules.SweeperModule:
@@ -487,7 +605,12 @@ class ModuleHandler:
         Returns:
             Created module
         """
-        return tk_modules.SweeperModule(self._session.daq_server.sweep(), self._session)
+        raw_module = self._session.daq_server.sweep()
+        return tk_modules.SweeperModule(
+            raw_module,
+            self._session,
+            preloaded_json=self._nodedoc("sweep", raw_module),
+        )
 
     def create_shfqa_sweeper(self) -> tk_modules.SHFQASweeper:
         """Create an instance of the SHFQASweeper.
@@ -510,6 +633,28 @@ class ModuleHandler:
         """
         return tk_modules.SHFQASweeper(self._session)
 
+    def create_multi_shfqa_sweeper(
+        self,
+        channels: t.Iterable[tuple[t.Union[tk_devices.DeviceType, str], int]],
+        *,
+        shared: t.Optional[t.Mapping[str, t.Any]] = None,
+    ) -> tk_modules.MultiSHFQASweeper:
+        """Create a sweeper that runs SHFQA sweeps on multiple channels.
+
+        Every channel gets its own ``SHFQASweeper`` with a new session, so
+        that the sweeps of all channels run concurrently.
+
+        Args:
+            channels: Pairs of device (serial) and QA channel index.
+            shared: Settings applied to all sweepers. Maps the node path
+                relative to the sweeper (e.g. ``"average/num_averages"``) to
+                its value. (default = None)
+
+        Returns:
+            Created object
+        """
+        return tk_modules.MultiSHFQASweeper(self._session, channels, shared=shared)
+
     def create_timeline_module(self) -> tk_modules.TimelineModule:
         """Create an instance of the TimelineModule.
 
@@ -527,11 +672,137 @@ class ModuleHandler:
         Returns:
             Created module
         """
+        raw_module = self._session.daq_server.timelineModule()
         return tk_modules.TimelineModule(
-            self._session.daq_server.timelineModule(),
+            raw_module,
             self._session,
+            preloaded_json=self._nodedoc("timelineModule", raw_module),
         )
 
+    @staticmethod
+    def _settings(module: tk_modules.BaseModule) -> dict[str, t.Any]:
+        """Values of all writable nodes of a module.
+
+        Args:
+            module: Toolkit module.
+
+        Returns:
+            Value per node path.
+        """
+        try:
+            values = module["*"](parse=False, enum=False)
+        except KeyError:
+            return {}
+        return {
+            path: value
+            for path, value in values.items()
+            if module.root.raw_path_to_node(path).node_info.writable
+        }
+
+    def acquire(self, module_type: str) -> tk_modules.BaseModule:
+        """Check out a module from the module pool.
+
+        An idle module of the requested type is reused if available. Otherwise
+        a new module is created. The module must be returned with ``release``
+        (see also ``pooled``).
+
+        Only LabOne modules can be pooled. Modules implemented by toolkit
+        (e.g. ``"shfqa_sweeper"``) have no LabOne module to reset and need to
+        be created with their ``create`` function instead.
+
+        Args:
+            module_type: Type of the module. Name of the managed module
+                property, e.g. ``"device_settings"`` or ``"sweeper"``.
+
+        Returns:
+            Module with default settings.
+
+        Raises:
+            ValueError: If the module type is unknown or not a LabOne module.
+        """
+        if hasattr(self, f"create_{module_type}"):
+            msg = (
+                f"{module_type!r} is not a LabOne module and can not be pooled. "
+                f"Use create_{module_type} instead."
+            )
+            raise ValueError(msg)
+        create = getattr(self, f"create_{module_type}_module", None)
+        if create is None:
+            msg = f"Unknown module type {module_type!r}."
+            raise ValueError(msg)
+        with self._lock:
+            idle = self._pool.get(module_type)
+            if idle:
+                return idle.pop()
+        module = create()
+        defaults = self._settings(module)
+        with self._lock:
+            self._defaults[id(module)] = (module_type, defaults)
+        return module
+
+    def release(self, module: tk_modules.BaseModule) -> None:
+        """Return a module to the module pool.
+
+        The module is stopped, all its subscriptions are removed and every
+        setting that differs from the default is reset.
+
+        Args:
+            module: Module previously checked out with ``acquire``.
+
+        Raises:
+            ValueError: If the module does not belong to the module pool.
+        """
+        with self._lock:
+            entry = self._defaults.get(id(module))
+        if entry is None:
+            msg = f"{module!r} does not belong to the module pool."
+            raise ValueError(msg)
+        module_type, defaults = entry
+        raw_module = module.raw_module
+        try:
+            raw_module.finish()
+            raw_module.unsubscribe("*")
+            for path, value in self._settings(module).items():
+                if path in defaults and not np.array_equal(value, defaults[path]):
+                    raw_module.set(path, defaults[path])
+        except RuntimeError:
+            logger.warning(f"Discarding {module!r} from the module pool.")
+            with self._lock:
+                del self._defaults[id(module)]
+            return
+        with self._lock:
+            self._pool.setdefault(module_type, []).append(module)
+
+    @contextmanager
+    def pooled(
+        self,
+        module_type: str,
+    ) -> t.Generator[tk_modules.BaseModule, None, None]:
+        """Context manager for a module of the module pool.
+
+        Args:
+            module_type: Type of the module. Name of the managed module
+                property, e.g. ``"device_settings"`` or ``"sweeper"``.
+
+        Returns:
+            Module with default settings (see ``acquire``).
+
+        Example:
+            >>> for filename in filenames:
+            ...     with session.modules.pooled("device_settings") as module:
+            ...         module.command("load")
+            ...         module.filename(filename)
+            ...         module.execute()
+
+        Raises:
+            ValueError: If the module type is unknown or not a LabOne module.
+        """
+        module = self.acquire(module_type)
+        try:
+            yield module
+        finally:
+            self.release(module)
+
     @cached_property
     def awg(self) -> tk_modules.BaseModule:
         """Managed instance of the awg module.
@@ -722,6 +993,239 @@ class ModuleHandler:
         return self.create_timeline_module()
 
 
+class ConnectionPool:
+    """Bounded pool of cloned connections to the data server.
+
+    A single ``core.ziDAQServer`` instance processes all requests serially.
+    Operations that are independent from each other (e.g. uploads to or
+    downloads from different devices) can be executed in parallel by running
+    them on separate connections from worker threads. The pool hands out such
+    cloned connections (see ``Session.clone_underlying_session``) and keeps
+    them alive for later reuse.
+
+    Connections are checked out with ``acquire`` and must be returned with
+    ``release``. Alternatively the ``connection`` context manager takes care
+    of both. On release all subscriptions of the connection are removed so
+    that the next user starts from a clean connection. Before a connection is
+    handed out it is checked for its health. Broken connections are discarded
+    and replaced by new ones.
+
+    Example:
+        >>> with session.connection_pool.connection() as daq:
+                daq.get("/dev1234/demods/0/freq")
+        >>> session.connection_pool.map(
+                lambda daq, serial: daq.getString(f"/{serial}/features/devtype"),
+                ["dev1234", "dev5678"],
+            )
+
+    Args:
+        session: Session whose data server the connections belong to.
+        max_size: Maximum number of connections held by the pool.
+            (default = 4)
+    """
+
+    def __init__(self, session: Session, max_size: int = 4):
+        self._session = session
+        self._max_size = 1
+        self.max_size = max_size
+        self._idle: list[core.ziDAQServer] = []
+        self._num_connections = 0
+        self._condition = threading.Condition()
+
+    def __repr__(self):
+        return str(
+            f"ConnectionPool({self._session.server_host}:"
+            f"{self._session.server_port}, {self._num_connections}/"
+            f"{self._max_size})",
+        )
+
+    @staticmethod
+    def _is_healthy(connection: core.ziDAQServer) -> bool:
+        """Check if a connection is still usable.
+
+        Args:
+            connection: Connection to check.
+
+        Returns:
+            Flag if the data server answers requests through the connection.
+        """
+        try:
+            connection.getString("/zi/about/dataserver")
+        except RuntimeError:
+            return False
+        return True
+
+    def _discard(self, connection: core.ziDAQServer) -> None:
+        """Remove a connection from the pool.
+
+        Args:
+            connection: Connection that is no longer usable.
+        """
+        try:
+            connection.disconnect()
+        except RuntimeError:
+            pass
+        with self._condition:
+            self._num_connections -= 1
+            self._condition.notify()
+
+    def acquire(self, *, timeout: t.Optional[float] = None) -> core.ziDAQServer:
+        """Check out a connection from the pool.
+
+        An idle connection is reused if available. Otherwise a new connection
+        is created as long as the pool has not reached its maximum size.
+        If all connections are in use the call blocks until one is released.
+
+        Args:
+            timeout: Maximum time in seconds to wait for a free connection.
+                Waits forever if not specified. (default = None)
+
+        Returns:
+            Connection to the data server.
+
+        Raises:
+            TimeoutError: If no connection became available within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._num_connections >= self._max_size:
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        msg = (
+                            f"No connection of the pool became available within "
+                            f"{timeout}s."
+                        )
+                        raise TimeoutError(msg)
+                    self._condition.wait(remaining)
+                connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    self._num_connections += 1
+            if connection is None:
+                try:
+                    return self._session.clone_underlying_session()
+                except Exception:
+                    with self._condition:
+                        self._num_connections -= 1
+                        self._condition.notify()
+                    raise
+            if self._is_healthy(connection):
+                return connection
+            logger.warning("Discarding broken connection from the pool.")
+            self._discard(connection)
+
+    def release(self, connection: core.ziDAQServer) -> None:
+        """Return a connection to the pool.
+
+        All subscriptions of the connection are removed.
+
+        Args:
+            connection: Connection previously checked out with ``acquire``.
+        """
+        try:
+            connection.unsubscribe("*")
+        except RuntimeError:
+            self._discard(connection)
+            return
+        with self._condition:
+            shrunk = self._num_connections > self._max_size
+            if not shrunk:
+                self._idle.append(connection)
+        if shrunk:
+            # The pool was shrunk while the connection was in use.
+            self._discard(connection)
+            return
+        with self._condition:
+            self._condition.notify()
+
+    @contextmanager
+    def connection(
+        self,
+        *,
+        timeout: t.Optional[float] = None,
+    ) -> t.Generator[core.ziDAQServer, None, None]:
+        """Context manager for a connection of the pool.
+
+        Args:
+            timeout: Maximum time in seconds to wait for a free connection.
+                Waits forever if not specified. (default = None)
+
+        Yields:
+            Connection to the data server.
+        """
+        connection = self.acquire(timeout=timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def map(
+        self,
+        function: t.Callable[[core.ziDAQServer, T], R],
+        items: t.Iterable[T],
+    ) -> list[R]:
+        """Apply a function to every item on separate connections in parallel.
+
+        Each call is executed in a worker thread on its own connection of the
+        pool. The number of parallel calls is therefore bound by the maximum
+        size of the pool.
+
+        Args:
+            function: Function that is called with a connection and an item.
+            items: Items to process.
+
+        Returns:
+            Results of the function calls in the order of the items.
+        """
+
+        def run(item: T) -> R:
+            with self.connection() as connection:
+                return function(connection, item)
+
+        items = list(items)
+        if len(items) <= 1:
+            return [run(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=min(self._max_size, len(items)),
+        ) as executor:
+            return list(executor.map(run, items))
+
+    def close(self) -> None:
+        """Disconnect all idle connections of the pool.
+
+        Connections currently checked out are not affected. They are added
+        to the pool again when they are released.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._num_connections -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            try:
+                connection.disconnect()
+            except RuntimeError:
+                pass
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of connections held by the pool."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int) -> None:
+        if value < 1:
+            msg = f"The pool size must be at least 1 ({value} was specified)."
+            raise ValueError(msg)
+        self._max_size = value
+
+    @property
+    def size(self) -> int:
+        """Number of connections currently owned by the pool."""
+        return self._num_connections
+
+
 class PollFlags(IntFlag):
     """Flags for polling Command.
 
@@ -862,6 +1366,8 @@ class Session(Node):
         )
         super().__init__(nodetree, ())
         self._multi_transaction = Transaction(self.root)
+        self._connection_pool = ConnectionPool(self)
+        self._clockbases: dict[str, float] = {}
 
     def __repr__(self):
         return str(
@@ -928,19 +1434,143 @@ class Session(Node):
                     dev_info = json.loads(self.daq_server.getString("/zi/devices"))[
                         serial.upper()
                     ]
-                    interface = t.cast("str", dev_info["INTERFACE"])
-                    undefined_interfaces = ("none", "", "unknown")
-                    if interface.lower() in undefined_interfaces:
-                        interface = (
-                            "1GbE"
-                            if "1gbe" in dev_info["INTERFACES"].lower()
-                            else dev_info["INTERFACES"].split(",")[0]
-                        )
+                    interface = self._discovered_interface(dev_info)
             self._daq_server.connectDevice(serial, interface)  # type: ignore[arg-type]
+            self._clockbases.pop(serial, None)
             if isinstance(self._devices, HF2Devices):
                 self._devices.add_hf2_device(serial)
         return self._devices[serial]
 
+    @staticmethod
+    def _discovered_interface(dev_info: dict[str, t.Any]) -> str:
+        """Select the interface of a device based on its discovery information.
+
+        Args:
+            dev_info: Discovery information of the device (entry of
+                ``/zi/devices``).
+
+        Returns:
+            Default interface of the device, prioritizing 1GbE.
+        """
+        interface = t.cast("str", dev_info["INTERFACE"])
+        undefined_interfaces = ("none", "", "unknown")
+        if interface.lower() in undefined_interfaces:
+            interface = (
+                "1GbE"
+                if "1gbe" in dev_info["INTERFACES"].lower()
+                else dev_info["INTERFACES"].split(",")[0]
+            )
+        return interface
+
+    def connect_devices(
+        self,
+        serials: t.Iterable[str],
+        *,
+        interfaces: t.Optional[dict[str, str]] = None,
+    ) -> BulkConnection:
+        """Establish a connection to multiple devices in parallel.
+
+        In contrast to calling ``connect_device`` for every device this
+        function reads the discovery information only once and connects the
+        devices concurrently. The node information of each device is
+        downloaded and the device objects are created in parallel worker
+        threads, each on its own connection of the ``connection_pool``.
+
+        Info:
+            It is allowed to call this function for already connected devices.
+            In that case the existing device objects are returned.
+
+        Args:
+            serials: Serial numbers of the devices, e.g. *['dev12000']*.
+            interfaces: Device interface (e.g. = "1GbE") per serial. Devices
+                without an entry use the default interface from the discovery.
+                (default = None)
+
+        Returns:
+            Created device objects and the time spent on connecting and
+            creating each device (both mapped by the serial).
+
+        Raises:
+            KeyError: A device is not found.
+            RuntimeError: A connection failed. (The devices that could be
+                connected are available through ``session.devices``)
+        """
+        serials = list(dict.fromkeys(serial.lower() for serial in serials))
+        interfaces = {
+            serial.lower(): interface
+            for serial, interface in (interfaces or {}).items()
+        }
+        if self._is_hf2_server:
+            devices = {}
+            timing = {}
+            for serial in serials:
+                start = time.perf_counter()
+                devices[serial] = self.connect_device(
+                    serial,
+                    interface=interfaces.get(serial),
+                )
+                timing[serial] = DeviceTiming(time.perf_counter() - start, 0.0)
+            return BulkConnection(devices, timing)
+
+        connected = self._devices.connected()
+        missing = [
+            serial
+            for serial in serials
+            if serial not in connected and serial not in interfaces
+        ]
+        discovery = (
+            json.loads(self.daq_server.getString("/zi/devices")) if missing else {}
+        )
+        for serial in missing:
+            interfaces[serial] = self._discovered_interface(discovery[serial.upper()])
+
+        def connect(
+            daq_server: core.ziDAQServer,
+            serial: str,
+        ) -> t.Union[tuple[tk_devices.DeviceType, DeviceTiming], Exception]:
+            try:
+                start = time.perf_counter()
+                if serial not in connected:
+                    daq_server.connectDevice(serial, interfaces[serial])
+                    self._clockbases.pop(serial, None)
+                connect_time = time.perf_counter() - start
+                start = time.perf_counter()
+                device = self._devices._create_device(
+                    serial,
+                    dev_type=discovery.get(serial.upper(), {}).get("DEVTYPE")
+                    or daq_server.getString(f"/{serial}/features/devtype"),
+                    options=daq_server.getString(f"/{serial}/features/options"),
+                    preloaded_json=json.loads(
+                        daq_server.listNodesJSON(f"/{serial}/*"),
+                    ),
+                )
+                return device, DeviceTiming(connect_time, time.perf_counter() - start)
+            except Exception as error:  # noqa: BLE001
+                return error
+
+        pending = [
+            serial
+            for serial in serials
+            if serial not in connected or serial not in self._devices._devices
+        ]
+        results = dict(
+            zip(pending, self._connection_pool.map(connect, pending), strict=True),
+        )
+        timing = dict.fromkeys(serials, DeviceTiming(0.0, 0.0))
+        errors = []
+        for serial, result in results.items():
+            if isinstance(result, Exception):
+                errors.append(result)
+            else:
+                self._devices._add_device(serial, result[0])
+                timing[serial] = result[1]
+        if errors:
+            raise errors[0]
+        return BulkConnection(
+            {serial: self._devices[serial] for serial in serials},
+            timing,
+        )
+
     def disconnect_device(self, serial: str) -> None:
         """Disconnect a device.
 
@@ -978,12 +1608,138 @@ class Session(Node):
         """
         self.daq_server.sync()
 
+    def compile_and_load(
+        self,
+        programs: t.Mapping[AWG, t.Union[str, Sequence]],
+        *,
+        wait_ready: bool = False,
+        timeout: float = 10,
+        max_workers: t.Optional[int] = None,
+        **kwargs: t.Union[str, int],
+    ) -> dict[AWG, dict[str, t.Any]]:
+        """Compile and upload sequencer programs of multiple AWG cores.
+
+        The programs are compiled in parallel in a process pool. Programs
+        found in the compiler cache of an AWG (see ``AWG.compiler_cache``) are
+        not compiled again. Once all programs are compiled, the ELF files are
+        uploaded in a single transaction. Nothing is uploaded if one of the
+        compilations fails. The uploaded programs are remembered by the AWG
+        cores (see ``AWG.load_sequencer_program``).
+
+        Args:
+            programs: Sequencer program per AWG core node,
+                e.g. ``{device.awgs[0]: seqc, device.awgs[1]: seqc}``.
+            wait_ready: Flag if the function waits until all AWG cores report
+                ready. (default = False)
+            timeout: Maximum time in seconds to wait for all AWG cores to
+                become ready. (default = 10)
+            max_workers: Maximum number of compiler processes. Defaults to the
+                number of CPUs. (default = None)
+            kwargs: Additional compiler arguments applied to all programs
+                (see ``AWG.compile_sequencer_program``).
+
+        Returns:
+            Compiler output per AWG core.
+
+        Raises:
+            RuntimeError: If a compilation or the upload failed.
+            TimeoutError: If an AWG core did not become ready in time.
+        """
+        samplerates: dict[int, float] = {}
+        arguments = {}
+        for awg in programs:
+            awg_kwargs: dict[str, t.Any] = dict(kwargs)
+            if "HDAWG" in awg._device_type and "samplerate" not in awg_kwargs:
+                # All cores of a device share the samplerate
+                if id(awg.root) not in samplerates:
+                    samplerates[id(awg.root)] = (
+                        awg.root.system.clocks.sampleclock.freq()
+                    )
+                awg_kwargs["samplerate"] = samplerates[id(awg.root)]
+            arguments[awg] = awg._compile_arguments(programs[awg], **awg_kwargs)
+        results = self._compile_programs(arguments, max_workers=max_workers)
+        with self.set_transaction():
+            for awg, (elf, _) in results.items():
+                awg.elf.data(elf)
+        for awg, (elf, info) in results.items():
+            args, awg_kwargs = arguments[awg]
+            awg._remember_upload(CompilerCache.key(*args, **awg_kwargs), elf, info)
+        if wait_ready:
+            # The cores get ready in parallel, waiting in sequence with a
+            # common deadline therefore only takes as long as the slowest one.
+            deadline = time.monotonic() + timeout
+            for awg in results:
+                awg.ready.wait_for_state_change(
+                    1,
+                    timeout=max(deadline - time.monotonic(), 0),
+                )
+        return {awg: results[awg][1] for awg in programs}
+
+    @staticmethod
+    def _compile_programs(
+        arguments: dict[AWG, tuple[tuple, dict[str, t.Any]]],
+        *,
+        max_workers: t.Optional[int],
+    ) -> dict[AWG, tuple[bytes, dict[str, t.Any]]]:
+        """Compile sequencer programs in a process pool.
+
+        Programs found in the compiler cache of their AWG are not compiled.
+        New compilations are added to the cache.
+
+        Args:
+            arguments: Arguments of ``zhinst.core.compile_seqc`` per AWG core.
+            max_workers: Maximum number of compiler processes.
+
+        Returns:
+            ELF and compiler output per AWG core.
+
+        Raises:
+            RuntimeError: If a compilation failed.
+        """
+        results = {}
+        for awg, (args, kwargs) in arguments.items():
+            cache = awg.compiler_cache
+            cached = cache.get(cache.key(*args, **kwargs)) if cache else None
+            if cached is not None:
+                results[awg] = cached
+        pending = [awg for awg in arguments if awg not in results]
+        with ExitStack() as stack:
+            compile_all: t.Callable = map
+            if len(pending) > 1:
+                workers = min(max_workers or os.cpu_count() or 1, len(pending))
+                # Forking a process with running data server threads is unsafe
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                compile_all = stack.enter_context(executor).map
+            compiled = compile_all(_compile_seqc, [arguments[awg] for awg in pending])
+            for awg in pending:
+                try:
+                    results[awg] = next(compiled)
+                except RuntimeError as error:
+                    msg = f"{awg!r}: {error}"
+                    raise RuntimeError(msg) from error
+        for awg in pending:
+            cache = awg.compiler_cache
+            if cache is not None:
+                args, kwargs = arguments[awg]
+                key = cache.key(*args, **kwargs)
+                try:
+                    cache.put(key, *results[awg])
+                except OSError as error:
+                    logger.warning(
+                        f"Unable to add {key} to the compiler cache: {error}",
+                    )
+        return results
+
     def poll(
         self,
         recording_time: float = 0.1,
         *,
         timeout: float = 0.5,
         flags: PollFlags = PollFlags.DEFAULT,
+        structured: bool = False,
     ) -> dict[Node, dict[str, t.Any]]:
         """Polls all subscribed data from the data server.
 
@@ -1001,18 +1757,139 @@ class Session(Node):
                 network. In this case it may be set to a value larger than the
                 expected round-trip time in the network. (default = 0.5)
             flags: Flags for the polling (see :class `PollFlags`:)
+            structured: Flag if the samples of each node should be converted
+                into a numpy structured array with one record per sample and
+                an additional ``time`` field in seconds (see
+                ``zhinst.toolkit.streaming.to_structured_array``).
+                (default = False)
 
         Returns:
             Polled data in a dictionary. The key is a `Node` object and the
             value is a dictionary with the raw data from the device
         """
-        return NodeDict(
-            self.daq_server.poll(
-                recording_time,
-                int(timeout * 1000),
-                flags=flags.value,
-                flat=True,
-            ),
+        result = self.daq_server.poll(
+            recording_time,
+            int(timeout * 1000),
+            flags=flags.value,
+            flat=True,
+        )
+        if structured:
+            result = to_structured(result, resolve_clockbases(result, self.clockbase))
+        return NodeDict(result)
+
+    def clockbase(self, serial: str) -> float:
+        """Clockbase of a connected device.
+
+        The clockbase is read from the device once and cached until the
+        device is disconnected or connected again.
+
+        Args:
+            serial: Serial of the device.
+
+        Returns:
+            Clockbase in Hz, used to convert the timestamps of the device into
+            seconds.
+
+        Raises:
+            RuntimeError: If the clockbase of the device can not be read.
+        """
+        serial = serial.lower()
+        clockbase = self._clockbases.get(serial)
+        if clockbase is None:
+            clockbase = self.daq_server.getDouble(f"/{serial}/clockbase")
+            self._clockbases[serial] = clockbase
+        return clockbase
+
+    def stream(
+        self,
+        nodes: t.Iterable[t.Union[Node, str]],
+        *,
+        chunk_size: int,
+        chunk_time: float = 0.1,
+        capacity: t.Optional[int] = None,
+        timeout: float = 0.5,
+        flags: PollFlags = PollFlags.DEFAULT,
+    ) -> PollStream:
+        """Continuously stream the data of nodes into bounded ring buffers.
+
+        The nodes are polled on a background thread using a connection of the
+        ``connection_pool``, so the subscriptions of this session are not
+        affected. The data of each node is kept in a preallocated ring buffer
+        (see ``PollStream``).
+
+        Args:
+            nodes: Nodes to stream. (wildcards are supported)
+            chunk_size: Number of samples per node in a chunk.
+            chunk_time: Duration of a single poll in seconds. (default = 0.1)
+            capacity: Number of samples each ring buffer can hold. Defaults to
+                ten times ``chunk_size``. (default = None)
+            timeout: Additional timeout of a single poll in seconds.
+                (default = 0.5)
+            flags: Flags for the polling (see :class `PollFlags`:)
+
+        Returns:
+            Stream object. The polling starts when entering the context
+            manager or calling ``start``.
+
+        Example:
+            >>> sample_node = device.demods[0].sample
+            >>> with session.stream([sample_node], chunk_size=1000) as stream:
+            ...     for chunk in stream:
+            ...         print(chunk[sample_node]["x"].mean())
+        """
+        return PollStream(
+            self,
+            nodes,
+            chunk_size=chunk_size,
+            chunk_time=chunk_time,
+            capacity=capacity,
+            timeout=timeout,
+            flags=flags.value,
+        )
+
+    def dispatcher(
+        self,
+        nodes: t.Iterable[t.Union[Node, str]],
+        *,
+        chunk_time: float = 0.1,
+        timeout: float = 0.5,
+        flags: PollFlags = PollFlags.DEFAULT,
+        structured: bool = False,
+    ) -> PollDispatcher:
+        """Poll nodes in the background and route the data to subscribers.
+
+        The nodes are polled on a background thread using a connection of the
+        ``connection_pool``. Consumers register for node patterns (e.g.
+        ``/dev*/demods/*/sample``) and are either called on the polling
+        thread or on their own thread with a bounded queue (see
+        ``PollDispatcher``).
+
+        Args:
+            nodes: Nodes to poll. (wildcards are supported)
+            chunk_time: Duration of a single poll in seconds. (default = 0.1)
+            timeout: Additional timeout of a single poll in seconds.
+                (default = 0.5)
+            flags: Flags for the polling (see :class `PollFlags`:)
+            structured: Flag if the data is converted into numpy structured
+                arrays before it is dispatched. (default = False)
+
+        Returns:
+            Dispatcher object. The polling starts when entering the context
+            manager or calling ``start``.
+
+        Example:
+            >>> with session.dispatcher(["/dev1234/demods/*/sample"]) as dispatcher:
+            ...     dispatcher.subscribe("/dev1234/demods/0/sample", feedback)
+            ...     dispatcher.subscribe("*", writer, threaded=True)
+            ...     time.sleep(10)
+        """
+        return PollDispatcher(
+            self,
+            nodes,
+            chunk_time=chunk_time,
+            timeout=timeout,
+            flags=flags.value,
+            structured=structured,
         )
 
     def raw_path_to_node(
@@ -1097,6 +1974,10 @@ class Session(Node):
         try:
             yield
             self._daq_server.set(self._multi_transaction.result())  # type: ignore[arg-type]
+            for device in self.devices.created_devices():
+                device.root.transaction.committed()
+            self.root.transaction.committed()
+            self._multi_transaction.committed()
         finally:
             for device in self.devices.created_devices():
                 device.root.transaction.stop()
@@ -1162,6 +2043,18 @@ class Session(Node):
         """
         return self._daq_server.port
 
+    @property
+    def connection_pool(self) -> ConnectionPool:
+        """Pool of cloned connections to the data server.
+
+        The pool can be used to run independent operations in parallel on
+        separate connections (see ``ConnectionPool``).
+
+        Returns:
+            Pool of cloned connections.
+        """
+        return self._connection_pool
+
     def clone_underlying_session(self) -> core.ziDAQServer:
         """Create a new session to the data server.
 
@@ -0,0 +1,43 @@
+"""Continuous streaming of node data.
+
+The streaming tools poll subscribed nodes in the background and keep the
+data in memory bounded buffers, route it to registered consumers or write it
+into append only datasets on disk.
+
+>>> with session.stream([device.demods[0].sample], chunk_size=1000) as stream:
+...     for chunk in stream:
+...         process(chunk)
+"""
+
+from zhinst.toolkit.streaming.dispatcher import (
+    PollDispatcher,
+    QueuePolicy,
+    Subscription,
+)
+from zhinst.toolkit.streaming.poll_stream import PollStream
+from zhinst.toolkit.streaming.ring_buffer import RingBuffer
+from zhinst.toolkit.streaming.samples import (
+    device_serial,
+    read_clockbases,
+    resolve_clockbases,
+    timestamps_to_seconds,
+    to_structured,
+    to_structured_array,
+)
+from zhinst.toolkit.streaming.storage import StreamReader, StreamWriter
+
+__all__ = [
+    "PollDispatcher",
+    "PollStream",
+    "QueuePolicy",
+    "RingBuffer",
+    "StreamReader",
+    "StreamWriter",
+    "Subscription",
+    "device_serial",
+    "read_clockbases",
+    "resolve_clockbases",
+    "timestamps_to_seconds",
+    "to_structured",
+    "to_structured_array",
+]
@@ -0,0 +1,367 @@
+"""Routing of polled node data to registered consumers."""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import queue
+import threading
+import typing as t
+from enum import Enum
+
+from zhinst.toolkit.streaming.samples import read_clockbases, to_structured
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree import Node
+    from zhinst.toolkit.session import Session
+
+logger = logging.getLogger(__name__)
+
+Callback = t.Callable[[str, t.Any], None]
+
+
+class QueuePolicy(Enum):
+    """Behavior of a threaded subscription if its queue is full.
+
+    Attributes:
+        DROP: Discard the new data and count it as dropped. The dispatcher is
+            never delayed by the consumer.
+        BLOCK: Wait until the consumer has processed older data. This delays
+            all other consumers of the dispatcher.
+    """
+
+    DROP = "drop"
+    BLOCK = "block"
+
+
+class Subscription:
+    """Consumer of the data of all nodes matching a pattern.
+
+    Created by ``PollDispatcher.subscribe``.
+
+    Args:
+        pattern: Node pattern (``fnmatch`` syntax, case insensitive).
+        callback: Function called with the node path and its data.
+        threaded: Flag if the callback is executed on its own thread.
+        maxsize: Maximum number of queued data of a threaded subscription.
+        policy: Behavior if the queue of a threaded subscription is full.
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        callback: Callback,
+        *,
+        threaded: bool,
+        maxsize: int,
+        policy: QueuePolicy,
+    ):
+        self._pattern = pattern.lower()
+        self._callback = callback
+        self._policy = policy
+        self._queue: t.Optional[queue.Queue] = (
+            queue.Queue(maxsize) if threaded else None
+        )
+        self._thread: t.Optional[threading.Thread] = None
+        self._delivered = 0
+        self._dropped = 0
+
+    def __repr__(self):
+        mode = f"threaded, {self._policy.value}" if self._queue else "inline"
+        return f"Subscription({self._pattern!r}, {mode})"
+
+    def matches(self, path: str) -> bool:
+        """Check if a node path matches the pattern of the subscription.
+
+        Args:
+            path: Node path.
+
+        Returns:
+            Flag if the path matches.
+        """
+        return fnmatch.fnmatchcase(path.lower(), self._pattern)
+
+    def _call(self, path: str, data: t.Any) -> None:
+        try:
+            self._callback(path, data)
+        except Exception:
+            logger.exception(f"Subscriber for {self._pattern} failed on {path}.")
+        self._delivered += 1
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()  # type: ignore[union-attr]
+            if item is None:
+                return
+            self._call(*item)
+
+    def _start(self) -> None:
+        if self._queue is not None and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._worker,
+                name=f"zhinst-toolkit-subscriber-{self._pattern}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _stop(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)  # type: ignore[union-attr]
+            self._thread.join()
+            self._thread = None
+
+    def _deliver(self, path: str, data: t.Any) -> None:
+        if self._queue is None:
+            self._call(path, data)
+        elif self._policy is QueuePolicy.BLOCK:
+            self._queue.put((path, data))
+        else:
+            try:
+                self._queue.put_nowait((path, data))
+            except queue.Full:
+                self._dropped += 1
+
+    @property
+    def pattern(self) -> str:
+        """Node pattern of the subscription."""
+        return self._pattern
+
+    @property
+    def threaded(self) -> bool:
+        """Flag if the callback is executed on its own thread."""
+        return self._queue is not None
+
+    @property
+    def delivered(self) -> int:
+        """Number of node data the callback has processed."""
+        return self._delivered
+
+    @property
+    def dropped(self) -> int:
+        """Number of node data discarded because the queue was full."""
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        """Number of queued node data not yet processed by the callback."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+
+class PollDispatcher:
+    """Poll nodes in the background and route the data to subscribers.
+
+    The dispatcher subscribes the nodes on a connection of the session's
+    ``connection_pool`` and polls them on a background thread. The data of
+    every polled node is passed to all subscriptions whose pattern matches
+    the node path.
+
+    Inline subscriptions are called directly on the polling thread and
+    should therefore return quickly (e.g. a feedback loop). Threaded
+    subscriptions get their own worker thread and a bounded queue, so that
+    slow consumers (e.g. plotting or writing to disk) do not delay the
+    others. The ``policy`` defines whether data is dropped or the dispatcher
+    waits if the queue of a threaded subscription is full.
+
+    Args:
+        session: Session to the data server.
+        nodes: Nodes to poll. (wildcards are supported)
+        chunk_time: Duration of a single poll in seconds. (default = 0.1)
+        timeout: Additional timeout of a single poll in seconds.
+            (default = 0.5)
+        flags: Flags for the polling (see ``PollFlags``). (default = 0)
+        structured: Flag if the data is converted into numpy structured
+            arrays before it is dispatched (see ``to_structured_array``).
+            (default = False)
+
+    Example:
+        >>> with session.dispatcher(["/dev1234/demods/*/sample"]) as dispatcher:
+        ...     dispatcher.subscribe("/dev1234/demods/0/sample", feedback)
+        ...     dispatcher.subscribe("*", writer, threaded=True, policy="block")
+        ...     time.sleep(10)
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        nodes: t.Iterable[t.Union[Node, str]],
+        *,
+        chunk_time: float = 0.1,
+        timeout: float = 0.5,
+        flags: int = 0,
+        structured: bool = False,
+    ):
+        self._session = session
+        self._paths = [str(node).lower() for node in nodes]
+        self._chunk_time = chunk_time
+        self._timeout = timeout
+        self._flags = int(flags)
+        self._structured = structured
+        self._subscriptions: list[Subscription] = []
+        self._routes: dict[str, list[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: t.Optional[threading.Thread] = None
+        self._error: t.Optional[Exception] = None
+
+    def __repr__(self):
+        state = "running" if self.running else "stopped"
+        return (
+            f"PollDispatcher({self._paths}, {len(self._subscriptions)} "
+            f"subscriptions, {state})"
+        )
+
+    def __enter__(self) -> PollDispatcher:
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def subscribe(
+        self,
+        pattern: t.Union[Node, str],
+        callback: Callback,
+        *,
+        threaded: bool = False,
+        maxsize: int = 100,
+        policy: t.Union[QueuePolicy, str] = QueuePolicy.DROP,
+    ) -> Subscription:
+        """Register a consumer for the data of all nodes matching a pattern.
+
+        Args:
+            pattern: Node pattern, e.g. ``/dev*/demods/*/sample``. (``fnmatch``
+                syntax, case insensitive)
+            callback: Function called with the node path and its data.
+            threaded: Flag if the callback is executed on its own thread.
+                (default = False)
+            maxsize: Maximum number of queued data of a threaded subscription.
+                (default = 100)
+            policy: Behavior if the queue of a threaded subscription is full
+                (see ``QueuePolicy``). (default = QueuePolicy.DROP)
+
+        Returns:
+            Subscription object, which also holds the delivery statistics.
+        """
+        subscription = Subscription(
+            str(pattern),
+            callback,
+            threaded=threaded,
+            maxsize=maxsize,
+            policy=QueuePolicy(policy),
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self._routes.clear()
+        if self.running:
+            subscription._start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a consumer.
+
+        Already queued data of a threaded subscription is still processed.
+
+        Args:
+            subscription: Subscription returned by ``subscribe``.
+        """
+        with self._lock:
+            self._subscriptions.remove(subscription)
+            self._routes.clear()
+        subscription._stop()
+
+    def dispatch(self, data: dict[str, t.Any]) -> None:
+        """Pass polled data to the matching subscriptions.
+
+        Called by the polling thread, but can also be used to route data
+        that was polled manually.
+
+        Args:
+            data: Flat poll result.
+        """
+        with self._lock:
+            routes = [
+                (path, sample, self._route(path)) for path, sample in data.items()
+            ]
+        for path, sample, subscriptions in routes:
+            for subscription in subscriptions:
+                subscription._deliver(path, sample)
+
+    def _route(self, path: str) -> list[Subscription]:
+        """Subscriptions matching a node path (cached per path)."""
+        subscriptions = self._routes.get(path)
+        if subscriptions is None:
+            subscriptions = self._routes[path] = [
+                subscription
+                for subscription in self._subscriptions
+                if subscription.matches(path)
+            ]
+        return subscriptions
+
+    def _run(self) -> None:
+        """Poll the nodes until the dispatcher is stopped."""
+        clockbases: dict[str, t.Optional[float]] = {}
+        known_paths: set[str] = set()
+        try:
+            with self._session.connection_pool.connection() as daq_server:
+                daq_server.subscribe(self._paths)
+                while not self._stop_event.is_set():
+                    data = daq_server.poll(
+                        self._chunk_time,
+                        int(self._timeout * 1000),
+                        flags=self._flags,
+                        flat=True,
+                    )
+                    if self._structured:
+                        new_paths = data.keys() - known_paths
+                        if new_paths:
+                            clockbases.update(read_clockbases(daq_server, new_paths))
+                            known_paths.update(new_paths)
+                        data = to_structured(data, clockbases)
+                    self.dispatch(data)
+        except Exception as error:  # noqa: BLE001
+            self._error = error
+            self._stop_event.set()
+
+    def start(self) -> None:
+        """Start polling and the threads of the threaded subscriptions.
+
+        Has no effect if the dispatcher is already running.
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._error = None
+        for subscription in self._subscriptions:
+            subscription._start()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="zhinst-toolkit-poll-dispatcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait until all queued data is processed.
+
+        Raises:
+            Exception: The error that stopped the polling thread (if any).
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for subscription in self._subscriptions:
+            subscription._stop()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    @property
+    def running(self) -> bool:
+        """Flag if the dispatcher is polling."""
+        return self._thread is not None and not self._stop_event.is_set()
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        """Registered subscriptions."""
+        return list(self._subscriptions)
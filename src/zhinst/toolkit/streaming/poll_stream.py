@@ -0,0 +1,238 @@
+"""Continuous polling of subscribed nodes into ring buffers."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import typing as t
+
+from zhinst.toolkit.nodetree.helper import NodeDict
+from zhinst.toolkit.streaming.ring_buffer import RingBuffer
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree import Node
+    from zhinst.toolkit.session import Session
+
+logger = logging.getLogger(__name__)
+
+
+class PollStream:
+    """Continuous stream of the data of one or multiple nodes.
+
+    The nodes are subscribed and polled on a background thread, using a
+    connection of the session's ``connection_pool``. The polled data is
+    written into a ring buffer per node (see ``RingBuffer``). The memory
+    consumption of the stream is therefore bounded, independent of how long
+    the stream runs. If the consumer does not keep up, the oldest samples are
+    overwritten and counted in ``overruns``.
+
+    Iterating over the stream yields chunks of exactly ``chunk_size`` samples
+    per node. Nodes for which less than ``chunk_size`` samples are available
+    are not part of a chunk. Once the stream is stopped the iteration ends
+    (the remaining samples can be fetched with ``read``).
+
+    Info:
+        Only nodes whose poll result is a dictionary of one dimensional
+        arrays (e.g. demodulator samples or value changes of a node) can be
+        buffered. Other nodes are ignored with a warning.
+
+    Args:
+        session: Session to the data server.
+        nodes: Nodes to stream. (wildcards are supported)
+        chunk_size: Number of samples per node in a chunk.
+        chunk_time: Duration of a single poll in seconds. (default = 0.1)
+        capacity: Number of samples each ring buffer can hold. Defaults to
+            ten times ``chunk_size``. (default = None)
+        timeout: Additional timeout of a single poll in seconds.
+            (default = 0.5)
+        flags: Flags for the polling (see ``PollFlags``). (default = 0)
+
+    Raises:
+        ValueError: If ``capacity`` is smaller than ``chunk_size``.
+
+    Example:
+        >>> with session.stream([device.demods[0].sample], chunk_size=1000) as stream:
+        ...     for chunk in stream:
+        ...         process(chunk[device.demods[0].sample]["x"])
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        nodes: t.Iterable[t.Union[Node, str]],
+        *,
+        chunk_size: int,
+        chunk_time: float = 0.1,
+        capacity: t.Optional[int] = None,
+        timeout: float = 0.5,
+        flags: int = 0,
+    ):
+        capacity = 10 * chunk_size if capacity is None else capacity
+        if chunk_size < 1 or capacity < chunk_size:
+            msg = (
+                f"The capacity ({capacity}) must be at least the chunk size "
+                f"({chunk_size}) and the chunk size must be positive."
+            )
+            raise ValueError(msg)
+        self._session = session
+        self._paths = [str(node).lower() for node in nodes]
+        self._chunk_size = chunk_size
+        self._chunk_time = chunk_time
+        self._capacity = capacity
+        self._timeout = timeout
+        self._flags = int(flags)
+        self._buffers: dict[str, RingBuffer] = {}
+        self._ignored: set[str] = set()
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: t.Optional[threading.Thread] = None
+        self._error: t.Optional[Exception] = None
+
+    def __repr__(self):
+        state = "running" if self.running else "stopped"
+        return f"PollStream({self._paths}, {state})"
+
+    def __enter__(self) -> PollStream:
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def __iter__(self) -> t.Iterator[NodeDict]:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._chunk_available() or not self.running,
+                )
+                if self._chunk_available():
+                    chunk = {
+                        path: buffer.read(self._chunk_size)
+                        for path, buffer in self._buffers.items()
+                        if len(buffer) >= self._chunk_size
+                    }
+                else:
+                    self._raise_error()
+                    return
+            yield NodeDict(chunk)
+
+    def _chunk_available(self) -> bool:
+        return any(len(buffer) >= self._chunk_size for buffer in self._buffers.values())
+
+    def _raise_error(self) -> None:
+        """Raise the error that stopped the polling thread (if any)."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _store(self, data: dict[str, t.Any]) -> None:
+        """Write polled data into the ring buffers.
+
+        Args:
+            data: Flat poll result.
+        """
+        with self._condition:
+            for path, sample in data.items():
+                if path in self._ignored:
+                    continue
+                if not isinstance(sample, dict):
+                    logger.warning(
+                        "%s can not be streamed into a ring buffer and is ignored.",
+                        path,
+                    )
+                    self._ignored.add(path)
+                    continue
+                buffer = self._buffers.get(path)
+                if buffer is None:
+                    buffer = self._buffers[path] = RingBuffer(self._capacity)
+                if buffer.write(sample):
+                    logger.debug("Ring buffer of %s overran.", path)
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        """Poll the subscribed nodes until the stream is stopped."""
+        try:
+            with self._session.connection_pool.connection() as daq_server:
+                daq_server.subscribe(self._paths)
+                while not self._stop_event.is_set():
+                    self._store(
+                        daq_server.poll(
+                            self._chunk_time,
+                            int(self._timeout * 1000),
+                            flags=self._flags,
+                            flat=True,
+                        ),
+                    )
+        except Exception as error:  # noqa: BLE001
+            self._error = error
+        finally:
+            with self._condition:
+                self._stop_event.set()
+                self._condition.notify_all()
+
+    def start(self) -> None:
+        """Subscribe the nodes and start polling in the background.
+
+        Has no effect if the stream is already running.
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run,
+            name="zhinst-toolkit-poll-stream",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and unsubscribe the nodes.
+
+        The buffered samples remain available through ``read``.
+
+        Raises:
+            Exception: The error that stopped the polling thread (if any).
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+    def read(self) -> NodeDict:
+        """Remove all buffered samples and return them.
+
+        Returns:
+            All buffered samples per node. In contrast to the chunks
+            returned by the iterator, the number of samples per node varies.
+        """
+        with self._condition:
+            return NodeDict(
+                {
+                    path: buffer.read()
+                    for path, buffer in self._buffers.items()
+                    if len(buffer)
+                },
+            )
+
+    @property
+    def running(self) -> bool:
+        """Flag if the stream is polling."""
+        return self._thread is not None and not self._stop_event.is_set()
+
+    @property
+    def chunk_size(self) -> int:
+        """Number of samples per node in a chunk."""
+        return self._chunk_size
+
+    @property
+    def capacity(self) -> int:
+        """Number of samples each ring buffer can hold."""
+        return self._capacity
+
+    @property
+    def overruns(self) -> dict[str, int]:
+        """Number of samples per node that were lost because the buffer was full."""
+        with self._condition:
+            return {path: buffer.overruns for path, buffer in self._buffers.items()}
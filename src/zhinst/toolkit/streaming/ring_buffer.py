@@ -0,0 +1,146 @@
+"""Fixed capacity ring buffer for streamed node samples."""
+
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np
+
+
+class RingBuffer:
+    """First in, first out buffer with a fixed capacity for the samples of a node.
+
+    Every field of the samples (e.g. ``timestamp``, ``x`` or ``y`` of a
+    demodulator sample) is stored in its own numpy array. The arrays are
+    allocated on the first write, with the data type of the first received
+    data, and are never resized afterwards. If more samples are written than
+    the buffer can hold, the oldest samples are overwritten and counted as
+    overrun.
+
+    Args:
+        capacity: Maximum number of samples the buffer can hold.
+
+    Raises:
+        ValueError: If the capacity is smaller than 1.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            msg = f"The capacity must be at least 1 (got {capacity})."
+            raise ValueError(msg)
+        self._capacity = capacity
+        self._fields: dict[str, np.ndarray] = {}
+        self._start = 0
+        self._size = 0
+        self._overruns = 0
+
+    def __repr__(self):
+        return (
+            f"RingBuffer({self._size}/{self._capacity}, "
+            f"fields={list(self._fields)})"
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _sample_fields(sample: dict[str, t.Any]) -> dict[str, np.ndarray]:
+        """Extract the one dimensional sample fields of a poll result.
+
+        Fields that are not one dimensional arrays with the same length as
+        the other fields (e.g. header information) are ignored.
+
+        Args:
+            sample: Poll result of a single node.
+
+        Returns:
+            Sample fields of the node.
+        """
+        fields = {
+            name: value
+            for name, value in sample.items()
+            if isinstance(value, np.ndarray) and value.ndim == 1
+        }
+        length = len(fields.get("timestamp", next(iter(fields.values()), ())))
+        return {name: value for name, value in fields.items() if len(value) == length}
+
+    def write(self, sample: dict[str, t.Any]) -> int:
+        """Append the samples of a poll result to the buffer.
+
+        Args:
+            sample: Poll result of a single node. (dictionary of field name
+                and numpy array)
+
+        Returns:
+            Number of samples that were overwritten because the buffer was
+            full.
+
+        Raises:
+            ValueError: If the sample does not contain the fields of the
+                previously written samples.
+        """
+        fields = self._sample_fields(sample)
+        if not fields:
+            return 0
+        if not self._fields:
+            self._fields = {
+                name: np.empty(self._capacity, dtype=value.dtype)
+                for name, value in fields.items()
+            }
+        missing = self._fields.keys() - fields.keys()
+        if missing:
+            msg = f"Sample is missing the field(s) {sorted(missing)}."
+            raise ValueError(msg)
+        count = len(next(iter(fields.values())))
+        dropped = max(0, self._size + count - self._capacity)
+        skip = max(0, count - self._capacity)
+        self._start = (self._start + dropped) % self._capacity
+        self._size -= dropped - skip
+        end = (self._start + self._size) % self._capacity
+        written = count - skip
+        first = min(written, self._capacity - end)
+        for name, buffer in self._fields.items():
+            value = fields[name][skip:]
+            buffer[end : end + first] = value[:first]
+            buffer[: written - first] = value[first:]
+        self._size += written
+        self._overruns += dropped
+        return dropped
+
+    def read(self, count: t.Optional[int] = None) -> dict[str, np.ndarray]:
+        """Remove the oldest samples from the buffer and return them.
+
+        Args:
+            count: Number of samples to read. If not specified or larger than
+                the number of available samples all available samples are
+                read. (default = None)
+
+        Returns:
+            Samples as dictionary of field name and numpy array.
+        """
+        count = self._size if count is None else min(count, self._size)
+        indices = (self._start + np.arange(count)) % self._capacity
+        result = {name: buffer.take(indices) for name, buffer in self._fields.items()}
+        self._start = (self._start + count) % self._capacity
+        self._size -= count
+        return result
+
+    def clear(self) -> None:
+        """Remove all samples from the buffer."""
+        self._start = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of samples the buffer can hold."""
+        return self._capacity
+
+    @property
+    def overruns(self) -> int:
+        """Number of samples that were lost because the buffer was full."""
+        return self._overruns
+
+    @property
+    def fields(self) -> list[str]:
+        """Names of the buffered sample fields."""
+        return list(self._fields)
@@ -0,0 +1,262 @@
+"""Conversion of polled samples into numpy structured arrays.
+
+The data server returns samples as a dictionary of per field arrays (e.g.
+demodulator or auxiliary input samples) or as a list of dictionaries (e.g.
+scope shots or module results). The functions in this module combine the
+fields into a single numpy structured array with one record per sample, so
+that every field is accessible as a contiguous column.
+"""
+
+from __future__ import annotations
+
+import re
+import typing as t
+
+import numpy as np
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst import core
+
+_DEVICE_SERIAL = re.compile(r"^/(dev\d+)/", re.IGNORECASE)
+
+
+def _field_dtype(name: str, value: t.Any, count: t.Optional[int]) -> tuple:
+    """Structured array field description of a value.
+
+    Args:
+        name: Name of the field.
+        value: Array or scalar value of the field.
+        count: Number of records the value is shared between. ``None`` if
+            the value belongs to a single record.
+
+    Returns:
+        Field description for the numpy dtype constructor.
+    """
+    value = np.asarray(value)
+    shape = value.shape if count is None else value.shape[1:]
+    return (name, value.dtype, shape) if shape else (name, value.dtype)
+
+
+def _fields_to_structured(
+    sample: dict[str, t.Any],
+    clockbase: t.Optional[float],
+) -> t.Optional[np.ndarray]:
+    """Convert a dictionary of per field arrays into a structured array.
+
+    Args:
+        sample: Dictionary of field name and array.
+        clockbase: Clockbase used to convert the timestamp into seconds.
+
+    Returns:
+        Structured array or ``None`` if the sample can not be converted.
+    """
+    fields = {
+        name: value
+        for name, value in sample.items()
+        if isinstance(value, np.ndarray) and value.ndim > 0
+    }
+    if not fields:
+        return None
+    count = len(fields.get("timestamp", next(iter(fields.values()))))
+    fields = {name: value for name, value in fields.items() if len(value) == count}
+    if clockbase and "timestamp" in fields:
+        fields = _insert_time(
+            fields,
+            timestamps_to_seconds(fields["timestamp"], clockbase),
+        )
+    result = np.empty(
+        count,
+        dtype=[_field_dtype(name, value, count) for name, value in fields.items()],
+    )
+    for name, value in fields.items():
+        result[name] = value
+    return result
+
+
+def _records_to_structured(
+    records: list[t.Any],
+    clockbase: t.Optional[float],
+) -> t.Optional[np.ndarray]:
+    """Convert a list of dictionaries into a structured array.
+
+    Nested dictionaries (e.g. headers), strings and ``None`` are ignored.
+
+    Args:
+        records: List of dictionaries with the same fields.
+        clockbase: Clockbase used to convert the timestamp into seconds.
+
+    Returns:
+        Structured array or ``None`` if the records can not be converted.
+    """
+    if not records or not all(isinstance(record, dict) for record in records):
+        return None
+    fields = [
+        {
+            name: np.asarray(value)
+            for name, value in record.items()
+            if value is not None and not isinstance(value, (dict, list, str))
+        }
+        for record in records
+    ]
+    if clockbase and "timestamp" in fields[0]:
+        fields = [
+            _insert_time(
+                record,
+                timestamps_to_seconds(record.get("timestamp", 0), clockbase),
+            )
+            for record in fields
+        ]
+    dtype = [_field_dtype(name, value, None) for name, value in fields[0].items()]
+    if not dtype or any(
+        [_field_dtype(name, value, None) for name, value in record.items()] != dtype
+        for record in fields[1:]
+    ):
+        return None
+    result = np.empty(len(records), dtype=dtype)
+    for index, record in enumerate(fields):
+        for name, value in record.items():
+            result[name][index] = value
+    return result
+
+
+def _insert_time(fields: dict[str, t.Any], time: t.Any) -> dict[str, t.Any]:
+    """Add the time in seconds after the timestamp field."""
+    result = {}
+    for name, value in fields.items():
+        result[name] = value
+        if name == "timestamp":
+            result["time"] = time
+    return result
+
+
+def to_structured_array(sample: t.Any, *, clockbase: t.Optional[float] = None) -> t.Any:
+    """Convert the samples of a single node into a structured array.
+
+    Dictionaries of per field arrays (e.g. demodulator samples) result in one
+    record per sample. Lists of dictionaries (e.g. scope shots) result in one
+    record per list entry, with multidimensional fields stored as subarrays.
+
+    Each field is copied exactly once into the structured array.
+
+    Args:
+        sample: Poll or module read result of a single node.
+        clockbase: Clockbase of the device in Hz. If specified, a ``time``
+            field with the timestamp converted into seconds is added after
+            the ``timestamp`` field. (default = None)
+
+    Returns:
+        Structured array. If the sample has no known layout (e.g. the records
+        of a list have different shapes) it is returned unchanged.
+    """
+    if isinstance(sample, dict):
+        result = _fields_to_structured(sample, clockbase)
+    elif isinstance(sample, list):
+        result = _records_to_structured(sample, clockbase)
+    else:
+        result = None
+    return sample if result is None else result
+
+
+def timestamps_to_seconds(
+    timestamp: t.Any,
+    clockbase: float,
+    *,
+    origin: t.Optional[int] = None,
+) -> np.ndarray:
+    """Convert device timestamps into seconds.
+
+    The conversion is vectorized. If an origin is specified it is subtracted
+    in the integer domain before the conversion, so that no precision is
+    lost for large timestamps.
+
+    Args:
+        timestamp: Timestamps in clock ticks of the device.
+        clockbase: Clockbase of the device in Hz.
+        origin: Timestamp that corresponds to zero seconds. (default = None)
+
+    Returns:
+        Time in seconds.
+    """
+    timestamp = np.asarray(timestamp)
+    if origin is not None:
+        timestamp = timestamp.astype(np.int64) - np.int64(origin)
+    return np.true_divide(timestamp, clockbase)
+
+
+def device_serial(path: str) -> t.Optional[str]:
+    """Lower case device serial of a node path (``None`` for other nodes)."""
+    match = _DEVICE_SERIAL.match(path)
+    return match.group(1).lower() if match else None
+
+
+def resolve_clockbases(
+    paths: t.Iterable[str],
+    clockbase: t.Callable[[str], float],
+) -> dict[str, t.Optional[float]]:
+    """Resolve the clockbase of every device that is part of the node paths.
+
+    Args:
+        paths: Node paths.
+        clockbase: Function that returns the clockbase of a device serial
+            (e.g. ``Session.clockbase``).
+
+    Returns:
+        Clockbase in Hz per (lower case) device serial. ``None`` if the
+        clockbase could not be read.
+    """
+    clockbases: dict[str, t.Optional[float]] = {}
+    for path in paths:
+        serial = device_serial(path)
+        if serial is None or serial in clockbases:
+            continue
+        try:
+            clockbases[serial] = clockbase(serial)
+        except RuntimeError:
+            clockbases[serial] = None
+    return clockbases
+
+
+def read_clockbases(
+    daq_server: core.ziDAQServer,
+    paths: t.Iterable[str],
+) -> dict[str, t.Optional[float]]:
+    """Read the clockbase of every device that is part of the node paths.
+
+    In contrast to ``Session.clockbase`` the clockbases are not cached.
+
+    Args:
+        daq_server: Connection to the data server.
+        paths: Node paths.
+
+    Returns:
+        Clockbase in Hz per (lower case) device serial. ``None`` if the
+        clockbase could not be read.
+    """
+    return resolve_clockbases(
+        paths,
+        lambda serial: daq_server.getDouble(f"/{serial}/clockbase"),
+    )
+
+
+def to_structured(
+    data: dict[str, t.Any],
+    clockbases: t.Optional[t.Mapping[str, t.Optional[float]]] = None,
+) -> dict[str, t.Any]:
+    """Convert the samples of all nodes into structured arrays.
+
+    Args:
+        data: Flat poll or module read result.
+        clockbases: Clockbase in Hz per (lower case) device serial
+            (see ``read_clockbases``). (default = None)
+
+    Returns:
+        Dictionary with the same keys as ``data`` and the converted samples
+        (see ``to_structured_array``).
+    """
+    clockbases = clockbases or {}
+    result = {}
+    for path, sample in data.items():
+        serial = device_serial(path)
+        clockbase = clockbases.get(serial) if serial else None
+        result[path] = to_structured_array(sample, clockbase=clockbase)
+    return result
@@ -0,0 +1,388 @@
+"""Append only on-disk storage for streamed node data.
+
+Every node is stored in its own directory, which mirrors the node path.
+The directory contains a ``meta.json`` file with the node information
+(e.g. unit and description) and the data as a sequence of chunk files. Each
+chunk is a numpy structured array, either stored uncompressed (``.npy``,
+memory mapped on readback) or compressed (``.npz``).
+
+>>> with StreamWriter("measurement", session=session) as writer:
+...     for _ in range(100):
+...         writer.write(session.poll())
+>>> reader = StreamReader("measurement")
+>>> reader["/dev1234/demods/0/sample"]["x"]
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import typing as t
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+from zhinst.toolkit.exceptions import ToolkitError
+from zhinst.toolkit.streaming.samples import to_structured_array
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from zhinst.toolkit.nodetree import Node
+    from zhinst.toolkit.session import Session
+
+logger = logging.getLogger(__name__)
+
+_META_FILE = "meta.json"
+_CHUNK_SUFFIXES = (".npy", ".npz")
+
+
+def _node_directory(root: Path, path: str) -> Path:
+    """Directory of a node inside the storage root."""
+    return root.joinpath(*path.strip("/").lower().split("/"))
+
+
+def _chunk_files(directory: Path) -> list[Path]:
+    """Chunk files of a node in the order they were written."""
+    return sorted(
+        file for file in directory.iterdir() if file.suffix in _CHUNK_SUFFIXES
+    )
+
+
+def _to_array(data: t.Any) -> np.ndarray:
+    """Convert the data of a node into a structured array.
+
+    Args:
+        data: Poll or module read result of a single node. Named tuples
+            (e.g. ``DAQResult``) are stored as records. Nested lists (e.g.
+            sweeper results) are flattened into one record per entry of the
+            inner lists (e.g. one record per sweep).
+
+    Returns:
+        Numpy array without python objects.
+
+    Raises:
+        TypeError: If the data can not be converted.
+    """
+    if isinstance(data, tuple) and hasattr(data, "_asdict"):
+        data = [data]
+    if isinstance(data, list):
+        if data and all(isinstance(entry, list) for entry in data):
+            data = [record for entry in data for record in entry]
+        data = [
+            entry._asdict() if hasattr(entry, "_asdict") else entry for entry in data
+        ]
+    result = data if isinstance(data, np.ndarray) else to_structured_array(data)
+    if not isinstance(result, np.ndarray) or result.dtype.hasobject:
+        msg = f"Data of type {type(data).__name__} can not be stored."
+        raise TypeError(msg)
+    return result
+
+
+class StreamWriter:
+    """Write node data into append only datasets on a background thread.
+
+    The data passed to ``write`` is converted into numpy structured arrays
+    and written to disk on a writer thread, so that the acquisition loop is
+    not blocked by the file system. Every call appends one chunk per node.
+    If the writer thread can not keep up, ``write`` blocks once ``maxsize``
+    writes are pending.
+
+    Writing to an existing directory appends to the existing datasets. The
+    data type of a node must not change between chunks.
+
+    A chunk that can not be stored does not stop the writer, the data of all
+    other writes is still stored. Every failure is logged with its node path
+    and reported by the next call of ``write``, ``flush`` or ``close``.
+
+    Args:
+        directory: Root directory of the datasets.
+        session: Session used to look up the node information (unit and
+            description) stored in the metadata. (default = None)
+        compress: Flag if the chunks are stored compressed. Compressed chunks
+            can not be memory mapped on readback. (default = False)
+        maxsize: Maximum number of pending writes. (default = 100)
+    """
+
+    def __init__(
+        self,
+        directory: t.Union[str, Path],
+        *,
+        session: t.Optional[Session] = None,
+        compress: bool = False,
+        maxsize: int = 100,
+    ):
+        self._root = Path(directory)
+        self._session = session
+        self._compress = compress
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._metadata: dict[str, dict[str, t.Any]] = {}
+        self._chunk_count: dict[str, int] = {}
+        self._dtypes: dict[str, np.dtype] = {}
+        self._errors: list[tuple[str, Exception]] = []
+        self._errors_lock = threading.Lock()
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._thread: t.Optional[threading.Thread] = threading.Thread(
+            target=self._run,
+            name="zhinst-toolkit-stream-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def __repr__(self):
+        return f"StreamWriter({str(self._root)!r})"
+
+    def __enter__(self) -> StreamWriter:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _node_metadata(self, path: str) -> dict[str, t.Any]:
+        """Node information of a node path.
+
+        Module results (e.g. ``/dev1234/demods/0/sample.x``) use the
+        information of the underlying device node.
+
+        Args:
+            path: Node path.
+
+        Returns:
+            Metadata of the node.
+        """
+        metadata: dict[str, t.Any] = {"path": path}
+        if self._session is None:
+            return metadata
+        for candidate in dict.fromkeys([path, path.split(".", maxsplit=1)[0]]):
+            try:
+                node_info = self._session.raw_path_to_node(candidate).node_info
+                metadata.update(
+                    unit=node_info.unit,
+                    description=node_info.description,
+                    type=node_info.type,
+                )
+                break
+            except (KeyError, RuntimeError):
+                continue
+        return metadata
+
+    def _run(self) -> None:
+        """Write queued data until the writer is closed."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._store(*item)
+            except Exception as error:
+                logger.exception(f"Failed to store the data of {item[0]}.")
+                with self._errors_lock:
+                    self._errors.append((item[0], error))
+            finally:
+                self._queue.task_done()
+
+    def _store(self, path: str, data: t.Any) -> None:
+        """Append a chunk to the dataset of a node.
+
+        Args:
+            path: Node path.
+            data: Data of the node.
+
+        Raises:
+            TypeError: If the data can not be stored or its type differs
+                from the existing chunks.
+        """
+        array = _to_array(data)
+        directory = _node_directory(self._root, path)
+        if path not in self._chunk_count:
+            directory.mkdir(parents=True, exist_ok=True)
+            existing = _chunk_files(directory)
+            self._chunk_count[path] = len(existing)
+            if existing:
+                self._dtypes[path] = _load_chunk(existing[0]).dtype
+            meta_file = directory / _META_FILE
+            if not meta_file.exists():
+                meta_file.write_text(json.dumps(self._metadata[path], indent=2))
+        dtype = self._dtypes.setdefault(path, array.dtype)
+        if array.dtype != dtype:
+            msg = f"Data type of {path} changed from {dtype} to {array.dtype}."
+            raise TypeError(msg)
+        name = f"{self._chunk_count[path]:08d}"
+        if self._compress:
+            np.savez_compressed(directory / f"{name}.npz", data=array)
+        else:
+            np.save(directory / f"{name}.npy", array, allow_pickle=False)
+        self._chunk_count[path] += 1
+
+    def write_node(self, path: t.Union[Node, str], data: t.Any) -> None:
+        """Append the data of a single node.
+
+        Has the signature of a ``PollDispatcher`` callback, e.g.
+        ``dispatcher.subscribe("*", writer.write_node, threaded=True)``.
+
+        Args:
+            path: Node (path).
+            data: Data of the node.
+
+        Raises:
+            ValueError: If the writer is already closed.
+            ToolkitError: If previous data could not be stored.
+        """
+        if self._thread is None:
+            msg = "The writer is closed."
+            raise ValueError(msg)
+        self._raise_error()
+        path = str(path).lower()
+        if path not in self._metadata:
+            self._metadata[path] = self._node_metadata(path)
+        self._queue.put((path, data))
+
+    def write(self, data: t.Mapping[t.Any, t.Any]) -> None:
+        """Append the data of all nodes.
+
+        Args:
+            data: Poll or module read result (e.g. ``session.poll()`` or
+                ``daq_module.read()``).
+
+        Raises:
+            ValueError: If the writer is already closed.
+            ToolkitError: If previous data could not be stored.
+        """
+        for path, value in data.items():
+            self.write_node(path, value)
+
+    def _raise_error(self) -> None:
+        """Report all failures since the last report.
+
+        Raises:
+            ToolkitError: If data could not be stored. Lists the node path and
+                error of every failure.
+        """
+        with self._errors_lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            msg = f"Failed to store {len(errors)} chunk(s): " + "; ".join(
+                f"{path}: {error}" for path, error in errors
+            )
+            raise ToolkitError(msg) from errors[0][1]
+
+    def flush(self) -> None:
+        """Wait until all pending data is written.
+
+        Raises:
+            ToolkitError: If previous data could not be stored.
+        """
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Write all pending data and stop the writer thread.
+
+        Raises:
+            ToolkitError: If previous data could not be stored.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+    @property
+    def directory(self) -> Path:
+        """Root directory of the datasets."""
+        return self._root
+
+    @property
+    def pending(self) -> int:
+        """Number of writes not yet stored on disk."""
+        return self._queue.qsize()
+
+
+def _load_chunk(file: Path) -> np.ndarray:
+    """Load a chunk file (memory mapped if uncompressed)."""
+    if file.suffix == ".npz":
+        with np.load(file, allow_pickle=False) as archive:
+            return archive["data"]
+    return np.load(file, mmap_mode="r", allow_pickle=False)
+
+
+class StreamReader(Mapping):
+    """Read datasets written by the ``StreamWriter``.
+
+    The reader is a mapping of node path to the data of the node. The data is
+    only loaded when accessed. Uncompressed chunks are memory mapped.
+
+    Args:
+        directory: Root directory of the datasets.
+
+    Example:
+        >>> reader = StreamReader("measurement")
+        >>> list(reader)
+        ['/dev1234/demods/0/sample']
+        >>> reader["/dev1234/demods/0/sample"]["x"]
+    """
+
+    def __init__(self, directory: t.Union[str, Path]):
+        self._root = Path(directory)
+
+    def __repr__(self):
+        return f"StreamReader({str(self._root)!r})"
+
+    def __getitem__(self, key: t.Union[Node, str]) -> np.ndarray:
+        chunks = list(self.chunks(key))
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+    def __contains__(self, key: object) -> bool:
+        return (_node_directory(self._root, str(key)) / _META_FILE).exists()
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _directory(self, key: t.Union[Node, str]) -> Path:
+        directory = _node_directory(self._root, str(key))
+        if not (directory / _META_FILE).exists():
+            raise KeyError(str(key))
+        return directory
+
+    @property
+    def nodes(self) -> list[str]:
+        """Paths of all stored nodes."""
+        return sorted(
+            json.loads(file.read_text())["path"]
+            for file in self._root.rglob(_META_FILE)
+        )
+
+    def metadata(self, key: t.Union[Node, str]) -> dict[str, t.Any]:
+        """Metadata of a node (path, unit, description and type).
+
+        Args:
+            key: Node (path).
+
+        Returns:
+            Metadata of the node.
+
+        Raises:
+            KeyError: If the node is not stored.
+        """
+        return json.loads((self._directory(key) / _META_FILE).read_text())
+
+    def chunks(self, key: t.Union[Node, str]) -> t.Iterator[np.ndarray]:
+        """Lazily load the chunks of a node in the order they were written.
+
+        Args:
+            key: Node (path).
+
+        Returns:
+            Iterator over the chunks.
+
+        Raises:
+            KeyError: If the node is not stored.
+        """
+        for file in _chunk_files(self._directory(key)):
+            yield _load_chunk(file)
@@ -2,21 +2,34 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
 import typing as t
 import warnings
+from collections import OrderedDict, namedtuple
 from collections.abc import MutableMapping
 from enum import IntFlag
 from io import BytesIO
+from pathlib import Path
 
 import numpy as np
 from elftools.common.exceptions import ELFError
 from elftools.elf.elffile import ELFFile
-from zhinst.utils import convert_awg_waveform, parse_awg_waveform
 
 from zhinst.toolkit.exceptions import ValidationError
 
 _Waveform = tuple[np.ndarray, t.Optional[np.ndarray], t.Optional[np.ndarray]]
+# Parts of a raw vector and whether they are markers (not scaled)
+_RawParts = list[tuple[t.Any, bool]]
+
+_UINT16_SCALE = np.power(2, 15) - 1
+
+UploadStats = namedtuple(
+    "UploadStats",
+    ["uploaded", "skipped", "bytes_uploaded", "bytes_skipped"],
+)
 
 
 class OutputType(IntFlag):
@@ -73,6 +86,285 @@ class Wave(np.ndarray):
         self.output = getattr(obj, "output", None)
 
 
+class LazyWave:
+    """Wave whose samples are only read when the waveform is converted.
+
+    Long waveforms that are generated offline do not need to be loaded into
+    memory before they are assigned to a ``Waveforms`` object. The samples of
+    a lazy wave are read chunk by chunk while they are converted into the raw
+    vector for the device (see ``Waveforms.get_raw_vector``). The peak memory
+    during an upload is therefore the raw vector itself plus a single chunk.
+
+    Args:
+        source: Source of the samples. Either the path to a ``.npy`` file
+            (opened memory-mapped), a one dimensional array (e.g.
+            ``np.memmap``) or a callable that takes the start and stop index
+            and returns the samples in this range.
+        length: Number of samples. Required if the source is a callable.
+            (default = None)
+        dtype: Data type of the samples. Required if the source is a callable
+            and the samples are not float64. (default = None)
+        chunk_size: Number of samples read at once. (default = 2**20)
+        name: Optional name of the wave in the sequencer code snippet.
+            (default = None)
+        output: Optional output configuration of the wave in the sequencer
+            code snippet. (default = None)
+
+    Raises:
+        ValueError: If the source is not one dimensional or the length of a
+            callable source is missing.
+        TypeError: If the source is not supported.
+
+    Example:
+        >>> waveforms = Waveforms()
+        >>> waveforms[0] = LazyWave("long_pulse.npy")
+        >>> waveforms[1] = LazyWave(
+        ...     lambda start, stop: np.sin(np.arange(start, stop) * 1e-3),
+        ...     length=10_000_000,
+        ... )
+        >>> device.awgs[0].write_to_waveform_memory(waveforms)
+    """
+
+    def __init__(
+        self,
+        source: t.Union[str, os.PathLike, np.ndarray, t.Callable[[int, int], t.Any]],
+        *,
+        length: t.Optional[int] = None,
+        dtype: t.Optional[np.typing.DTypeLike] = None,
+        chunk_size: int = 2**20,
+        name: t.Optional[str] = None,
+        output: t.Optional[OutputType] = None,
+    ):
+        if isinstance(source, (str, os.PathLike)):
+            source = np.load(source, mmap_mode="r")
+        if isinstance(source, np.ndarray):
+            if source.ndim != 1:
+                msg = "The source of a lazy wave must be one dimensional."
+                raise ValueError(msg)
+            array = source
+            self._read: t.Callable[[int, int], t.Any] = lambda start, stop: array[
+                start:stop
+            ]
+            length = len(array)
+            dtype = array.dtype
+        elif callable(source):
+            if length is None:
+                msg = "The length of a lazy wave with a callable source is required."
+                raise ValueError(msg)
+            self._read = source
+        else:
+            msg = f"Unsupported source for a lazy wave: {type(source)}."
+            raise TypeError(msg)
+        self._length = int(length)
+        self._dtype = np.dtype(dtype if dtype is not None else np.float64)
+        self._chunk_size = int(chunk_size)
+        self.name = name
+        self.output = output
+
+    def __repr__(self):
+        return f"LazyWave(length={self._length}, dtype={self._dtype})"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = np.empty(self._length, dtype=self._dtype)
+        for start, chunk in self.chunks():
+            array[start : start + len(chunk)] = chunk
+        return array if dtype is None else array.astype(dtype)
+
+    @property
+    def size(self) -> int:
+        """Number of samples."""
+        return self._length
+
+    @property
+    def shape(self) -> tuple[int]:
+        """Shape of the wave."""
+        return (self._length,)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Data type of the samples."""
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the samples in bytes."""
+        return self._length * self._dtype.itemsize
+
+    @property
+    def real(self) -> LazyWave:
+        """Real part of the wave."""
+        return self._derived(np.real)
+
+    @property
+    def imag(self) -> LazyWave:
+        """Imaginary part of the wave."""
+        return self._derived(np.imag)
+
+    def _derived(self, function: t.Callable[[np.ndarray], np.ndarray]) -> LazyWave:
+        """Lazy wave that applies a function to every chunk."""
+        return LazyWave(
+            lambda start, stop: function(self._chunk(start, stop)),
+            length=self._length,
+            dtype=function(np.zeros(0, dtype=self._dtype)).dtype,
+            chunk_size=self._chunk_size,
+        )
+
+    def _chunk(self, start: int, stop: int) -> np.ndarray:
+        chunk = np.asarray(self._read(start, stop), dtype=self._dtype)
+        if chunk.shape != (stop - start,):
+            msg = (
+                f"The source of the lazy wave returned {chunk.shape} samples "
+                f"for the range {start}:{stop}."
+            )
+            raise ValueError(msg)
+        return chunk
+
+    def chunks(self) -> t.Iterator[tuple[int, np.ndarray]]:
+        """Read the samples chunk by chunk.
+
+        Yields:
+            Start index and samples of every chunk.
+        """
+        for start in range(0, self._length, self._chunk_size):
+            yield start, self._chunk(start, min(start + self._chunk_size, self._length))
+
+
+def _chunks(wave: t.Union[np.ndarray, LazyWave]) -> t.Iterator[tuple[int, np.ndarray]]:
+    """Samples of a wave chunk by chunk (a single chunk for arrays)."""
+    if isinstance(wave, LazyWave):
+        yield from wave.chunks()
+    else:
+        yield 0, wave
+
+
+_WAVE_TYPES = (np.ndarray, LazyWave)
+
+
+_DESCRIPTOR_DTYPE = np.dtype(
+    [
+        ("length", np.int64),
+        ("channels", np.int8),
+        ("marker_bits", np.uint8),
+        ("play_config", np.int64),
+        ("kind", np.int8),
+    ],
+)
+# Kinds of the waveforms in a descriptor
+_KIND_FIXED = 0
+_KIND_PLACEHOLDER = 1
+_KIND_FILLER = 2
+
+WaveformDescriptors = namedtuple("WaveformDescriptors", ["table", "names"])
+WaveformDescriptors.__doc__ = """Parsed waveform descriptors of a sequencer program.
+
+Attributes:
+    table: Structured array with one record per waveform slot and the fields
+        ``length``, ``channels``, ``marker_bits`` (bit n set if the channel
+        n has markers), ``play_config`` and ``kind`` (0 = fixed waveform,
+        1 = placeholder, 2 = filler).
+    names: Names of the waveforms.
+"""
+
+_descriptor_cache: OrderedDict[bytes, WaveformDescriptors] = OrderedDict()
+_descriptor_cache_lock = threading.Lock()
+_DESCRIPTOR_CACHE_SIZE = 32
+
+
+def _descriptor_table(waveform_info: list[dict]) -> WaveformDescriptors:
+    """Convert the waveform descriptors into a structured array.
+
+    Args:
+        waveform_info: Descriptor of every waveform slot.
+
+    Returns:
+        Parsed waveform descriptors.
+    """
+    table = np.zeros(len(waveform_info), dtype=_DESCRIPTOR_DTYPE)
+    names = []
+    for index, wave in enumerate(waveform_info):
+        name = wave["name"]
+        names.append(name)
+        marker_bits = str(wave.get("marker_bits", "0")).split(";")
+        table[index] = (
+            int(wave["length"]),
+            int(wave.get("channels", 1)),
+            sum(int(bool(int(bits))) << bit for bit, bits in enumerate(marker_bits)),
+            int(wave.get("play_config", 0)),
+            (
+                _KIND_PLACEHOLDER
+                if name.startswith(("__placeholder", "__playWave"))
+                else _KIND_FILLER if "__filler" in name else _KIND_FIXED
+            ),
+        )
+    table.flags.writeable = False
+    return WaveformDescriptors(table=table, names=tuple(names))
+
+
+def _parse_meta_info(meta_info: t.Union[bytes, str, dict]) -> list[dict]:
+    """Extract the waveform descriptors from an ELF or a descriptor string."""
+    try:
+        elf_info = ELFFile(BytesIO(meta_info))  # type: ignore[arg-type]
+        raw_data = elf_info.get_section_by_name(".waveforms").data().decode("utf-8")
+        return json.loads(raw_data)["waveforms"]
+    except (TypeError, ELFError) as e:
+        if isinstance(meta_info, str):
+            return json.loads(meta_info).get("waveforms", [])
+        if isinstance(meta_info, dict):
+            return meta_info.get("waveforms", meta_info)
+        msg = (
+            "meta_info needs to be an elf file or the waveform descriptor from "
+            "the device (e.g. device.awgs[0].waveform.descriptor(). The passed "
+            f"meta_info are of type {type(meta_info)} ({meta_info!s})."
+        )
+        raise TypeError(
+            msg,
+        ) from e
+
+
+def parse_waveform_descriptors(
+    meta_info: t.Union[bytes, str, dict],
+) -> WaveformDescriptors:
+    """Parse the waveform descriptors of a sequencer program.
+
+    ELF files and descriptor strings are parsed only once. The result is
+    cached by the hash of the ELF or the descriptor string.
+
+    Args:
+        meta_info: Compiled sequencer code, the waveform descriptor string of
+            the device (e.g. ``device.awgs[0].waveform.descriptors()``) or
+            the parsed waveform descriptor.
+
+    Returns:
+        Parsed waveform descriptors.
+
+    Raises:
+        TypeError: If the meta_info are not a compiled elf file, string or
+            dictionary.
+    """
+    if isinstance(meta_info, dict):
+        return _descriptor_table(_parse_meta_info(meta_info))
+    if isinstance(meta_info, str):
+        key = b"s" + hashlib.blake2b(meta_info.encode()).digest()
+    elif isinstance(meta_info, (bytes, bytearray, memoryview)):
+        key = b"b" + hashlib.blake2b(meta_info).digest()
+    else:
+        return _descriptor_table(_parse_meta_info(meta_info))
+    with _descriptor_cache_lock:
+        descriptors = _descriptor_cache.get(key)
+        if descriptors is not None:
+            _descriptor_cache.move_to_end(key)
+            return descriptors
+    descriptors = _descriptor_table(_parse_meta_info(meta_info))
+    with _descriptor_cache_lock:
+        _descriptor_cache[key] = descriptors
+        while len(_descriptor_cache) > _DESCRIPTOR_CACHE_SIZE:
+            _descriptor_cache.popitem(last=False)
+    return descriptors
+
+
 class Waveforms(MutableMapping):
     """Waveform dictionary.
 
@@ -106,6 +398,9 @@ class Waveforms(MutableMapping):
 
     The arrays can be provided as arrays of integer, float. The first wave also
     can be of type complex. In that case the second waveform must be `None`.
+    Instead of arrays, waves and markers can also be lazy sources
+    (``LazyWave`` or the path to a ``.npy`` file) that are only read when the
+    waveform is converted.
 
     Depending on the target format the function `get_raw_vector` converts the
     waves into the following format:
@@ -117,22 +412,33 @@ class Waveforms(MutableMapping):
       nodes (does not support markers). In case two real waveforms have been
       specified they are combined into a single complex waveform, where the
       imaginary part defined by the second wave.
+
+    The converted raw vectors and the sequence snippet are cached until a slot
+    is assigned again. Arrays of a slot that are modified in place therefore
+    need to be reassigned to the slot. The cached raw vectors are read-only.
+    `get_raw_vectors` converts multiple slots at once into a single buffer.
     """
 
+    # Raw vectors are cached per slot (see ``get_raw_vectors``)
+    _CACHE_RAW_VECTORS = True
+
     def __init__(self):
-        self._waveforms = {}
+        self._waveforms: t.MutableMapping[int, tuple] = {}
+        self._raw_vectors: dict[tuple[int, bool], np.ndarray] = {}
+        self._sequence_snippet: t.Optional[str] = None
 
     def __getitem__(self, slot: int) -> _Waveform:
         return self._waveforms[slot]
 
     def __setitem__(self, slot: int, value: t.Union[np.ndarray, _Waveform]):
-        if isinstance(value, np.ndarray):
+        if isinstance(value, (np.ndarray, LazyWave, str, os.PathLike)):
             self._set_waveform(slot, (value, None, None))
         else:
             self._set_waveform(slot, value)
 
     def __delitem__(self, slot: int):
         del self._waveforms[slot]
+        self._invalidate(slot)
 
     def __iter__(self):
         return iter(self._waveforms)
@@ -176,24 +482,55 @@ class Waveforms(MutableMapping):
             markers_present: Indicates if markers are interleaved in the wave.
                 (default = False)
         """
-        wave1, wave2, markers = parse_awg_waveform(
-            raw_waveform,
-            channels=channels,
-            markers_present=markers_present,
+        self.assign_native_awg_waveforms(
+            {slot: (raw_waveform, channels, markers_present)},
         )
-        if markers_present and channels == 2:
-            self._waveforms[slot] = (wave1, wave2, markers)
-        elif channels == 2:
-            self._waveforms[slot] = (wave1, wave2, None)
-        elif markers_present:
-            self._waveforms[slot] = (wave1, None, markers)
-        else:
-            self._waveforms[slot] = (wave1, None, None)
+
+    def assign_native_awg_waveforms(
+        self,
+        raw_waveforms: t.Mapping[int, tuple[np.ndarray, int, bool]],
+    ) -> None:
+        """Assigns multiple native AWG waveforms at once.
+
+        The waves of all slots are scaled into a single float array and are
+        views into it. The markers are views into the native waveforms.
+
+        Args:
+            raw_waveforms: Native AWG waveform, number of channels and flag if
+                markers are interleaved per slot.
+        """
+        parsed = {}
+        total = 0
+        for slot, (raw_waveform, channels, markers_present) in raw_waveforms.items():
+            raw = np.asarray(raw_waveform)
+            wave_int = (
+                raw.view(np.int16) if raw.dtype == np.uint16 else raw.astype(np.int16)
+            )
+            frames = channels + int(markers_present)
+            waves = [wave_int[index::frames] for index in range(min(channels, 2))]
+            markers = wave_int[frames - 1 :: frames] if markers_present else None
+            parsed[slot] = (waves, markers)
+            total += sum(len(wave) for wave in waves)
+        buffer = np.empty(total)
+        offset = 0
+        for slot, (waves, markers) in parsed.items():
+            scaled = []
+            for wave in waves:
+                target = buffer[offset : offset + len(wave)]
+                np.divide(wave, _UINT16_SCALE, out=target)
+                scaled.append(target)
+                offset += len(wave)
+            self._invalidate(slot)
+            self._waveforms[slot] = (
+                scaled[0],
+                scaled[1] if len(scaled) == 2 else None,
+                markers,
+            )
 
     def _set_waveform(
         self,
         slot: int,
-        value: _Waveform,
+        value: tuple,
     ) -> None:
         """Assigns a tuple of waves to the slot.
 
@@ -201,7 +538,8 @@ class Waveforms(MutableMapping):
 
         * At least one wave must be defined
         * At most three waves are defined
-        * The waves must by numpy arrays
+        * The waves must by numpy arrays or lazy waves (paths to ``.npy``
+          files are opened as lazy waves)
         * The waves must have the same length
         * If the first wave is complex teh second wave must be None
 
@@ -216,17 +554,21 @@ class Waveforms(MutableMapping):
             raise RuntimeError(
                 msg,
             )
+        value = tuple(
+            LazyWave(wave) if isinstance(wave, (str, os.PathLike)) else wave
+            for wave in value
+        )
         if (
-            not isinstance(value[0], np.ndarray)
+            not isinstance(value[0], _WAVE_TYPES)
             or (
                 len(value) > 2
                 and value[1] is not None
-                and not isinstance(value[1], np.ndarray)
+                and not isinstance(value[1], _WAVE_TYPES)
             )
             or (
                 len(value) > 3
                 and value[1] is not None
-                and not isinstance(value[2], np.ndarray)
+                and not isinstance(value[2], _WAVE_TYPES)
             )
         ):
             msg = "Waveform must be specified as numpy.arrays"
@@ -247,10 +589,17 @@ class Waveforms(MutableMapping):
             raise RuntimeError(
                 msg,
             )
+        self._invalidate(slot)
         self._waveforms[slot] = tuple(
-            w.view(Wave) if w is not None else None for w in value
+            w.view(Wave) if isinstance(w, np.ndarray) else w for w in value
         ) + (None,) * (3 - len(value))
 
+    def _invalidate(self, slot: int) -> None:
+        """Remove the cached raw vectors of a slot and the sequence snippet."""
+        self._raw_vectors.pop((slot, False), None)
+        self._raw_vectors.pop((slot, True), None)
+        self._sequence_snippet = None
+
     def get_raw_vector(
         self,
         slot: int,
@@ -264,6 +613,8 @@ class Waveforms(MutableMapping):
         waveform that can be uploaded to a generator wave node.
         (complex_output = True).
 
+        The raw vector is cached (read-only) until the slot is assigned again.
+
         Args:
             slot: slot number of the waveform
             complex_output: Flag if the output should be a complex waveform for a
@@ -276,41 +627,227 @@ class Waveforms(MutableMapping):
         Raises:
             ValueError: The length of the waves does not match the target length.
         """
+        wave1 = self._waveforms[slot][0]
+        if complex_output and isinstance(wave1, np.ndarray) and np.iscomplexobj(wave1):
+            # Complex waves are already in the target format
+            parts = self._raw_parts(slot, complex_output=True)
+            return parts[0][0]
+        return self.get_raw_vectors([slot], complex_output=complex_output)[slot]
+
+    def get_raw_vectors(
+        self,
+        slots: t.Optional[t.Iterable[int]] = None,
+        *,
+        complex_output: bool = False,
+        out: t.Optional[np.ndarray] = None,
+    ) -> dict[int, np.ndarray]:
+        """Get the raw vectors of multiple slots.
+
+        All slots that are not cached are converted in a single pass into one
+        contiguous buffer. The returned raw vectors are views into that
+        buffer. Slots with lazy waves (see ``LazyWave``) and all slots of an
+        ``ArenaWaveforms`` are converted chunk by chunk into a buffer of their
+        own and are not cached. Slots are converted into the same format as by
+        `get_raw_vector`, complex waveforms are returned as complex128.
+
+        Args:
+            slots: Slots to convert. Defaults to all slots. (default = None)
+            complex_output: Flag if the output should be a complex waveform for
+                a generator node, instead of the native AWG format that can
+                only be uploaded to an AWG node. (default = False)
+            out: Preallocated one dimensional buffer (uint16 for the native AWG
+                format, complex128 for complex waveforms) the raw vectors of
+                all slots are written to. Allows reusing the same memory for
+                repeated conversions. Raw vectors written to a given buffer are
+                not cached. (default = None)
+
+        Returns:
+            Raw vector per slot.
+
+        Raises:
+            ValueError: If ``out`` has the wrong data type or is too small.
+        """
+        slots = list(self._waveforms) if slots is None else list(slots)
+        if out is None:
+            pending = [
+                slot
+                for slot in slots
+                if (slot, complex_output) not in self._raw_vectors
+            ]
+        else:
+            pending = slots
+        layouts = {}
+        for slot in pending:
+            layouts[slot] = self._raw_parts(slot, complex_output=complex_output)
+        sizes = {
+            slot: len(parts[0][0]) * (1 if complex_output else len(parts))
+            for slot, parts in layouts.items()
+        }
+        # Raw vectors of lazy waves are neither cached nor share the buffer,
+        # so their memory is released once they are no longer used.
+        lazy = {
+            slot
+            for slot, parts in layouts.items()
+            if not self._CACHE_RAW_VECTORS
+            or any(isinstance(part, LazyWave) for part, _ in parts)
+        }
+        dtype = np.dtype(np.complex128 if complex_output else np.uint16)
+        total_size = sum(sizes.values())
+        if out is None:
+            buffer = np.empty(
+                sum(size for slot, size in sizes.items() if slot not in lazy),
+                dtype=dtype,
+            )
+        elif out.dtype != dtype or out.ndim != 1 or out.size < total_size:
+            msg = (
+                f"The buffer must be a one dimensional {dtype} array with at least "
+                f"{total_size} elements."
+            )
+            raise ValueError(msg)
+        else:
+            buffer = out
+        converted = {}
+        offset = 0
+        for slot, parts in layouts.items():
+            if out is None and slot in lazy:
+                raw_vector = np.empty(sizes[slot], dtype=dtype)
+            else:
+                raw_vector = buffer[offset : offset + sizes[slot]]
+                offset += sizes[slot]
+            self._write_raw_vector(raw_vector, parts, complex_output=complex_output)
+            converted[slot] = raw_vector
+        if out is None:
+            for slot, raw_vector in converted.items():
+                if slot not in lazy:
+                    raw_vector.flags.writeable = False
+                    self._raw_vectors[slot, complex_output] = raw_vector
+            return {
+                slot: converted.get(slot, self._raw_vectors.get((slot, complex_output)))
+                for slot in slots
+            }
+        return converted
+
+    def iter_raw_vectors(
+        self,
+        slots: t.Optional[t.Iterable[int]] = None,
+        *,
+        max_bytes: int,
+        complex_output: bool = False,
+    ) -> t.Iterator[dict[int, np.ndarray]]:
+        """Get the raw vectors of multiple slots in batches of bounded size.
+
+        Converts the slots in consecutive batches (see ``get_raw_vectors``),
+        whose raw vectors together take at most ``max_bytes``. A single slot
+        that is larger forms a batch of its own. Allows uploading waveform
+        libraries that do not fit into memory as raw vectors.
+
+        Args:
+            slots: Slots to convert. Defaults to all slots. (default = None)
+            max_bytes: Maximum size of the raw vectors of a batch in bytes.
+            complex_output: Flag if the output should be a complex waveform for
+                a generator node, instead of the native AWG format that can
+                only be uploaded to an AWG node. (default = False)
+
+        Yields:
+            Raw vector per slot of a batch.
+        """
+        slots = list(self._waveforms) if slots is None else list(slots)
+        itemsize = np.dtype(np.complex128 if complex_output else np.uint16).itemsize
+        batch: list[int] = []
+        batch_bytes = 0
+        for slot in slots:
+            with warnings.catch_warnings():
+                # Warnings are raised by the conversion of the batch
+                warnings.simplefilter("ignore")
+                parts = self._raw_parts(slot, complex_output=complex_output)
+            nbytes = len(parts[0][0]) * (1 if complex_output else len(parts)) * itemsize
+            if batch and batch_bytes + nbytes > max_bytes:
+                yield self.get_raw_vectors(batch, complex_output=complex_output)
+                batch, batch_bytes = [], 0
+            batch.append(slot)
+            batch_bytes += nbytes
+        if batch:
+            yield self.get_raw_vectors(batch, complex_output=complex_output)
+
+    def _raw_parts(self, slot: int, *, complex_output: bool) -> _RawParts:
+        """Waves that make up the raw vector of a slot.
+
+        Args:
+            slot: slot number of the waveform
+            complex_output: Flag if the parts of a complex waveform are
+                requested.
+
+        Returns:
+            Waves in the order they are interleaved (native AWG format) or the
+            real and imaginary part (complex waveform) and whether they are
+            markers.
+        """
         waves = self._waveforms[slot]
         wave1 = np.zeros(1) if len(waves[0]) == 0 else waves[0]
         wave2 = np.zeros(1) if waves[1] is not None and len(waves[1]) == 0 else waves[1]
         marker = waves[2]
-        if complex_output and np.iscomplexobj(wave1):
-            if wave2 is not None or marker is not None:
-                warnings.warn(
-                    "Complex values do not support markers",
-                    RuntimeWarning,
-                    stacklevel=2,
-                )
-            return wave1
-        if complex_output and not np.iscomplexobj(wave1):
-            if marker is not None:
+        if complex_output:
+            if marker is not None or (np.iscomplexobj(wave1) and wave2 is not None):
                 warnings.warn(
                     "Complex values do not support markers",
                     RuntimeWarning,
-                    stacklevel=2,
+                    stacklevel=3,
                 )
-            complex_wave = np.zeros(wave1.shape, dtype=np.complex128)
-            complex_wave.real = wave1
-            if wave2 is not None:
-                complex_wave.imag = wave2
-            return complex_wave
+            if np.iscomplexobj(wave1) or wave2 is None:
+                return [(wave1, False)]
+            return [(wave1, False), (wave2, False)]
 
         if np.iscomplexobj(wave1):
             marker = wave2 if wave2 is not None else marker
             wave2 = wave1.imag
             wave1 = wave1.real
+        parts = [(wave1, False)]
+        if wave2 is not None:
+            parts.append((wave2, False))
+        if marker is not None:
+            parts.append((marker, True))
+        return parts
+
+    @staticmethod
+    def _write_raw_vector(
+        raw_vector: np.ndarray,
+        parts: _RawParts,
+        *,
+        complex_output: bool,
+    ) -> None:
+        """Write the parts of a slot into its raw vector.
 
-        return convert_awg_waveform(
-            wave1,
-            wave2=wave2,
-            markers=marker if marker is not None else None,
-        )
+        Native AWG format: floating point waves are scaled to int16 and all
+        parts are interleaved as uint16 (see ``zhinst.utils.convert_awg_waveform``).
+
+        Args:
+            raw_vector: Target of the conversion.
+            parts: Parts of the raw vector (see ``_raw_parts``).
+            complex_output: Flag if the target is a complex waveform.
+        """
+        if complex_output:
+            targets = (
+                [raw_vector] if len(parts) == 1 else [raw_vector.real, raw_vector.imag]
+            )
+        else:
+            targets = [raw_vector[index :: len(parts)] for index in range(len(parts))]
+        for target, (part, is_marker) in zip(targets, parts, strict=True):
+            scale = (
+                not complex_output
+                and not is_marker
+                and np.issubdtype(part.dtype, np.floating)
+            )
+            for start, chunk in _chunks(part):
+                chunk_target = target[start : start + len(chunk)]
+                if scale:
+                    np.multiply(
+                        chunk,
+                        _UINT16_SCALE,
+                        out=chunk_target.view(np.int16),
+                        casting="unsafe",
+                    )
+                else:
+                    chunk_target[...] = chunk
 
     def _get_waveform_sequence(self, index: int) -> str:
         """Get sequencer code snippet for a single waveform.
@@ -342,10 +879,13 @@ class Waveforms(MutableMapping):
                 if not outputs[0] or not isinstance(outputs, t.Iterable)
                 else outputs[0]
             )
-        marker = None if marker is None else np.unpackbits(marker.astype(np.uint8))
+        marker_bits = 0
+        if marker is not None:
+            for _, chunk in _chunks(marker):
+                marker_bits |= int(np.bitwise_or.reduce(chunk.astype(np.uint8)))
 
         def marker_to_bool(i: int) -> str:
-            return "true" if np.any(marker[7 - i :: 8]) else "false"
+            return "true" if marker_bits & (1 << i) else "false"
 
         def to_wave_str(i: int) -> str:
             if marker is None:
@@ -417,12 +957,14 @@ class Waveforms(MutableMapping):
         Returns:
             Sequencer Code snippet.
         """
-        return "\n".join(
-            [
-                self._get_waveform_sequence(slot)
-                for slot in sorted(self._waveforms.keys())
-            ],
-        )
+        if self._sequence_snippet is None:
+            self._sequence_snippet = "\n".join(
+                [
+                    self._get_waveform_sequence(slot)
+                    for slot in sorted(self._waveforms.keys())
+                ],
+            )
+        return self._sequence_snippet
 
     def validate(
         self,
@@ -451,72 +993,31 @@ class Waveforms(MutableMapping):
                 dictionary.
             ValidationError: If the Validation fails.
         """
-        waveform_info = {}
-        try:
-            elf_info = ELFFile(BytesIO(meta_info))  # type: ignore[arg-type]
-            raw_data = elf_info.get_section_by_name(".waveforms").data().decode("utf-8")
-            waveform_info = json.loads(raw_data)["waveforms"]
-        except (TypeError, ELFError) as e:
-            if isinstance(meta_info, str):
-                waveform_info = json.loads(meta_info)["waveforms"]
-            elif isinstance(meta_info, dict):
-                waveform_info = meta_info.get("waveforms", meta_info)
-            else:
-                msg = (
-                    "meta_info needs to be an elf file or the waveform descriptor from "
-                    "the device (e.g. device.awgs[0].waveform.descriptor(). The passed "
-                    f"meta_info are of type {type(meta_info)} ({meta_info!s})."
-                )
-                raise TypeError(
-                    msg,
-                ) from e
-        defined_wave_lengths = {
-            index: wave["length"]
-            for index, wave in enumerate(waveform_info)
-            if wave["name"].startswith("__placeholder")
-            or wave["name"].startswith("__playWave")
-        }
-        for index, waves in self._waveforms.items():
-            if index >= len(waveform_info):
-                msg = (
-                    f"There are {len(waveform_info)} waveforms defined on the device "
-                    f"but the passed waveforms specified one with index {index}."
-                )
-                raise IndexError(
-                    msg,
-                )
-            try:
-                target_length = int(defined_wave_lengths[index])
-            except KeyError as e:
-                if "__filler" in waveform_info[index]["name"]:
-                    msg = (
-                        f"The waveform at index {index} is only "
-                        "a filler and can not be overwritten."
-                    )
-                    raise ValidationError(
-                        msg,
-                    ) from e
-                msg = (
-                    f"The waveform at index {index} is not a placeholder but of "
-                    f"type {waveform_info[index]['name'].lstrip('__')[:-4]}"
-                )
-                raise ValidationError(
-                    msg,
-                ) from e
-            wave_length = max(len(waves[0]), 1)
-            if wave_length != target_length:
-                # Waveforms can only be to short since the compiler always rounds
-                # up the length to next valid value.
-                msg = (
-                    f"Waveforms at index {index} are smaller than the target length "
-                    f"{wave_length} < {target_length}."
-                )
-                raise ValidationError(
-                    msg,
-                )
-        if not allow_missing and len(defined_wave_lengths) > len(self._waveforms):
+        table, names = parse_waveform_descriptors(meta_info)
+        slots = np.fromiter(self._waveforms.keys(), dtype=np.int64, count=len(self))
+        lengths = np.fromiter(
+            (max(len(waves[0]), 1) for waves in self._waveforms.values()),
+            dtype=np.int64,
+            count=len(self),
+        )
+        in_range = slots < len(table)
+        known = np.where(in_range, slots, 0)
+        placeholder = in_range & (table["kind"][known] == _KIND_PLACEHOLDER)
+        invalid = ~placeholder | (lengths != table["length"][known])
+        if invalid.any():
+            self._raise_validation_error(
+                int(np.argmax(invalid)),
+                slots,
+                lengths,
+                table,
+                names,
+            )
+        num_placeholders = np.count_nonzero(table["kind"] == _KIND_PLACEHOLDER)
+        if not allow_missing and num_placeholders > len(self._waveforms):
             missing_indexes = [
-                i for i in defined_wave_lengths if i not in self._waveforms
+                int(i)
+                for i in np.flatnonzero(table["kind"] == _KIND_PLACEHOLDER)
+                if i not in self._waveforms
             ]
             msg = (
                 "The the sequencer code defines placeholder waveforms for the "
@@ -525,3 +1026,350 @@ class Waveforms(MutableMapping):
             raise ValidationError(
                 msg,
             )
+
+    @staticmethod
+    def _raise_validation_error(
+        position: int,
+        slots: np.ndarray,
+        lengths: np.ndarray,
+        table: np.ndarray,
+        names: tuple[str, ...],
+    ) -> t.NoReturn:
+        """Raise the error for the first slot that failed the validation.
+
+        Args:
+            position: Position of the failed slot.
+            slots: Validated slots.
+            lengths: Length of the waveform of every slot.
+            table: Parsed waveform descriptors.
+            names: Names of the waveforms in the descriptors.
+
+        Raises:
+            IndexError: If the slot is not defined on the device.
+            ValidationError: If the slot is not a placeholder or the length
+                does not match.
+        """
+        index = int(slots[position])
+        if index >= len(table):
+            msg = (
+                f"There are {len(table)} waveforms defined on the device "
+                f"but the passed waveforms specified one with index {index}."
+            )
+            raise IndexError(
+                msg,
+            )
+        if table["kind"][index] == _KIND_FILLER:
+            msg = (
+                f"The waveform at index {index} is only "
+                "a filler and can not be overwritten."
+            )
+            raise ValidationError(
+                msg,
+            )
+        if table["kind"][index] != _KIND_PLACEHOLDER:
+            msg = (
+                f"The waveform at index {index} is not a placeholder but of "
+                f"type {names[index].lstrip('__')[:-4]}"
+            )
+            raise ValidationError(
+                msg,
+            )
+        # Waveforms can only be to short since the compiler always rounds
+        # up the length to next valid value.
+        msg = (
+            f"Waveforms at index {index} are smaller than the target length "
+            f"{lengths[position]} < {table['length'][index]}."
+        )
+        raise ValidationError(
+            msg,
+        )
+
+
+_ArenaEntry = namedtuple(
+    "_ArenaEntry",
+    ["offset", "nbytes", "shape", "dtype", "name", "output"],
+)
+
+
+class _WaveArena(MutableMapping):
+    """Storage of the waves of all slots in a single contiguous buffer.
+
+    Every wave is copied into the arena (a byte buffer) and indexed by its
+    offset, shape, data type and ``Wave`` metadata. Accessing a slot returns
+    ``Wave`` views into the arena. Reassigning a slot with waves of the same
+    size reuses its memory, otherwise the waves are appended. The arena grows
+    geometrically if it is full.
+
+    Args:
+        capacity: Initial size of the arena in bytes.
+        filename: File backing the arena (``np.memmap``). The arena is kept
+            in memory if not specified.
+    """
+
+    _ALIGNMENT = 64
+
+    def __init__(self, capacity: int, filename: t.Optional[t.Union[str, Path]]):
+        self._filename = Path(filename) if filename is not None else None
+        self._index: dict[int, tuple[t.Optional[_ArenaEntry], ...]] = {}
+        self._used = 0
+        self._buffer = self._allocate(max(int(capacity), self._ALIGNMENT))
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        """Allocate an arena that contains the used part of the current one."""
+        if self._filename is None:
+            buffer = np.empty(capacity, dtype=np.uint8)
+            if self._used:
+                buffer[: self._used] = self._buffer[: self._used]
+            return buffer
+        if self._used:
+            self._buffer.flush()
+        with self._filename.open("r+b" if self._used else "w+b") as file:
+            file.truncate(capacity)
+        # Existing views keep the previous mapping alive
+        return np.memmap(self._filename, dtype=np.uint8, mode="r+", shape=capacity)
+
+    def _reserve(self, nbytes: int) -> int:
+        """Reserve memory at the end of the arena.
+
+        Args:
+            nbytes: Number of bytes.
+
+        Returns:
+            Offset of the reserved memory.
+        """
+        offset = -(-self._used // self._ALIGNMENT) * self._ALIGNMENT
+        if offset + nbytes > self._buffer.size:
+            self._buffer = self._allocate(max(2 * self._buffer.size, offset + nbytes))
+        self._used = offset + nbytes
+        return offset
+
+    def _view(self, entry: t.Optional[_ArenaEntry]) -> t.Optional[Wave]:
+        if entry is None:
+            return None
+        array = self._buffer[entry.offset : entry.offset + entry.nbytes]
+        return Wave(
+            array.view(entry.dtype).reshape(entry.shape),
+            name=entry.name,
+            output=entry.output,
+        )
+
+    def __getitem__(self, slot: int) -> tuple:
+        return tuple(self._view(entry) for entry in self._index[slot])
+
+    def __setitem__(self, slot: int, value: t.Sequence[t.Any]):
+        previous = self._index.get(slot)
+        sizes = [wave.nbytes if wave is not None else 0 for wave in value]
+        # Waves that are views into the arena (e.g. swapped waves of a slot)
+        # would be overwritten while they are copied
+        reuse = (
+            previous is not None
+            and sizes
+            == [entry.nbytes if entry is not None else 0 for entry in previous]
+            and not any(
+                isinstance(wave, np.ndarray) and np.shares_memory(wave, self._buffer)
+                for wave in value
+            )
+        )
+        entries: list[t.Optional[_ArenaEntry]] = []
+        for position, wave in enumerate(value):
+            if wave is None:
+                entries.append(None)
+                continue
+            offset = (
+                previous[position].offset  # type: ignore[index, union-attr]
+                if reuse
+                else self._reserve(wave.nbytes)
+            )
+            # Lazy waves are copied chunk by chunk
+            for start, chunk in _chunks(wave):
+                chunk_bytes = np.ascontiguousarray(chunk).reshape(-1).view(np.uint8)
+                begin = offset + start * wave.dtype.itemsize
+                self._buffer[begin : begin + chunk_bytes.size] = chunk_bytes
+            entries.append(
+                _ArenaEntry(
+                    offset=offset,
+                    nbytes=wave.nbytes,
+                    shape=wave.shape,
+                    dtype=wave.dtype,
+                    name=getattr(wave, "name", None),
+                    output=getattr(wave, "output", None),
+                ),
+            )
+        self._index[slot] = tuple(entries)
+
+    def __delitem__(self, slot: int):
+        del self._index[slot]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """Used part of the arena."""
+        return self._buffer[: self._used]
+
+    @property
+    def capacity(self) -> int:
+        """Size of the arena in bytes."""
+        return int(self._buffer.size)
+
+    def flush(self) -> None:
+        """Write the arena to its backing file (if any)."""
+        if isinstance(self._buffer, np.memmap):
+            self._buffer.flush()
+
+
+class ArenaWaveforms(Waveforms):
+    """Waveform dictionary that stores all waves in one contiguous buffer.
+
+    Behaves like ``Waveforms`` but copies the waves and markers of all slots
+    into a single growing buffer (arena) instead of keeping one array per
+    wave. Building a library of thousands of pulses therefore does not
+    fragment the memory. Accessing a slot returns ``Wave`` views into the
+    arena.
+
+    The arena can be backed by a file (``np.memmap``), which allows building
+    and uploading waveform libraries that do not fit into memory. Only the
+    pages in use are held in memory by the operating system.
+
+    The raw vectors of an ``ArenaWaveforms`` are not cached. The uploads to
+    AWG cores, SHFQA generators and readout integration weights convert them
+    in batches of bounded size (see ``iter_raw_vectors``).
+
+    Memory of reassigned slots is reused if the new waves have the same size
+    and are not views into the arena, otherwise the waves are appended to the
+    arena. Views of a slot obtained before it is reassigned therefore may show
+    the new waves. Deleted slots are not reclaimed.
+
+    Args:
+        capacity: Initial size of the arena in bytes. The arena grows
+            automatically. (default = 1 MiB)
+        filename: File backing the arena. The file is created or overwritten.
+            (default = None)
+
+    Example:
+        >>> waveforms = ArenaWaveforms(filename="pulses.bin")
+        >>> for slot, amplitude in enumerate(np.linspace(0, 1, 10000)):
+        ...     waveforms[slot] = amplitude * gaussian
+        >>> device.awgs[0].write_to_waveform_memory(waveforms)
+    """
+
+    _CACHE_RAW_VECTORS = False
+
+    def __init__(
+        self,
+        *,
+        capacity: int = 1024**2,
+        filename: t.Optional[t.Union[str, Path]] = None,
+    ):
+        super().__init__()
+        self._arena = _WaveArena(capacity, filename)
+        self._waveforms = self._arena
+
+    @property
+    def arena(self) -> np.ndarray:
+        """Used part of the arena as bytes."""
+        return self._arena.buffer
+
+    @property
+    def capacity(self) -> int:
+        """Current size of the arena in bytes."""
+        return self._arena.capacity
+
+    def flush(self) -> None:
+        """Write the arena to its backing file (if any)."""
+        self._arena.flush()
+
+
+class SlotDigests:
+    """Digests of the vectors last uploaded to the slots of a waveform memory.
+
+    Allows to skip the upload of slots whose content did not change since
+    the last upload. Only uploads that go through the toolkit are tracked,
+    the digests therefore need to be cleared whenever the waveform memory is
+    changed otherwise (e.g. by clearing it or loading a new sequencer
+    program).
+
+    The digests of the selected slots are only remembered with ``update``,
+    which should be called once the vectors have actually been set (e.g.
+    as commit callback of the transaction).
+    """
+
+    def __init__(self):
+        self._digests: dict[t.Any, bytes] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(vector: np.ndarray) -> bytes:
+        """Digest of the content, data type and shape of a vector.
+
+        Args:
+            vector: Raw vector of a slot.
+
+        Returns:
+            Digest of the vector.
+        """
+        vector = np.ascontiguousarray(vector)
+        digest = hashlib.blake2b(f"{vector.dtype.str}{vector.shape}".encode())
+        digest.update(vector.data)
+        return digest.digest()
+
+    def select(
+        self,
+        vectors: t.Mapping[t.Any, np.ndarray],
+        *,
+        skip_unchanged: bool,
+    ) -> tuple[dict[t.Any, np.ndarray], UploadStats, dict[t.Any, bytes]]:
+        """Select the slots that need to be uploaded.
+
+        Args:
+            vectors: Raw vector per slot.
+            skip_unchanged: Flag if slots with the same content as their last
+                upload are skipped.
+
+        Returns:
+            Raw vectors that need to be uploaded, the upload statistics and
+            the digests of the uploaded vectors (see ``update``).
+        """
+        changed = {}
+        digests = {}
+        skipped = 0
+        bytes_skipped = 0
+        with self._lock:
+            for slot, vector in vectors.items():
+                digest = self.digest(vector)
+                if skip_unchanged and self._digests.get(slot) == digest:
+                    skipped += 1
+                    bytes_skipped += np.asarray(vector).nbytes
+                    continue
+                digests[slot] = digest
+                changed[slot] = vector
+        return (
+            changed,
+            UploadStats(
+                uploaded=len(changed),
+                skipped=skipped,
+                bytes_uploaded=sum(
+                    np.asarray(vector).nbytes for vector in changed.values()
+                ),
+                bytes_skipped=bytes_skipped,
+            ),
+            digests,
+        )
+
+    def update(self, digests: t.Mapping[t.Any, bytes]) -> None:
+        """Remember the digests of uploaded slots.
+
+        Args:
+            digests: Digest per slot (see ``select``).
+        """
+        with self._lock:
+            self._digests.update(digests)
+
+    def clear(self) -> None:
+        """Forget the digests of all slots."""
+        with self._lock:
+            self._digests.clear()
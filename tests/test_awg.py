@@ -7,6 +7,7 @@ import pytest
 import zhinst.utils as zi_utils
 from zhinst.core import compile_seqc
 
+from zhinst.toolkit import ArenaWaveforms, CompilerCache
 from zhinst.toolkit.driver.nodes.awg import CommandTableNode, Waveforms
 
 
@@ -111,7 +112,57 @@ def test_load_sequencer_program(mock_connection, shfsg):
     mock_connection.return_value.set.side_effect = RuntimeError()
     mock_connection.return_value.setVector.side_effect = RuntimeError()
     with pytest.raises(RuntimeError):
-        shfsg.sgchannels[0].awg.load_sequencer_program("setTrigger(1);")
+        shfsg.sgchannels[0].awg.load_sequencer_program("setTrigger(1);", force=True)
+
+
+def test_load_sequencer_program_unchanged(mock_connection, shfsg):
+    awg = shfsg.sgchannels[0].awg
+    elf, info_original = compile_seqc("setTrigger(1);", "SHFSG8", [], 0)
+    assert awg.load_sequencer_program("setTrigger(1);") == info_original
+    # same program and same ELF are not uploaded again
+    assert awg.load_sequencer_program("setTrigger(1);", verify=False) == info_original
+    assert (
+        awg.load_sequencer_program("setTrigger(1);", output="output", verify=False)
+        == info_original
+    )
+    mock_connection.return_value.set.assert_called_once()
+    awg.load_sequencer_program("setTrigger(1);", force=True)
+    assert mock_connection.return_value.set.call_count == 2
+    awg.load_sequencer_program("setTrigger(0);", verify=False)
+    assert mock_connection.return_value.set.call_count == 3
+    # the mocked device state does not match the loaded program
+    awg.load_sequencer_program("setTrigger(0);")
+    assert mock_connection.return_value.set.call_count == 4
+
+    # verify against the state of the device
+    awg.load_sequencer_program("setTrigger(1);")
+    state = {"ready": 1, "length": len(elf), "checksum": 42}
+
+    def get_side_effect(nodes, **kwargs):
+        return {
+            node: {"timestamp": [0], "value": [state[node.rsplit("/", 1)[-1]]]}
+            for node in nodes.split(",")
+        }
+
+    mock_connection.return_value.get.side_effect = get_side_effect
+    mock_connection.return_value.set.reset_mock()
+    awg.load_sequencer_program("setTrigger(1);", verify=True)
+    awg.load_sequencer_program("setTrigger(1);", verify=True)
+    mock_connection.return_value.set.assert_not_called()
+    state["checksum"] = 43
+    awg.load_sequencer_program("setTrigger(1);", verify=True)
+    mock_connection.return_value.set.assert_called_once()
+    state["ready"] = 0
+    awg.load_sequencer_program("setTrigger(1);", verify=True)
+    assert mock_connection.return_value.set.call_count == 2
+
+    # upload errors are not remembered
+    mock_connection.return_value.set.side_effect = RuntimeError()
+    mock_connection.return_value.setVector.side_effect = RuntimeError()
+    with pytest.raises(RuntimeError):
+        awg.load_sequencer_program("setTrigger(0);")
+    with pytest.raises(RuntimeError):
+        awg.load_sequencer_program("setTrigger(0);")
 
 
 def test_load_sequencer_program_qc(mock_connection, shfqc):
@@ -190,6 +241,80 @@ def test_write_to_waveform_memory(waveform_descriptors_json, mock_connection, sh
     assert len(mock_connection.return_value.set.call_args[0][0]) == 3
 
 
+def test_write_to_waveform_memory_batches(mock_connection, shfsg, monkeypatch):
+    monkeypatch.setattr(
+        "zhinst.toolkit.driver.nodes.awg._UPLOAD_BATCH_BYTES",
+        2 * 1008 * 2 * 2,
+    )
+    waveforms = ArenaWaveforms()
+    for slot in range(5):
+        waveforms[slot] = (np.ones(1008) * slot / 5, -np.ones(1008))
+    stats = shfsg.sgchannels[0].awg.write_to_waveform_memory(waveforms)
+    assert stats.uploaded == 5
+    assert stats.bytes_uploaded == 5 * 1008 * 2 * 2
+    batches = [call[0][0] for call in mock_connection.return_value.set.call_args_list]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    for slot, (path, vector) in enumerate(item for batch in batches for item in batch):
+        assert path == f"/dev1234/sgchannels/0/awg/waveform/waves/{slot}"
+        np.testing.assert_array_equal(vector, waveforms.get_raw_vector(slot))
+    # raw vectors of an arena are not kept in memory
+    assert not waveforms._raw_vectors
+
+
+def test_write_to_waveform_memory_skip_unchanged(mock_connection, shfsg):
+    awg = shfsg.sgchannels[0].awg
+    waveforms = Waveforms()
+    for slot in range(4):
+        waveforms[slot] = (np.ones(1008) * slot, -np.ones(1008))
+    stats = awg.write_to_waveform_memory(waveforms, skip_unchanged=True)
+    assert stats.uploaded == 4
+    assert stats.skipped == 0
+    assert len(mock_connection.return_value.set.call_args[0][0]) == 4
+
+    waveforms[2] = (np.ones(1008) * 0.5, -np.ones(1008))
+    stats = awg.write_to_waveform_memory(waveforms, skip_unchanged=True)
+    assert stats.uploaded == 1
+    assert stats.skipped == 3
+    assert stats.bytes_skipped == 3 * waveforms.get_raw_vector(0).nbytes
+    [(path, vector)] = mock_connection.return_value.set.call_args[0][0]
+    assert path == "/dev1234/sgchannels/0/awg/waveform/waves/2"
+    np.testing.assert_array_equal(vector, waveforms.get_raw_vector(2))
+
+    # full upload without skip_unchanged
+    stats = awg.write_to_waveform_memory(waveforms)
+    assert stats.uploaded == 4
+    assert len(mock_connection.return_value.set.call_args[0][0]) == 4
+
+    # loading a new sequencer program resets the waveform memory
+    mock_connection.return_value.set.reset_mock()
+    awg.load_sequencer_program("setTrigger(1);")
+    assert awg.write_to_waveform_memory(waveforms, skip_unchanged=True).uploaded == 4
+
+    # failed uploads are not remembered
+    mock_connection.return_value.set.side_effect = RuntimeError()
+    with pytest.raises(RuntimeError):
+        awg.write_to_waveform_memory(waveforms, skip_unchanged=True)
+    mock_connection.return_value.set.side_effect = None
+    assert awg.write_to_waveform_memory(waveforms, skip_unchanged=True).uploaded == 4
+
+
+def test_write_to_waveform_memory_aborted_transaction(mock_connection, shfsg, session):
+    awg = shfsg.sgchannels[0].awg
+    waveforms = Waveforms()
+    for slot in range(2):
+        waveforms[slot] = (np.ones(1008) * slot, -np.ones(1008))
+    with pytest.raises(RuntimeError), shfsg.set_transaction():
+        awg.write_to_waveform_memory(waveforms, skip_unchanged=True)
+        raise RuntimeError
+    mock_connection.return_value.set.assert_not_called()
+    # nothing was sent, so nothing is skipped
+    with session.set_transaction():
+        stats = awg.write_to_waveform_memory(waveforms, skip_unchanged=True)
+    assert stats.uploaded == 2
+    stats = awg.write_to_waveform_memory(waveforms, skip_unchanged=True)
+    assert stats.skipped == 2
+
+
 def test_read_from_waveform_memory(waveform_descriptors_json, mock_connection, shfsg):
     waveform_descriptiors = json.loads(waveform_descriptors_json)
 
@@ -390,3 +515,83 @@ def test_read_from_waveform_memory_large_index(data_dir, mock_connection, shfsg)
     assert all(waveforms[11][0] == np.ones(1008))
     assert all(waveforms[11][1] == -np.ones(1008))
     assert all(waveforms[11][2] == np.ones(1008))
+
+
+def test_load_sequencer_program_cache(mock_connection, shfsg, tmp_path):
+    awg = shfsg.sgchannels[0].awg
+    assert awg.compiler_cache is None
+    cache = CompilerCache(tmp_path)
+    CompilerCache.set_default(cache)
+    try:
+        assert awg.compiler_cache is cache
+        elf, info_original = compile_seqc("setTrigger(1);", "SHFSG8", [], 0)
+        assert awg.load_sequencer_program("setTrigger(1);") == info_original
+        assert awg.load_sequencer_program("setTrigger(1);", force=True) == info_original
+        assert mock_connection.return_value.set.call_args[0][1] == elf
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+    finally:
+        CompilerCache.set_default(None)
+
+    own_cache = CompilerCache(tmp_path / "own")
+    awg.compiler_cache = own_cache
+    awg.compile_sequencer_program("setTrigger(1);")
+    assert own_cache.stats.misses == 1
+    awg.compiler_cache = None
+    assert awg.compiler_cache is None
+
+
+def test_read_from_waveform_memory_parallel(mock_connection, shfsg, monkeypatch):
+    monkeypatch.setattr(
+        "zhinst.toolkit.driver.nodes.awg._READBACK_BYTES_PER_REQUEST",
+        1000,
+    )
+    descriptors = {
+        "waveforms": [
+            {
+                "name": f"wave{slot}",
+                "channels": "2" if slot % 2 else "1",
+                "marker_bits": "1;0" if slot % 3 else "0;0",
+                "length": str(100 * (slot + 1)),
+                "play_config": "0" if slot == 4 else "5218051",
+            }
+            for slot in range(6)
+        ],
+    }
+    expected = {
+        slot: zi_utils.convert_awg_waveform(
+            np.linspace(-1, 1, 100 * (slot + 1)),
+            np.full(100 * (slot + 1), 0.5) if slot % 2 else None,
+            np.ones(100 * (slot + 1)) if slot % 3 else None,
+        )
+        for slot in range(6)
+    }
+    requests = []
+
+    def get_side_effect(nodes, **kwargs):
+        if nodes.endswith("descriptors"):
+            return {nodes: [{"timestamp": 0, "vector": json.dumps(descriptors)}]}
+        requests.append(nodes)
+        return {
+            node: [{"vector": expected[int(node.rsplit("/", 1)[-1])]}]
+            for node in nodes.split(",")
+        }
+
+    mock_connection.return_value.get.side_effect = get_side_effect
+    waveforms = shfsg.sgchannels[0].awg.read_from_waveform_memory()
+    assert len(requests) == 4
+    assert sorted(",".join(requests).split(",")) == [
+        f"/dev1234/sgchannels/0/awg/waveform/waves/{slot}" for slot in (0, 1, 2, 3, 5)
+    ]
+    assert sorted(waveforms.keys()) == [0, 1, 2, 3, 5]
+    for slot in waveforms:
+        np.testing.assert_array_equal(
+            waveforms.get_raw_vector(slot),
+            expected[slot],
+        )
+    assert waveforms[0][0].base is waveforms[5][0].base
+
+    requests.clear()
+    waveforms = shfsg.sgchannels[0].awg.read_from_waveform_memory([3])
+    assert requests == ["/dev1234/sgchannels/0/awg/waveform/waves/3"]
+    assert list(waveforms.keys()) == [3]
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError
 from pathlib import Path
 
 import numpy as np
@@ -112,3 +116,86 @@ def test_set_path(base_module, mock_connection):
     module_mock.set.assert_called_with("/directory", str(Path("test").resolve()))
     base_module.directory("test")
     module_mock.set.assert_called_with("/directory", "test")
+
+
+def test_read(base_module, mock_connection):
+    module_mock = mock_connection.return_value.awgModule.return_value
+    module_mock.read.return_value = {
+        "/dev1234/scopes/0/wave": [
+            {"timestamp": 120, "wave": np.ones((2, 4)), "header": {}},
+            {"timestamp": 240, "wave": np.zeros((2, 4)), "header": {}},
+        ],
+        "/test": {"timestamp": np.array([1]), "value": np.array([3])},
+    }
+    result = base_module.read()
+    module_mock.read.assert_called_with(flat=True)
+    assert isinstance(result["/dev1234/scopes/0/wave"], list)
+
+    mock_connection.return_value.getDouble.return_value = 60.0
+    result = base_module.read(structured=True)
+    mock_connection.return_value.getDouble.assert_called_once_with(
+        "/dev1234/clockbase",
+    )
+    wave = result["/dev1234/scopes/0/wave"]
+    assert wave.dtype.names == ("timestamp", "time", "wave")
+    np.testing.assert_array_equal(wave["time"], [2.0, 4.0])
+    assert wave["wave"].shape == (2, 2, 4)
+    assert result[base_module.test].dtype.names == ("timestamp", "value")
+
+
+def test_wait_done_adaptive(base_module, mock_connection):
+    module_mock = mock_connection.return_value.awgModule.return_value
+    module_mock.finished.side_effect = [0, 0, 0, 1]
+    module_mock.progress.side_effect = [[0.1], [0.5], [0.5], [1]]
+    progress = []
+    start = time.monotonic()
+    base_module.wait_done(sleep_time=10, progress_callback=progress.append)
+    # 10 ms + 20 ms + 40 ms instead of 3 x 10 s
+    assert time.monotonic() - start < 1
+    assert progress == [0.1, 0.5, 1]
+    assert module_mock.finished.call_count == 4
+    assert module_mock.progress.call_count == 4
+
+
+def test_wait_done_cancel(base_module, mock_connection):
+    module_mock = mock_connection.return_value.awgModule.return_value
+    module_mock.finished.return_value = 0
+    module_mock.progress.return_value = np.array([0.1])
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(CancelledError):
+        base_module.wait_done(cancel=cancel)
+
+
+def test_wait_done_future(base_module, mock_connection):
+    module_mock = mock_connection.return_value.awgModule.return_value
+    module_mock.finished.return_value = 1
+    module_mock.progress.return_value = np.array([1])
+    assert base_module.wait_done_future().result(timeout=1) is None
+
+    module_mock.finished.return_value = 0
+    module_mock.progress.return_value = np.array([0.1])
+    with pytest.raises(TimeoutError):
+        base_module.wait_done_future(timeout=0.01).result(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_wait_done_async(base_module, mock_connection):
+    module_mock = mock_connection.return_value.awgModule.return_value
+    module_mock.finished.return_value = 1
+    module_mock.progress.return_value = np.array([1])
+    await base_module.wait_done_async()
+
+    module_mock.finished.return_value = 0
+    module_mock.progress.return_value = np.array([0.1])
+    with pytest.raises(TimeoutError):
+        await base_module.wait_done_async(timeout=0.01)
+
+    # canceling the task stops the waiting thread
+    cancel = threading.Event()
+    task = asyncio.ensure_future(base_module.wait_done_async(cancel=cancel))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cancel.is_set()
@@ -0,0 +1,73 @@
+import json
+import os
+
+import pytest
+from zhinst.core import compile_seqc
+
+from zhinst.toolkit import CompilerCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CompilerCache(tmp_path / "cache")
+
+
+def test_key():
+    key = CompilerCache.key("setTrigger(1);", "HDAWG8", "MF\nCNT", 0, samplerate=2.4e9)
+    assert key == CompilerCache.key(
+        "setTrigger(1);",
+        "hdawg8",
+        ["CNT", "MF"],
+        0,
+        samplerate=2.4e9,
+    )
+    assert key != CompilerCache.key("setTrigger(0);", "HDAWG8", "MF\nCNT", 0)
+    assert key != CompilerCache.key("setTrigger(1);", "HDAWG8", "MF\nCNT", 1)
+    assert key != CompilerCache.key(
+        "setTrigger(1);",
+        "HDAWG8",
+        "MF\nCNT",
+        0,
+        samplerate=1.2e9,
+    )
+
+
+def test_compile(cache):
+    assert repr(cache).startswith("CompilerCache(")
+    elf, info = compile_seqc("setTrigger(1);", "SHFSG8", [], 0)
+    assert cache.compile("setTrigger(1);", "SHFSG8", [], 0) == (elf, info)
+    assert cache.compile("setTrigger(1);", "SHFSG8", [], 0) == (elf, info)
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.size == len(elf) + len(json.dumps(info))
+
+    with pytest.raises(RuntimeError):
+        cache.compile("Hello", "SHFSG8", [], 0)
+    assert cache.stats.entries == 1
+
+    cache.clear()
+    assert cache.stats == (0, 0, 0, 0)
+
+
+def test_corrupt_entry(cache):
+    cache.compile("setTrigger(1);", "SHFSG8", [], 0)
+    key = CompilerCache.key("setTrigger(1);", "SHFSG8", [], 0)
+    (cache.directory / f"{key}.json").write_text("{")
+    assert cache.get(key) is None
+    cache.compile("setTrigger(1);", "SHFSG8", [], 0)
+    assert cache.get(key) is not None
+
+
+def test_eviction(cache):
+    keys = [f"{index:064x}" for index in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, b"0" * 100, {})
+        os.utime(cache.directory / f"{key}.elf", (age, age))
+    assert cache.stats.entries == 3
+    # reading an entry marks it as recently used
+    cache.get(keys[0])
+    cache.max_size = 210
+    assert cache.stats.entries == 2
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
@@ -12,6 +12,7 @@ def daq_module(data_dir, mock_connection, session):
     mock_connection.return_value.dataAcquisitionModule.return_value.listNodesJSON.return_value = (
         nodes_json
     )
+    mock_connection.return_value.getDouble.return_value = 60e6
     return DAQModule(mock_connection.return_value.dataAcquisitionModule(), session)
 
 
@@ -192,3 +193,163 @@ def test_trigger(daq_module, mock_connection):
     module_mock = mock_connection.return_value.dataAcquisitionModule.return_value
     daq_module.trigger()
     module_mock.trigger.assert_called_with()
+
+
+def test_read_new_only(daq_module, mock_connection):
+    module_mock = mock_connection.return_value.dataAcquisitionModule.return_value
+
+    def burst(start):
+        return {
+            "header": {},
+            "timestamp": np.array([np.arange(start, start + 5)]),
+            "value": np.array([np.arange(start, start + 5)]),
+        }
+
+    node = "/dev1234/demods/0/sample.x.avg"
+    module_mock.read.return_value = {"/device": ["1234"], node: [burst(1)]}
+    result = daq_module.read(new_only=True)
+    assert len(result[node]) == 1
+    assert result["/device"] == ["1234"]
+
+    module_mock.read.return_value = {node: [burst(1), burst(6), burst(11)]}
+    result = daq_module.read(new_only=True)
+    assert [data.value[0][0] for data in result[node]] == [6, 11]
+    assert daq_module.read(new_only=True)[node] == []
+    # a full read is not affected
+    assert len(daq_module.read()[node]) == 3
+
+    # older bursts dropped from the module history
+    module_mock.read.return_value = {node: [burst(11), burst(16)]}
+    result = daq_module.read(new_only=True, raw=True)
+    assert [data["value"][0][0] for data in result[node]] == [16]
+
+    # bursts without timestamps are tracked by their count
+    module_mock.read.return_value = {"/test": [{"value": 1}, {"value": 2}]}
+    assert daq_module.read(new_only=True, raw=True)["/test"] == [
+        {"value": 1},
+        {"value": 2},
+    ]
+    module_mock.read.return_value = {
+        "/test": [{"value": 1}, {"value": 2}, {"value": 3}]
+    }
+    assert daq_module.read(new_only=True, raw=True)["/test"] == [{"value": 3}]
+
+    daq_module.execute()
+    assert len(daq_module.read(new_only=True, raw=True)["/test"]) == 3
+
+
+def test_iter_bursts(daq_module, mock_connection):
+    module_mock = mock_connection.return_value.dataAcquisitionModule.return_value
+    node = "/dev1234/demods/0/sample.x.avg"
+    reads = iter(
+        [
+            {"/device": ["1234"], node: []},
+            {node: [{"timestamp": np.array([[1, 2]]), "value": np.ones((1, 2))}]},
+            {
+                node: [
+                    {"timestamp": np.array([[1, 2]]), "value": np.ones((1, 2))},
+                    {"timestamp": np.array([[3, 4]]), "value": np.ones((1, 2))},
+                ],
+            },
+        ],
+    )
+    module_mock.read.side_effect = lambda flat: next(reads)
+    module_mock.finished.side_effect = [False, False, True]
+    bursts = list(daq_module.iter_bursts(sleep_time=0))
+    assert [node_name for node_name, _ in bursts] == [node, node]
+    assert (bursts[1][1].time == np.array([[0, 1]]) / 60e6).all()
+
+    module_mock.read.side_effect = None
+    module_mock.read.return_value = {}
+    module_mock.finished.side_effect = None
+    module_mock.finished.return_value = False
+    with pytest.raises(TimeoutError):
+        list(daq_module.iter_bursts(timeout=0.01, sleep_time=0.001))
+
+
+def test_read_stacked(daq_module, mock_connection):
+    module_mock = mock_connection.return_value.dataAcquisitionModule.return_value
+    module_mock.read.return_value = {
+        "/device": ["1234"],
+        "/dev1234/demods/0/sample.x.avg": [
+            {
+                "header": {"systemtime": np.array([index])},
+                "timestamp": np.array([np.arange(5) + 10 * index]),
+                "value": np.full((1, 5), index),
+            }
+            for index in range(4)
+        ],
+        "/dev1234/demods/1/sample.xiy.fft": [
+            {
+                "header": {"gridcoldelta": np.array([0.00059733])},
+                "timestamp": np.array([[1, 2, 3, 4, 5]]),
+                "value": np.array([[9, 9, 9, 9, 9]]),
+            },
+        ],
+    }
+    result = daq_module.read(stacked=True)
+    assert result["/device"] == ["1234"]
+    stacked = result["/dev1234/demods/0/sample.x.avg"]
+    assert stacked.shape == (4, 1, 5)
+    assert stacked.value.shape == (4, 1, 5)
+    np.testing.assert_array_equal(stacked.value[:, 0, 0], [0, 1, 2, 3])
+    np.testing.assert_array_equal(stacked.timestamp, [0, 10, 20, 30])
+    np.testing.assert_array_equal(stacked.time, np.arange(5) / 60e6)
+    assert stacked.frequency is None
+    assert [header["systemtime"][0] for header in stacked.header] == [0, 1, 2, 3]
+
+    fft = result["/dev1234/demods/1/sample.xiy.fft"]
+    assert fft.time is None
+    np.testing.assert_allclose(
+        fft.frequency,
+        daq_module.read()["/dev1234/demods/1/sample.xiy.fft"][0].frequency,
+    )
+
+    module_mock.read.return_value["/dev1234/demods/0/sample.x.avg"][1]["value"] = (
+        np.ones((1, 4))
+    )
+    with pytest.raises(ValueError):
+        daq_module.read(stacked=True)
+
+
+def test_read_clockbase(daq_module, mock_connection, session):
+    module_mock = mock_connection.return_value.dataAcquisitionModule.return_value
+    module_mock.read.return_value = {
+        "/dev1234/demods/0/sample.x.avg": [
+            {"timestamp": np.array([[10, 12]]), "value": np.ones((1, 2))},
+        ],
+        "/dev5678/demods/0/sample.x.avg": [
+            {"timestamp": np.array([[10, 12]]), "value": np.ones((1, 2))},
+        ],
+    }
+
+    def get_double(path):
+        if path == "/dev1234/clockbase":
+            return 2.0
+        raise RuntimeError("ZIAPINotFoundException")
+
+    mock_connection.return_value.getDouble.side_effect = get_double
+    for _ in range(2):
+        result = daq_module.read()
+        np.testing.assert_array_equal(
+            result["/dev1234/demods/0/sample.x.avg"][0].time,
+            [0.0, 1.0],
+        )
+        np.testing.assert_array_equal(
+            result["/dev5678/demods/0/sample.x.avg"][0].time,
+            [0.0, 2 / 60e6],
+        )
+    # the clockbase is cached by the session
+    assert session.clockbase("dev1234") == 2.0
+    assert (
+        mock_connection.return_value.getDouble.call_args_list.count(
+            (("/dev1234/clockbase",),),
+        )
+        == 1
+    )
+
+    result = daq_module.read(clk_rate=1.0)
+    np.testing.assert_array_equal(
+        result["/dev1234/demods/0/sample.x.avg"][0].time,
+        [0.0, 2.0],
+    )
@@ -1,10 +1,12 @@
 import json
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
+from zhinst.core import compile_seqc
 
 import zhinst.toolkit.driver.modules as tk_modules
-from zhinst.toolkit import Session
+from zhinst.toolkit import CompilerCache, Session
 from zhinst.toolkit.nodetree import Node
 
 
@@ -351,8 +353,21 @@ def test_poll(mock_connection, session):
     mock_connection.return_value.poll.assert_called_with(0.1, 500, flags=0, flat=True)
     assert not result
 
-    # with result
-    # TODO
+    # structured result
+    mock_connection.return_value.poll.return_value = {
+        "/dev1234/demods/0/sample": {
+            "timestamp": np.array([60, 120], dtype=np.uint64),
+            "x": np.array([0.1, 0.2]),
+            "y": np.array([0.3, 0.4]),
+        },
+    }
+    mock_connection.return_value.getDouble.return_value = 60.0
+    result = session.poll(structured=True)
+    mock_connection.return_value.getDouble.assert_called_with("/dev1234/clockbase")
+    sample = result["/dev1234/demods/0/sample"]
+    assert sample.dtype.names == ("timestamp", "time", "x", "y")
+    np.testing.assert_array_equal(sample["time"], [1.0, 2.0])
+    np.testing.assert_array_equal(sample["y"], [0.3, 0.4])
 
 
 def test_modules_repr(session):
@@ -441,6 +456,48 @@ def test_device_settings_module(data_dir, mock_connection, session):
     assert isinstance(device_settings_module.device, Node)
 
 
+def test_module_pool(data_dir, mock_connection, session):
+    json_path = data_dir / "nodedoc_device_settings_test.json"
+    with json_path.open("r", encoding="UTF-8") as file:
+        nodes_json = file.read()
+    raw_module = mock_connection.return_value.deviceSettings.return_value
+    raw_module.listNodesJSON.return_value = nodes_json
+    raw_module.get.return_value = {
+        "/command": {"timestamp": [0], "value": ["save"]},
+        "/filename": {"timestamp": [0], "value": ["settings"]},
+        "/finished": {"timestamp": [0], "value": [0]},
+    }
+
+    with session.modules.pooled("device_settings") as module:
+        assert isinstance(module, tk_modules.DeviceSettingsModule)
+        raw_module.get.return_value = {
+            "/command": {"timestamp": [0], "value": ["load"]},
+            "/filename": {"timestamp": [0], "value": ["settings"]},
+            "/finished": {"timestamp": [0], "value": [1]},
+        }
+    raw_module.finish.assert_called_once()
+    raw_module.unsubscribe.assert_called_once_with("*")
+    # Only the changed writable node is reset
+    raw_module.set.assert_called_once_with("/command", "save")
+
+    assert session.modules.acquire("device_settings") is module
+    session.modules.create_device_settings_module()
+    assert mock_connection.return_value.deviceSettings.call_count == 2
+    raw_module.listNodesJSON.assert_called_once_with("*")
+
+    with pytest.raises(ValueError, match="Unknown module type"):
+        session.modules.acquire("unknown")
+    # modules implemented by toolkit can not be pooled
+    for module_type in ("shfqa_sweeper", "multi_shfqa_sweeper"):
+        with pytest.raises(ValueError, match=f"Use create_{module_type} instead"):
+            session.modules.acquire(module_type)
+        with pytest.raises(ValueError, match="not a LabOne module"):
+            with session.modules.pooled(module_type):
+                pass
+    with pytest.raises(ValueError):
+        session.modules.release(session.modules.device_settings)
+
+
 def test_impedance_module(data_dir, mock_connection, session):
     json_path = data_dir / "nodedoc_impedance_test.json"
     with json_path.open("r", encoding="UTF-8") as file:
@@ -620,3 +677,206 @@ def test_session_wide_transaction(
             ("/dev1234/demods/0/enable", 1),
         ],
     )
+
+
+def test_connection_pool(mock_connection, session):
+    clones = []
+
+    def create_clone(*args, **kwargs):
+        clones.append(MagicMock())
+        return clones[-1]
+
+    mock_connection.side_effect = create_clone
+    pool = session.connection_pool
+    pool.max_size = 2
+    assert repr(pool) == "ConnectionPool(localhost:8004, 0/2)"
+
+    with pool.connection() as connection:
+        assert connection is clones[0]
+        mock_connection.assert_called_with(
+            "localhost",
+            8004,
+            6,
+            allow_version_mismatch=True,
+        )
+    connection.unsubscribe.assert_called_once_with("*")
+    assert pool.size == 1
+
+    # idle connections are reused
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first is clones[0]
+    assert second is clones[1]
+    assert pool.size == 2
+
+    # pool is exhausted
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(second)
+    pool.release(first)
+
+    # broken connections are replaced
+    clones[0].getString.side_effect = RuntimeError("connection lost")
+    with pool.connection() as connection:
+        assert connection is clones[1]
+        with pool.connection() as connection:
+            assert connection is clones[2]
+    clones[0].disconnect.assert_called_once()
+
+    assert pool.map(lambda daq, item: (daq in clones, item), [1, 2, 3]) == [
+        (True, 1),
+        (True, 2),
+        (True, 3),
+    ]
+    assert pool.size <= 2
+
+    pool.close()
+    assert pool.size == 0
+    clones[2].disconnect.assert_called_once()
+
+    with pytest.raises(ValueError):
+        pool.max_size = 0
+
+
+def test_connect_devices(
+    zi_devices_json,
+    mock_connection,
+    session,
+    nodedoc_dev1234_json,
+):
+    connected_devices = []
+
+    def get_string_side_effect(arg):
+        if arg == "/zi/devices":
+            return zi_devices_json
+        if arg == "/zi/devices/connected":
+            return ",".join(connected_devices)
+        if arg == "/zi/about/dataserver":
+            return "Zurich Instruments Data Server"
+        if arg.endswith("/features/options"):
+            return ""
+        raise RuntimeError("ZIAPINotFoundException")
+
+    def connect_device_side_effect(serial, _):
+        if serial.upper() not in json.loads(zi_devices_json):
+            raise RuntimeError("device not visible to server")
+        if serial not in connected_devices:
+            connected_devices.append(serial)
+
+    mock_connection.return_value.getString.side_effect = get_string_side_effect
+    mock_connection.return_value.connectDevice.side_effect = connect_device_side_effect
+    mock_connection.return_value.listNodesJSON.return_value = nodedoc_dev1234_json
+
+    # device not visible
+    with pytest.raises(KeyError):
+        session.connect_devices(["dev1111"])
+
+    result = session.connect_devices(
+        ["DEV1234", "dev5678"], interfaces={"dev5678": "USB"}
+    )
+    mock_connection.return_value.connectDevice.assert_any_call("dev1234", "1GbE")
+    mock_connection.return_value.connectDevice.assert_any_call("dev5678", "USB")
+    assert list(result.devices.keys()) == ["dev1234", "dev5678"]
+    assert result.devices["dev1234"].device_type == "Test"
+    assert result.devices["dev5678"].device_type == "Test2"
+    assert result.devices["dev1234"] is session.devices["dev1234"]
+    assert result.timing["dev1234"].connect >= 0
+    assert result.timing["dev1234"].create >= 0
+    mock_connection.return_value.listNodesJSON.assert_any_call("/dev1234/*")
+
+    # already created devices are not connected again
+    mock_connection.return_value.connectDevice.reset_mock()
+    result = session.connect_devices(["dev1234"])
+    mock_connection.return_value.connectDevice.assert_not_called()
+    assert result.devices["dev1234"] is session.devices["dev1234"]
+    assert result.timing["dev1234"] == (0.0, 0.0)
+
+    # connection failure
+    connected_devices.clear()
+    del session.devices["dev5678"]
+    mock_connection.return_value.connectDevice.side_effect = RuntimeError("failed")
+    with pytest.raises(RuntimeError):
+        session.connect_devices(["dev1234", "dev5678"], interfaces={"dev1234": "1GbE"})
+    assert "dev5678" not in session.devices._devices
+
+
+def test_clockbase(mock_connection, session):
+    mock_connection.return_value.getDouble.return_value = 1.8e9
+    assert session.clockbase("DEV1234") == 1.8e9
+    assert session.clockbase("dev1234") == 1.8e9
+    mock_connection.return_value.getDouble.assert_called_once_with(
+        "/dev1234/clockbase",
+    )
+
+    # cache is invalidated when the device is removed
+    del session.devices["dev1234"]
+    mock_connection.return_value.getDouble.return_value = 60e6
+    assert session.clockbase("dev1234") == 60e6
+
+    mock_connection.return_value.getDouble.side_effect = RuntimeError("not found")
+    with pytest.raises(RuntimeError):
+        session.clockbase("dev5678")
+
+
+def test_compile_and_load(mock_connection, session, shfsg, tmp_path):
+    session._devices._devices = {"dev1234": shfsg}
+    awgs = [shfsg.sgchannels[index].awg for index in range(3)]
+    programs = {awg: f"setTrigger({index});" for index, awg in enumerate(awgs)}
+    expected = [compile_seqc(programs[awg], "SHFSG8", [], 0) for awg in awgs]
+
+    infos = session.compile_and_load(programs)
+    assert list(infos) == awgs
+    assert infos[awgs[2]] == expected[2][1]
+    # all ELF files are uploaded in a single transaction
+    mock_connection.return_value.set.assert_called_once()
+    uploads = mock_connection.return_value.set.call_args[0][0]
+    assert [path for path, _ in uploads] == [
+        f"/dev1234/sgchannels/{index}/awg/elf/data" for index in range(3)
+    ]
+    assert [elf for _, elf in uploads] == [elf for elf, _ in expected]
+    # the uploaded programs are remembered by the AWG cores
+    assert (
+        awgs[2].load_sequencer_program(programs[awgs[2]], verify=False)
+        == expected[2][1]
+    )
+    mock_connection.return_value.set.assert_called_once()
+
+    # nothing is uploaded if a compilation fails
+    mock_connection.return_value.set.reset_mock()
+    with pytest.raises(RuntimeError, match="sgchannels/1"):
+        session.compile_and_load({awgs[0]: "setTrigger(1);", awgs[1]: "Hello"})
+    mock_connection.return_value.set.assert_not_called()
+
+    # cached programs are not compiled again
+    cache = CompilerCache(tmp_path)
+    awgs[0].compiler_cache = cache
+    session.compile_and_load({awgs[0]: programs[awgs[0]]})
+    mock_connection.return_value.get.return_value = {
+        "/dev1234/sgchannels/0/awg/ready": {"timestamp": [0], "value": [1]},
+    }
+    with patch("zhinst.toolkit.session.core.compile_seqc") as compile_mock:
+        session.compile_and_load({awgs[0]: programs[awgs[0]]}, wait_ready=True)
+        compile_mock.assert_not_called()
+    assert cache.stats.hits == 1
+    mock_connection.return_value.get.assert_called_with(
+        "/dev1234/sgchannels/0/awg/ready",
+        settingsonly=False,
+        flat=True,
+    )
+
+
+def test_compile_and_load_cache_error(
+    mock_connection, session, shfsg, tmp_path, caplog
+):
+    session._devices._devices = {"dev1234": shfsg}
+    awgs = [shfsg.sgchannels[index].awg for index in range(2)]
+    cache = CompilerCache(tmp_path)
+    for awg in awgs:
+        awg.compiler_cache = cache
+    programs = {awg: f"setTrigger({index});" for index, awg in enumerate(awgs)}
+    # the compiled programs are loaded even if they can not be cached
+    with patch.object(cache, "put", side_effect=OSError("disk full")):
+        infos = session.compile_and_load(programs)
+    assert list(infos) == awgs
+    mock_connection.return_value.set.assert_called_once()
+    assert caplog.text.count("Unable to add") == 2
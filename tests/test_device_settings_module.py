@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from zhinst.toolkit.driver.modules.device_settings_module import DeviceSettingsModule
@@ -83,3 +84,45 @@ def test_read(device_settings_module):
     result = device_settings_module.read()
     assert device_settings_module.device in result
     assert result[device_settings_module.device] == "test"
+
+
+def test_snapshot(device_settings_module, mock_connection, tmp_path):
+    def get(path, settingsonly, flat):
+        assert settingsonly
+        serial = path.split("/")[1]
+        return {
+            f"/{serial}/oscs/0/freq": {"timestamp": [0], "value": [10e6]},
+            f"/{serial}/awgs/0/waveform": [
+                {"timestamp": 0, "flags": 0, "vector": np.arange(4.0)},
+            ],
+            f"/{serial}/system/name": {"timestamp": [0], "value": [serial]},
+            f"/{serial}/system/unknown": {"timestamp": [0], "value": [{"a": 1}]},
+            f"/{serial}/demods/0/enable": {"timestamp": [0], "value": [1]},
+            f"/{serial}/system/impedance": {"timestamp": [0], "value": [1 + 2j]},
+        }
+
+    mock_connection.return_value.get.side_effect = get
+    filename = tmp_path / "settings.npz"
+    device_settings_module.save_snapshot(filename, ["DEV1234", "dev5678"])
+    assert mock_connection.return_value.get.call_count == 2
+
+    assert device_settings_module.load_snapshot(filename) == ["dev1234", "dev5678"]
+    assert mock_connection.return_value.set.call_count == 2
+    assert device_settings_module.load_snapshot(filename, ["dev5678"]) == ["dev5678"]
+    # the settings are restored in the order of the wildcard get
+    settings = mock_connection.return_value.set.call_args[0][0]
+    waveform = settings.pop(1)
+    assert settings == [
+        ("/dev5678/oscs/0/freq", 10e6),
+        ("/dev5678/system/name", "dev5678"),
+        ("/dev5678/demods/0/enable", 1),
+        ("/dev5678/system/impedance", 1 + 2j),
+    ]
+    assert waveform[0] == "/dev5678/awgs/0/waveform"
+    np.testing.assert_array_equal(waveform[1], np.arange(4.0))
+
+    with pytest.raises(KeyError):
+        device_settings_module.load_snapshot(filename, ["dev0000"])
+
+    device_settings_module.save_snapshot(filename, "dev1234")
+    assert device_settings_module.load_snapshot(filename) == ["dev1234"]
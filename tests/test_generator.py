@@ -5,7 +5,7 @@ import numpy as np
 import pytest
 from zhinst.core import compile_seqc
 
-from zhinst.toolkit import Waveforms
+from zhinst.toolkit import ArenaWaveforms, Waveforms
 
 
 @pytest.fixture
@@ -81,6 +81,31 @@ def test_load_sequencer_program(shfqa, generator, mock_connection):
     assert info == info_original
 
 
+def test_load_sequencer_program_unchanged(generator, mock_connection):
+    elf, _ = compile_seqc("setTrigger(1);", "SHFQA4", [], 0)
+    generator.load_sequencer_program("setTrigger(1);")
+    state = {"ready": 1, "length": len(elf)}
+
+    def get_side_effect(nodes, **kwargs):
+        return {
+            node: {"timestamp": [0], "value": [state[node.rsplit("/", 1)[-1]]]}
+            for node in nodes.split(",")
+        }
+
+    # the generator has no checksum node
+    mock_connection.return_value.get.side_effect = get_side_effect
+    mock_connection.return_value.set.reset_mock()
+    generator.load_sequencer_program("setTrigger(1);")
+    mock_connection.return_value.set.assert_not_called()
+    assert mock_connection.return_value.get.call_args[0][0] == (
+        "/dev1234/qachannels/0/generator/ready,"
+        "/dev1234/qachannels/0/generator/elf/length"
+    )
+    state["length"] = 0
+    generator.load_sequencer_program("setTrigger(1);")
+    mock_connection.return_value.set.assert_called_once()
+
+
 def test_write_to_waveform_memory(shfqa, generator, mock_connection):
 
     waveforms = Waveforms()
@@ -169,6 +194,48 @@ def test_write_to_waveform_memory(shfqa, generator, mock_connection):
         shfqa.qachannels[0].generator.write_to_waveform_memory(waveforms_long)
 
 
+def test_write_to_waveform_memory_skip_unchanged(generator, mock_connection):
+    pulses = {slot: np.ones(1000, dtype=np.complex128) * slot for slot in range(3)}
+    generator.write_to_waveform_memory(pulses, skip_unchanged=True)
+    pulses[1] = np.zeros(1000, dtype=np.complex128)
+    stats = generator.write_to_waveform_memory(
+        pulses,
+        clear_existing=False,
+        skip_unchanged=True,
+    )
+    assert (stats.uploaded, stats.skipped) == (1, 2)
+    assert [path for path, _ in mock_connection.return_value.set.call_args[0][0]] == [
+        "/dev1234/qachannels/0/generator/waveforms/1/wave"
+    ]
+
+    # clearing the memory requires a full upload
+    stats = generator.write_to_waveform_memory(pulses, skip_unchanged=True)
+    assert (stats.uploaded, stats.skipped) == (3, 0)
+    assert len(mock_connection.return_value.set.call_args[0][0]) == 4
+
+
+def test_write_to_waveform_memory_batches(generator, mock_connection, monkeypatch):
+    monkeypatch.setattr(
+        "zhinst.toolkit.driver.devices.shfqa._UPLOAD_BATCH_BYTES",
+        2 * 1000 * 16,
+    )
+    waveforms = ArenaWaveforms()
+    for slot in range(5):
+        waveforms[slot] = np.ones(1000) * slot / 5
+    stats = generator.write_to_waveform_memory(waveforms)
+    assert stats.uploaded == 5
+    assert stats.bytes_uploaded == 5 * 1000 * 16
+    batches = [call[0][0] for call in mock_connection.return_value.set.call_args_list]
+    assert [len(batch) for batch in batches] == [3, 2, 1]
+    # the memory is only cleared before the first batch
+    assert batches[0][0] == ("/dev1234/qachannels/0/generator/clearwave", 1)
+    uploads = [item for batch in batches for item in batch][1:]
+    for slot, (path, vector) in enumerate(uploads):
+        assert path == f"/dev1234/qachannels/0/generator/waveforms/{slot}/wave"
+        np.testing.assert_array_equal(vector, np.ones(1000) * slot / 5)
+    assert not waveforms._raw_vectors
+
+
 def test_read_from_waveform_memory(shfqa, mock_connection):
 
     result = shfqa.qachannels[0].generator.read_from_waveform_memory()
@@ -236,3 +303,18 @@ def test_available_aux_trigger_inputs(shfqa):
         "chan3rod",
         "swtrig0",
     ]
+
+
+def test_read_from_waveform_memory_slots(shfqa, mock_connection):
+    mock_connection.return_value.get.return_value = {
+        "/dev1234/qachannels/0/generator/waveforms/3/wave": [
+            {"vector": np.full(10, 0.5, dtype=np.complex128)},
+        ],
+        "/dev1234/qachannels/0/generator/waveforms/1/wave": [
+            {"vector": np.ones(20, dtype=np.complex128)},
+        ],
+    }
+    result = shfqa.qachannels[0].generator.read_from_waveform_memory([1, 3])
+    assert sorted(result.keys()) == [1, 3]
+    np.testing.assert_array_equal(result[1][0], np.ones(20))
+    np.testing.assert_array_equal(result[3][0], np.full(10, 0.5))
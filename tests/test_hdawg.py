@@ -2,9 +2,11 @@ import re
 from itertools import cycle
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from zhinst.toolkit.driver.devices.hdawg import AWG, HDAWG
+from zhinst.toolkit.driver.nodes.awg import _LoadedProgram
 from zhinst.toolkit.exceptions import ToolkitError
 from zhinst.toolkit.nodetree import Node
 
@@ -106,6 +108,20 @@ def test_awg(hdawg):
     assert isinstance(hdawg.awgs["*"], Node)
 
 
+def test_factory_reset_resets_awgs(mock_connection, hdawg):
+    awg = hdawg.awgs[1]
+    wave = np.ones(16, dtype=np.int16)
+    awg._loaded_program = _LoadedProgram("key", b"", 1, 1, {})
+    awg._waveform_digests.update({0: awg._waveform_digests.digest(wave)})
+    mock_connection.return_value.getInt.return_value = 0
+    mock_connection.return_value.get.return_value = {
+        "/dev1234/system/preset/error": {"timestamp": [0], "value": [0]},
+    }
+    hdawg.factory_reset()
+    assert awg._loaded_program is None
+    assert awg._waveform_digests.select({0: wave}, skip_unchanged=True)[0]
+
+
 def test_awg_compiler(mock_connection, hdawg):
     mock_connection.return_value.getString.return_value = "AWG,FOOBAR"
     mock_connection.return_value.getDouble.return_value = 10000
@@ -0,0 +1,108 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from zhinst.toolkit.driver.modules import MultiSHFQASweeper
+
+
+@pytest.fixture
+def mock_shf_sweeper():
+    with patch(
+        "zhinst.toolkit.driver.modules.shfqa_sweeper.CoreSweeper",
+        autospec=True,
+    ) as sweeper:
+        yield sweeper
+
+
+def test_multi_sweeper(session, mock_shf_sweeper):
+    multi_sweeper = session.modules.create_multi_shfqa_sweeper(
+        [("DEV1234", 0), ("dev1234", 1), ("dev5678", 0)],
+        shared={"average/num_averages": 8},
+    )
+    assert len(multi_sweeper) == 3
+    assert list(multi_sweeper) == [("dev1234", 0), ("dev1234", 1), ("dev5678", 0)]
+    assert repr(multi_sweeper).startswith("MultiSHFQASweeper(")
+    for (serial, channel), sweeper in multi_sweeper.sweepers.items():
+        assert sweeper.device() == serial
+        assert sweeper.rf.channel() == channel
+        assert sweeper.average.num_averages() == 8
+    multi_sweeper["DEV1234", 1].rf.center_freq(2e9)
+    assert multi_sweeper["dev1234", 1].rf.center_freq() == 2e9
+    assert multi_sweeper["dev1234", 0].rf.center_freq() != 2e9
+
+    # all sweeps run at the same time
+    barrier = threading.Barrier(3, timeout=5)
+
+    def run():
+        barrier.wait()
+        return {"vector": threading.current_thread().name}
+
+    mock_shf_sweeper.return_value.run.side_effect = run
+    results = multi_sweeper.run()
+    assert list(results) == list(multi_sweeper)
+    assert len({result["vector"] for result in results.values()}) == 3
+    assert mock_shf_sweeper.return_value.configure.call_count == 3
+
+
+def test_multi_sweeper_error(session, mock_shf_sweeper):
+    multi_sweeper = MultiSHFQASweeper(session, [("dev1234", 0), ("dev1234", 1)])
+    mock_shf_sweeper.return_value.get_result.side_effect = [{}, RuntimeError("x")]
+    with pytest.raises(RuntimeError):
+        multi_sweeper.get_result()
+    assert mock_shf_sweeper.return_value.get_result.call_count == 2
+
+
+def test_multi_sweeper_duplicate(session, mock_shf_sweeper):
+    with pytest.raises(ValueError):
+        MultiSHFQASweeper(session, [("dev1234", 0), ("DEV1234", 0)])
+
+
+def test_multi_sweeper_sw_trigger(session, mock_shf_sweeper):
+    running = {"dev1234": 0, "dev5678": 0}
+    max_running = dict(running)
+    lock = threading.Lock()
+    dev1234_running = threading.Event()
+
+    def create_sweeper(daq, serial):
+        def run():
+            with lock:
+                running[serial] += 1
+                max_running[serial] = max(max_running[serial], running[serial])
+            if serial == "dev1234":
+                dev1234_running.set()
+                time.sleep(0.05)
+            else:
+                # the other device is swept at the same time
+                assert dev1234_running.wait(timeout=5)
+            with lock:
+                running[serial] -= 1
+            return {"vector": serial}
+
+        sweeper = MagicMock()
+        sweeper.run.side_effect = run
+        return sweeper
+
+    mock_shf_sweeper.side_effect = create_sweeper
+    multi_sweeper = MultiSHFQASweeper(
+        session,
+        [("dev1234", 0), ("dev1234", 1), ("dev5678", 0)],
+        shared={"trigger/source": "software_trigger0"},
+    )
+    results = multi_sweeper.run()
+    assert [result["vector"] for result in results.values()] == [
+        "dev1234",
+        "dev1234",
+        "dev5678",
+    ]
+    # the software trigger of one channel would trigger the other channel
+    assert max_running == {"dev1234": 1, "dev5678": 1}
+
+    # the forced software trigger mode is handled the same way
+    multi_sweeper.shared(
+        {"trigger/source": "channel0_trigger_input0", "trigger/sw_trigger_mode": 1},
+    )
+    max_running.update({"dev1234": 0, "dev5678": 0})
+    multi_sweeper.run()
+    assert max_running == {"dev1234": 1, "dev5678": 1}
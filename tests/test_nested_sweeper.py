@@ -0,0 +1,90 @@
+from unittest.mock import call
+
+import numpy as np
+import pytest
+
+from zhinst.toolkit.driver.modules import NestedSweeper, SweepAxis, SweeperModule
+
+
+@pytest.fixture
+def sweeper_module(data_dir, mock_connection, session):
+    json_path = data_dir / "nodedoc_sweeper_test.json"
+    with json_path.open("r", encoding="UTF-8") as file:
+        nodes_json = file.read()
+    mock_connection.return_value.sweep.return_value.listNodesJSON.return_value = (
+        nodes_json
+    )
+    return SweeperModule(mock_connection.return_value.sweep(), session)
+
+
+def test_nested_sweep(sweeper_module, mock_connection, session):
+    module_mock = sweeper_module.raw_module
+    module_mock.getInt.return_value = 4
+    module_mock.finished.return_value = True
+    module_mock.progress.return_value = [1.0]
+    reads = iter(range(100))
+
+    def read(flat):
+        offset = next(reads)
+        return {
+            "/dev1234/demods/0/sample": [
+                [
+                    {
+                        "grid": np.linspace(1, 4, 4),
+                        "x": np.arange(4) + offset,
+                        "y": np.arange(3) - offset,
+                    },
+                ],
+            ],
+        }
+
+    module_mock.read.side_effect = read
+    flux = []
+    nested = NestedSweeper(
+        session,
+        [
+            SweepAxis(session.debug.level, [1, 2]),
+            (flux.append, np.linspace(0, 1, 3)),
+        ],
+        "/dev1234/demods/0/sample",
+        sweeper=sweeper_module,
+    )
+    assert nested.shape == (2, 3)
+    progress = []
+    result = nested.run(progress_callback=progress.append)
+
+    assert module_mock.execute.call_count == 6
+    module_mock.subscribe.assert_called_once_with("/dev1234/demods/0/sample")
+    module_mock.unsubscribe.assert_called_once_with("/dev1234/demods/0/sample")
+    # the node of the slow axis is only set if its value changes
+    assert mock_connection.return_value.set.call_args_list == [
+        call([("/zi/debug/level", 1)]),
+        call([("/zi/debug/level", 2)]),
+    ]
+    assert flux == [0.0, 0.5, 1.0, 0.0, 0.5, 1.0]
+    assert progress[-1] == 1.0
+    np.testing.assert_array_equal(result.grid, [1, 2, 3, 4])
+    assert result.data["x"].shape == (2, 3, 4)
+    np.testing.assert_array_equal(result.data["x"][1, 2], np.arange(4) + 5)
+    np.testing.assert_array_equal(result.data["y"][0, 1, :3], np.arange(3) - 1)
+    assert np.isnan(result.data["y"][0, 1, 3])
+
+
+def test_nested_sweep_missing_data(sweeper_module, session):
+    module_mock = sweeper_module.raw_module
+    module_mock.getInt.return_value = 2
+    module_mock.finished.return_value = True
+    module_mock.progress.return_value = [1.0]
+    module_mock.read.return_value = {}
+    result = NestedSweeper(
+        session,
+        [(lambda _: None, [1, 2])],
+        "/dev1234/demods/0/sample",
+        sweeper=sweeper_module,
+    ).run()
+    assert np.isnan(result.data["x"]).all()
+
+
+def test_nested_sweep_invalid_axis(session):
+    with pytest.raises(ValueError):
+        NestedSweeper(session, [(print, [])], "/dev1234/demods/0/sample")
@@ -3,7 +3,7 @@ from unittest.mock import patch
 import numpy as np
 import pytest
 
-from zhinst.toolkit.waveform import Waveforms
+from zhinst.toolkit.waveform import ArenaWaveforms, Waveforms
 
 
 @pytest.fixture
@@ -175,6 +175,42 @@ def test_write_integration_weights(mock_connection, readout):
         readout.write_integration_weights(waveforms_long)
 
 
+def test_write_integration_weights_skip_unchanged(mock_connection, readout):
+    weights = {slot: np.ones(1000, dtype=np.complex128) * slot for slot in range(3)}
+    readout.write_integration_weights(weights, clear_existing=False)
+    weights[2] = np.zeros(500, dtype=np.complex128)
+    stats = readout.write_integration_weights(
+        weights,
+        clear_existing=False,
+        skip_unchanged=True,
+    )
+    assert (stats.uploaded, stats.skipped) == (1, 2)
+    assert stats.bytes_skipped == 2 * weights[0].nbytes
+    assert [path for path, _ in mock_connection.return_value.set.call_args[0][0]] == [
+        "/DEV1234/qachannels/0/readout/integration/weights/2/wave",
+        "/DEV1234/qachannels/0/readout/integration/length",
+        "/DEV1234/qachannels/0/readout/integration/delay",
+    ]
+    # the integration length is still taken from the first weight
+    assert mock_connection.return_value.set.call_args[0][0][1][1] == 1000
+
+    stats = readout.write_integration_weights(weights, skip_unchanged=True)
+    assert (stats.uploaded, stats.skipped) == (3, 0)
+
+
+def test_write_integration_weights_aborted_transaction(mock_connection, readout):
+    weights = {slot: np.ones(1000, dtype=np.complex128) * slot for slot in range(2)}
+    with pytest.raises(RuntimeError), readout.root.set_transaction():
+        readout.write_integration_weights(weights, clear_existing=False)
+        raise RuntimeError
+    stats = readout.write_integration_weights(
+        weights,
+        clear_existing=False,
+        skip_unchanged=True,
+    )
+    assert (stats.uploaded, stats.skipped) == (2, 0)
+
+
 def test_read_integration_weights(mock_connection, readout):
 
     result = readout.read_integration_weights()
@@ -206,3 +242,26 @@ def test_read_integration_weights(mock_connection, readout):
     assert not result[0][1]
     assert not result[0][2]
     np.allclose(result[1][0], np.ones(1000, dtype=np.complex128))
+
+
+def test_write_integration_weights_batches(mock_connection, readout, monkeypatch):
+    monkeypatch.setattr(
+        "zhinst.toolkit.driver.nodes.readout._UPLOAD_BATCH_BYTES",
+        2 * 1000 * 16,
+    )
+    weights = ArenaWaveforms()
+    for slot in range(3):
+        weights[slot] = np.ones(1000 - slot) * slot
+    stats = readout.write_integration_weights(weights)
+    assert stats.uploaded == 3
+    batches = [
+        [path.rsplit("integration/", 1)[-1] for path, _ in call[0][0]]
+        for call in mock_connection.return_value.set.call_args_list
+    ]
+    assert batches == [
+        ["clearweight", "weights/0/wave", "weights/1/wave", "length", "delay"],
+        ["weights/2/wave", "length", "delay"],
+    ]
+    # the integration length is taken from the first weight
+    assert mock_connection.return_value.set.call_args[0][0][1][1] == 1000
+    assert not weights._raw_vectors
@@ -1,6 +1,8 @@
+import hashlib
+
 import numpy as np
 
-from zhinst.toolkit import Sequence, Waveforms
+from zhinst.toolkit import CompilerCache, Sequence, Waveforms
 
 
 def test_assignment():
@@ -90,3 +92,52 @@ repeat(5)
     PULSE_WIDTH
 }
 ..."""
+
+
+def test_to_string_template():
+    waveforms = Waveforms()
+    waveforms[0] = np.ones(16)
+    sequencer = Sequence(
+        "const A = 1;\nconst B = 2; // B\nplayWave(A, B);\nconst A = 3;",
+        constants={"A": 5, "B": 0.5, "C": 7},
+        waveforms=waveforms,
+    )
+    assert sequencer.to_string() == (
+        "// Constants\nconst C = 7;\n"
+        "// Waveforms declaration\n"
+        "assignWaveIndex(placeholder(16, false, false), 0);\n"
+        "const A = 5;\nconst B = 0.5; // B\nplayWave(A, B);\nconst A = 5;"
+    )
+    template = sequencer._template
+    sequencer.constants["A"] = 6
+    assert sequencer.to_string(waveform_snippet=False) == (
+        "// Constants\nconst C = 7;\n"
+        "const A = 6;\nconst B = 0.5; // B\nplayWave(A, B);\nconst A = 6;"
+    )
+    # changing a value does not parse the code again
+    assert sequencer._template is template
+
+    waveforms[0] = np.ones(32)
+    assert "placeholder(32, false, false)" in sequencer.to_string()
+
+    del sequencer.constants["C"]
+    sequencer.code = "const B = 1;"
+    assert sequencer.to_string(waveform_snippet=False) == (
+        "// Constants\nconst A = 6;\nconst B = 0.5;"
+    )
+
+
+def test_content_hash():
+    sequencer = Sequence("const A = 1;\nplayZero(A);", constants={"A": 32})
+    content_hash = sequencer.content_hash
+    assert content_hash == hashlib.sha256(str(sequencer).encode()).hexdigest()
+    assert CompilerCache.key(sequencer, "SHFSG4", "", 0) == CompilerCache.key(
+        str(sequencer),
+        "SHFSG4",
+        "",
+        0,
+    )
+    sequencer.constants["A"] = 64
+    assert sequencer.content_hash != content_hash
+    sequencer.constants["A"] = 32
+    assert sequencer.content_hash == content_hash
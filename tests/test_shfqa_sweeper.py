@@ -124,6 +124,41 @@ def test_update_settings(sweeper_module, mock_shf_sweeper):
     assert envelope.delay == 0.0
 
 
+def test_update_settings_changed_only(sweeper_module, mock_shf_sweeper):
+    configure = mock_shf_sweeper.return_value.configure
+    sweeper_module.device("dev1234")
+    sweeper_module.run()
+    sweeper_module.run()
+    configure.assert_called_once()
+
+    sweeper_module.rf.output_range(1)
+    sweeper_module.run()
+    assert configure.call_count == 2
+    assert list(configure.call_args[1]) == ["rf_config"]
+    assert configure.call_args[1]["rf_config"].output_range == 1
+
+    sweeper_module.envelope.enable(True)
+    sweeper_module.run()
+    assert list(configure.call_args[1]) == ["envelope_config"]
+    sweeper_module.trigger.level(0.6)
+    sweeper_module.run()
+    assert list(configure.call_args[1]) == ["trig_config", "envelope_config"]
+
+    # a failed configuration is repeated completely
+    configure.side_effect = ValueError
+    sweeper_module.sweep.start_freq(1e6)
+    with pytest.raises(ValueError):
+        sweeper_module.run()
+    configure.side_effect = None
+    sweeper_module.run()
+    assert len(configure.call_args[1]) == 5
+
+    # a new device requires the complete configuration
+    sweeper_module.device("dev5678")
+    sweeper_module.run()
+    assert len(mock_shf_sweeper.return_value.configure.call_args[1]) == 5
+
+
 def test_update_settings_broken(
     mock_TriggerConfig,
     mock_SweepConfig,
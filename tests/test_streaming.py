@@ -0,0 +1,366 @@
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from zhinst.toolkit.driver.modules.daq_module import DAQResult
+from zhinst.toolkit.exceptions import ToolkitError
+from zhinst.toolkit.streaming import (
+    PollStream,
+    RingBuffer,
+    StreamReader,
+    StreamWriter,
+    device_serial,
+    read_clockbases,
+    timestamps_to_seconds,
+    to_structured,
+    to_structured_array,
+)
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(5)
+    assert len(buffer) == 0
+    assert buffer.read() == {}
+
+    assert buffer.write({"timestamp": np.arange(3), "x": np.arange(3.0)}) == 0
+    assert buffer.fields == ["timestamp", "x"]
+    assert len(buffer) == 3
+    assert repr(buffer) == "RingBuffer(3/5, fields=['timestamp', 'x'])"
+
+    # wrap around and overwrite the oldest samples
+    assert buffer.write({"timestamp": np.arange(3, 7), "x": np.arange(3.0, 7.0)}) == 2
+    assert buffer.overruns == 2
+    result = buffer.read(2)
+    np.testing.assert_array_equal(result["timestamp"], [2, 3])
+    assert result["x"].dtype == np.float64
+    assert len(buffer) == 3
+
+    # more samples than the capacity
+    assert buffer.write({"timestamp": np.arange(10), "x": np.arange(10.0)}) == 8
+    assert buffer.overruns == 10
+    np.testing.assert_array_equal(buffer.read()["timestamp"], [5, 6, 7, 8, 9])
+
+    # header information is ignored
+    buffer.write({"timestamp": np.arange(2), "x": np.zeros(2), "header": {}})
+    assert len(buffer) == 2
+    buffer.clear()
+    assert len(buffer) == 0
+
+    with pytest.raises(ValueError):
+        buffer.write({"timestamp": np.arange(2)})
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_poll_stream(mock_connection, session):
+    polled = threading.Event()
+    samples = iter(range(0, 100, 4))
+
+    def poll(*args, **kwargs):
+        start = next(samples, None)
+        if start is None:
+            polled.set()
+            return {}
+        return {
+            "/dev1234/demods/0/sample": {
+                "timestamp": np.arange(start, start + 4),
+                "x": np.ones(4),
+            },
+            "/dev1234/scopes/0/wave": [{"wave": np.ones(4)}],
+        }
+
+    mock_connection.return_value.poll.side_effect = poll
+    stream = session.stream(
+        ["/DEV1234/demods/0/sample"],
+        chunk_size=10,
+        capacity=1000,
+    )
+    assert repr(stream) == "PollStream(['/dev1234/demods/0/sample'], stopped)"
+    with stream:
+        assert stream.running
+        polled.wait(5)
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk["/dev1234/demods/0/sample"]["timestamp"])
+            if len(chunks) == 10:
+                break
+    assert not stream.running
+    mock_connection.return_value.subscribe.assert_called_with(
+        ["/dev1234/demods/0/sample"],
+    )
+    mock_connection.return_value.poll.assert_called_with(
+        0.1,
+        500,
+        flags=0,
+        flat=True,
+    )
+    np.testing.assert_array_equal(np.concatenate(chunks), np.arange(100))
+    assert stream.overruns == {"/dev1234/demods/0/sample": 0}
+    assert len(stream.read()) == 0
+    assert list(stream) == []
+
+    with pytest.raises(ValueError):
+        PollStream(session, [], chunk_size=10, capacity=5)
+
+
+def test_poll_stream_overrun(mock_connection, session):
+    def poll(*args, **kwargs):
+        return {"/dev1234/demods/0/sample": {"timestamp": np.arange(8)}}
+
+    mock_connection.return_value.poll.side_effect = poll
+    with session.stream(["/dev1234/demods/0/sample"], chunk_size=4) as stream:
+        next(iter(stream))
+        while not stream.overruns["/dev1234/demods/0/sample"]:
+            pass
+    assert len(stream.read()["/dev1234/demods/0/sample"]["timestamp"]) <= 40
+
+
+def test_poll_stream_error(mock_connection, session):
+    mock_connection.return_value.poll.side_effect = RuntimeError("lost")
+    stream = session.stream(["/dev1234/demods/0/sample"], chunk_size=4)
+    stream.start()
+    with pytest.raises(RuntimeError):
+        list(stream)
+    stream.stop()
+
+
+def test_to_structured_array():
+    sample = {
+        "timestamp": np.array([10, 20], dtype=np.uint64),
+        "x": np.array([1.0, 2.0]),
+        "z": np.array([1 + 1j, 2 + 2j]),
+        "grid": np.ones((2, 3)),
+        "header": {"name": "test"},
+        "count": 2,
+    }
+    result = to_structured_array(sample)
+    assert result.dtype.names == ("timestamp", "x", "z", "grid")
+    assert result.dtype["timestamp"] == np.uint64
+    assert result["grid"].shape == (2, 3)
+    np.testing.assert_array_equal(result["z"], sample["z"])
+
+    result = to_structured_array(sample, clockbase=10.0)
+    np.testing.assert_array_equal(result["time"], [1.0, 2.0])
+
+    # records with different shapes are not converted
+    records = [{"wave": np.ones(4)}, {"wave": np.ones(5)}]
+    assert to_structured_array(records) is records
+    assert to_structured_array([]) == []
+    assert to_structured_array({"value": 1}) == {"value": 1}
+    assert to_structured_array(1.0) == 1.0
+
+
+def test_to_structured():
+    data = {
+        "/DEV1234/auxins/0/sample": {"timestamp": np.array([4]), "auxin0": np.ones(1)},
+        "/dev5678/auxins/0/sample": {"timestamp": np.array([4]), "auxin0": np.ones(1)},
+        "/zi/config/open": {"timestamp": np.array([4]), "value": np.ones(1)},
+    }
+    daq_server = MagicMock()
+    daq_server.getDouble.side_effect = [2.0, RuntimeError("not found")]
+    clockbases = read_clockbases(daq_server, data)
+    assert clockbases == {"dev1234": 2.0, "dev5678": None}
+    result = to_structured(data, clockbases)
+    assert result["/DEV1234/auxins/0/sample"]["time"][0] == 2.0
+    assert "time" not in result["/dev5678/auxins/0/sample"].dtype.names
+    assert "time" not in result["/zi/config/open"].dtype.names
+
+
+def test_dispatcher_routing(session):
+    dispatcher = session.dispatcher(["/dev1234/demods/*/sample"])
+    demods = []
+    everything = []
+    demod_sub = dispatcher.subscribe(
+        "/DEV*/demods/*/sample",
+        lambda path, data: demods.append(path),
+    )
+    dispatcher.subscribe("*", lambda path, data: everything.append(path))
+    failing = dispatcher.subscribe(
+        "/dev1234/scopes/*", MagicMock(side_effect=Exception)
+    )
+    assert repr(demod_sub) == "Subscription('/dev*/demods/*/sample', inline)"
+
+    data = {
+        "/dev1234/demods/0/sample": {"x": np.ones(2)},
+        "/dev1234/scopes/0/wave": [{"wave": np.ones(2)}],
+    }
+    dispatcher.dispatch(data)
+    assert demods == ["/dev1234/demods/0/sample"]
+    assert everything == list(data)
+    assert failing.delivered == 1
+
+    dispatcher.unsubscribe(demod_sub)
+    dispatcher.dispatch(data)
+    assert len(demods) == 1
+    assert len(everything) == 4
+    assert len(dispatcher.subscriptions) == 2
+
+
+def test_dispatcher_threaded(mock_connection, session):
+    polls = iter(range(20))
+
+    def poll(*args, **kwargs):
+        index = next(polls, None)
+        if index is None:
+            return {}
+        return {"/dev1234/demods/0/sample": {"timestamp": np.array([index])}}
+
+    mock_connection.return_value.poll.side_effect = poll
+    release = threading.Event()
+    fast = []
+    slow = []
+    blocking = []
+
+    def slow_consumer(path, data):
+        release.wait(5)
+        slow.append(data["timestamp"][0])
+
+    dispatcher = session.dispatcher(["/dev1234/demods/0/sample"])
+    dispatcher.subscribe("*", lambda path, data: fast.append(data["timestamp"][0]))
+    dropping = dispatcher.subscribe("*", slow_consumer, threaded=True, maxsize=2)
+    blocked = dispatcher.subscribe(
+        "*",
+        lambda path, data: blocking.append(data["timestamp"][0]),
+        threaded=True,
+        maxsize=1,
+        policy="block",
+    )
+    assert repr(blocked) == "Subscription('*', threaded, block)"
+    with dispatcher:
+        assert dispatcher.running
+        while len(fast) < 20:
+            pass
+        release.set()
+    assert not dispatcher.running
+    mock_connection.return_value.subscribe.assert_called_with(
+        ["/dev1234/demods/0/sample"],
+    )
+    assert fast == list(range(20))
+    assert blocking == list(range(20))
+    assert dropping.dropped > 0
+    assert dropping.delivered + dropping.dropped == 20
+    assert len(slow) == dropping.delivered
+    assert dropping.pending == 0
+
+
+def test_dispatcher_structured(mock_connection, session):
+    received = []
+    mock_connection.return_value.poll.return_value = {
+        "/dev1234/demods/0/sample": {"timestamp": np.array([60]), "x": np.ones(1)},
+    }
+    mock_connection.return_value.getDouble.return_value = 60.0
+    dispatcher = session.dispatcher(["/dev1234/demods/0/sample"], structured=True)
+    dispatcher.subscribe("*", lambda path, data: received.append(data))
+    with dispatcher:
+        while not received:
+            pass
+    assert received[0]["time"][0] == 1.0
+    mock_connection.return_value.getDouble.assert_called_once_with(
+        "/dev1234/clockbase",
+    )
+
+
+def test_dispatcher_error(mock_connection, session):
+    mock_connection.return_value.poll.side_effect = RuntimeError("lost")
+    dispatcher = session.dispatcher(["/dev1234/demods/0/sample"])
+    dispatcher.start()
+    while dispatcher.running:
+        pass
+    with pytest.raises(RuntimeError):
+        dispatcher.stop()
+
+
+def test_stream_writer(tmp_path, mock_connection, session, nodedoc_dev1234_json):
+    mock_connection.return_value.listNodesJSON.return_value = nodedoc_dev1234_json
+    mock_connection.return_value.getString.return_value = "dev1234"
+    demod = "/dev1234/demods/0/rate"
+    with StreamWriter(tmp_path, session=session) as writer:
+        assert repr(writer) == f"StreamWriter({str(tmp_path)!r})"
+        for index in range(3):
+            writer.write(
+                {
+                    demod: {
+                        "timestamp": np.arange(index * 4, index * 4 + 4),
+                        "value": np.ones(4),
+                    },
+                    "/dev1234/daq/sample.x": [
+                        DAQResult({}, np.ones((1, 8)), np.arange(8.0), None, (1, 8)),
+                    ],
+                },
+            )
+        writer.flush()
+        assert writer.pending == 0
+    with pytest.raises(ValueError):
+        writer.write({demod: {"value": np.ones(1)}})
+
+    reader = StreamReader(tmp_path)
+    assert repr(reader) == f"StreamReader({str(tmp_path)!r})"
+    assert list(reader) == ["/dev1234/daq/sample.x", demod]
+    assert len(reader) == 2
+    assert demod in reader
+    assert "/dev1234/demods/1/rate" not in reader
+    np.testing.assert_array_equal(reader[demod]["timestamp"], np.arange(12))
+    chunks = list(reader.chunks(demod))
+    assert len(chunks) == 3
+    assert isinstance(chunks[0], np.memmap)
+    metadata = reader.metadata(demod)
+    assert metadata["path"] == demod
+    assert metadata["unit"] == session.devices["dev1234"].demods[0].rate.node_info.unit
+    assert "description" in metadata
+    daq = reader["/dev1234/daq/sample.x"]
+    assert daq.dtype.names == ("value", "time", "shape")
+    assert daq["value"].shape == (3, 1, 8)
+    assert reader.metadata("/dev1234/daq/sample.x") == {"path": "/dev1234/daq/sample.x"}
+    with pytest.raises(KeyError):
+        reader["/dev1234/demods/1/rate"]
+
+    # append to the existing datasets
+    with StreamWriter(tmp_path, compress=True) as writer:
+        writer.write({demod: {"timestamp": np.arange(12, 14), "value": np.ones(2)}})
+    np.testing.assert_array_equal(reader[demod]["timestamp"], np.arange(14))
+
+    # changing data type
+    writer = StreamWriter(tmp_path)
+    writer.write({demod: {"timestamp": np.arange(2)}})
+    with pytest.raises(ToolkitError, match=demod) as error:
+        writer.flush()
+    assert isinstance(error.value.__cause__, TypeError)
+    # failures do not stop the storage of other nodes
+    writer.write_node("/dev1234/test", "unsupported")
+    writer.write_node("/dev1234/other", "unsupported")
+    writer.write_node("/dev1234/demods/0/x", {"value": np.ones(3)})
+    with pytest.raises(ToolkitError, match="2 chunk.*/dev1234/test.*/dev1234/other"):
+        writer.close()
+    np.testing.assert_array_equal(reader["/dev1234/demods/0/x"]["value"], np.ones(3))
+
+
+def test_stream_writer_sweeper(tmp_path):
+    def sweep(offset):
+        return {
+            "header": {"systemtime": [0]},
+            "timestamp": np.array([offset]),
+            "grid": np.linspace(1, 4, 4),
+            "x": np.arange(4.0) + offset,
+        }
+
+    path = "/dev1234/demods/0/sample"
+    with StreamWriter(tmp_path) as writer:
+        writer.write({path: [[sweep(0)], [sweep(1)]]})
+        writer.write({path: [[sweep(2)]]})
+    data = StreamReader(tmp_path)[path]
+    assert data.shape == (3,)
+    np.testing.assert_array_equal(data["x"][2], np.arange(4.0) + 2)
+    np.testing.assert_array_equal(data["grid"][0], np.linspace(1, 4, 4))
+
+
+def test_timestamps_to_seconds():
+    timestamp = np.array([2**62, 2**62 + 3], dtype=np.uint64)
+    np.testing.assert_array_equal(
+        timestamps_to_seconds(timestamp, 3.0, origin=timestamp[0]),
+        [0.0, 1.0],
+    )
+    np.testing.assert_array_equal(timestamps_to_seconds([6, 9], 3.0), [2.0, 3.0])
+    assert device_serial("/DEV1234/demods/0/sample") == "dev1234"
+    assert device_serial("/zi/about") is None
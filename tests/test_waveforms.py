@@ -2,10 +2,18 @@ import json
 
 import numpy as np
 import pytest
+import zhinst.utils as zi_utils
 from zhinst.core import compile_seqc
 
 from zhinst.toolkit.exceptions import ValidationError
-from zhinst.toolkit.waveform import OutputType, Wave, Waveforms
+from zhinst.toolkit.waveform import (
+    ArenaWaveforms,
+    LazyWave,
+    OutputType,
+    Wave,
+    Waveforms,
+    parse_waveform_descriptors,
+)
 
 
 def test_dict_behavior():
@@ -123,6 +131,189 @@ def test_get_raw_vector():
     assert all(result3 == np.ones(1008, dtype=np.complex128))
 
 
+def test_get_raw_vector_cache():
+    waveforms = Waveforms()
+    waveforms[0] = (np.ones(1008), -np.ones(1008))
+    raw_vector = waveforms.get_raw_vector(0)
+    assert waveforms.get_raw_vector(0) is raw_vector
+    assert not raw_vector.flags.writeable
+    assert waveforms.get_raw_vector(0, complex_output=True) is not raw_vector
+
+    waveforms[0] = (np.ones(1008), np.ones(1008))
+    assert waveforms.get_raw_vector(0) is not raw_vector
+    np.testing.assert_array_equal(
+        waveforms.get_raw_vector(0),
+        zi_utils.convert_awg_waveform(np.ones(1008), np.ones(1008)),
+    )
+    raw_vector = waveforms.get_raw_vector(0)
+    waveforms.assign_native_awg_waveform(0, raw_vector, channels=1)
+    assert waveforms.get_raw_vector(0) is not raw_vector
+    del waveforms[0]
+    with pytest.raises(KeyError):
+        waveforms.get_raw_vector(0)
+
+
+def test_get_raw_vectors():
+    rng = np.random.default_rng(1)
+    waveforms = Waveforms()
+    waveforms[0] = rng.uniform(-1, 1, 64)
+    waveforms[1] = (rng.uniform(-1, 1, 32), rng.uniform(-1, 1, 32))
+    waveforms[2] = (rng.uniform(-1, 1, 16), None, rng.integers(0, 16, 16))
+    waveforms[3] = rng.uniform(-1, 1, 48) + 1j * rng.uniform(-1, 1, 48)
+    waveforms[4] = rng.integers(-1000, 1000, 8)
+    expected = {
+        0: zi_utils.convert_awg_waveform(waveforms[0][0]),
+        1: zi_utils.convert_awg_waveform(waveforms[1][0], waveforms[1][1]),
+        2: zi_utils.convert_awg_waveform(waveforms[2][0], markers=waveforms[2][2]),
+        3: zi_utils.convert_awg_waveform(waveforms[3][0].real, waveforms[3][0].imag),
+        4: zi_utils.convert_awg_waveform(waveforms[4][0]),
+    }
+    cached = waveforms.get_raw_vector(1)
+    raw_vectors = waveforms.get_raw_vectors()
+    assert list(raw_vectors) == [0, 1, 2, 3, 4]
+    assert raw_vectors[1] is cached
+    for slot, raw_vector in raw_vectors.items():
+        np.testing.assert_array_equal(raw_vector, expected[slot])
+        assert waveforms.get_raw_vector(slot) is raw_vector
+    # all converted slots share a single buffer
+    assert raw_vectors[0].base is raw_vectors[4].base
+
+    complex_vectors = waveforms.get_raw_vectors([1, 3], complex_output=True)
+    np.testing.assert_array_equal(
+        complex_vectors[1],
+        waveforms[1][0] + 1j * waveforms[1][1],
+    )
+    np.testing.assert_array_equal(complex_vectors[3], waveforms[3][0])
+
+    # preallocated buffer
+    buffer = np.zeros(1000, dtype=np.uint16)
+    raw_vectors = waveforms.get_raw_vectors([0, 1], out=buffer)
+    np.testing.assert_array_equal(buffer[:64], expected[0])
+    np.testing.assert_array_equal(raw_vectors[1], expected[1])
+    assert raw_vectors[1].base is buffer
+    with pytest.raises(ValueError):
+        waveforms.get_raw_vectors(out=np.zeros(10, dtype=np.uint16))
+    with pytest.raises(ValueError):
+        waveforms.get_raw_vectors([0, 1], out=buffer, complex_output=True)
+
+
+@pytest.mark.parametrize("backed", [False, True])
+def test_arena_waveforms(backed, tmp_path):
+    filename = tmp_path / "arena.bin" if backed else None
+    arena = ArenaWaveforms(capacity=100, filename=filename)
+    reference = Waveforms()
+    rng = np.random.default_rng(2)
+    for waveforms in (arena, reference):
+        waveforms[0] = Wave(np.ones(100), name="w0", output=OutputType.OUT1)
+        waveforms[1] = (rng.uniform(-1, 1, 50), None, np.ones(50, dtype=np.uint8))
+        waveforms.assign_waveform(2, np.arange(10) + 1j * np.arange(10))
+        waveforms[3] = (np.zeros(0), None)
+    assert list(arena) == [0, 1, 2, 3]
+    assert arena.capacity > 100
+    arena[1] = reference[1]
+    for slot in reference:
+        for wave, expected in zip(arena[slot], reference[slot], strict=True):
+            if expected is None:
+                assert wave is None
+                continue
+            assert isinstance(wave, Wave)
+            assert wave.dtype == expected.dtype
+            np.testing.assert_array_equal(wave, expected)
+        np.testing.assert_array_equal(
+            arena.get_raw_vector(slot),
+            reference.get_raw_vector(slot),
+        )
+    assert arena[0][0].name == "w0"
+    assert arena[0][0].output == OutputType.OUT1
+    assert arena.get_sequence_snippet() == reference.get_sequence_snippet()
+    # the waves are views into the arena
+    assert np.shares_memory(arena[0][0], arena.arena)
+
+    # same size reuses the memory of the slot
+    used = arena.arena.size
+    arena[0] = np.zeros(100)
+    assert arena.arena.size == used
+    np.testing.assert_array_equal(arena[0][0], np.zeros(100))
+    arena[0] = np.zeros(200)
+    assert arena.arena.size > used
+    del arena[0]
+    assert 0 not in arena
+
+    arena.flush()
+    if backed:
+        assert filename.stat().st_size == arena.capacity
+
+
+def test_arena_waveforms_swap():
+    arena = ArenaWaveforms()
+    arena[0] = (np.ones(4), -np.ones(4))
+    arena[0] = (arena[0][1], arena[0][0])
+    np.testing.assert_array_equal(arena[0][0], -np.ones(4))
+    np.testing.assert_array_equal(arena[0][1], np.ones(4))
+
+
+def test_lazy_wave(tmp_path):
+    rng = np.random.default_rng(3)
+    wave1 = rng.uniform(-1, 1, 1000)
+    wave2 = rng.uniform(-1, 1, 1000)
+    marker = np.zeros(1000, dtype=np.uint8)
+    marker[500] = 2
+    complex_wave = wave1 + 1j * wave2
+    np.save(tmp_path / "wave1.npy", wave1)
+    np.save(tmp_path / "complex.npy", complex_wave)
+    reads = []
+
+    def read(start, stop):
+        reads.append((start, stop))
+        return wave2[start:stop]
+
+    lazy = Waveforms()
+    lazy[0] = (tmp_path / "wave1.npy", LazyWave(read, length=1000, chunk_size=300))
+    lazy[1] = (
+        LazyWave(np.load(tmp_path / "wave1.npy", mmap_mode="r"), name="w1"),
+        None,
+        LazyWave(marker, chunk_size=128),
+    )
+    lazy[2] = str(tmp_path / "complex.npy")
+    reference = Waveforms()
+    reference[0] = (wave1, wave2)
+    reference[1] = (Wave(wave1, name="w1"), None, marker)
+    reference[2] = complex_wave
+    # nothing is read before the conversion
+    assert reads == []
+    assert len(lazy[0][1]) == 1000
+    assert lazy.get_sequence_snippet() == reference.get_sequence_snippet()
+
+    for slot in reference:
+        np.testing.assert_array_equal(
+            lazy.get_raw_vector(slot),
+            reference.get_raw_vector(slot),
+        )
+    for slot in [0, 2]:
+        np.testing.assert_array_equal(
+            lazy.get_raw_vector(slot, complex_output=True),
+            reference.get_raw_vector(slot, complex_output=True),
+        )
+    assert reads[:4] == [(0, 300), (300, 600), (600, 900), (900, 1000)]
+    # raw vectors of lazy waves are not cached
+    assert lazy.get_raw_vector(0) is not lazy.get_raw_vector(0)
+    placeholder = {"name": "__placeholder", "length": 1000, "play_config": "1"}
+    lazy.validate({"waveforms": [placeholder] * 3})
+
+    arena = ArenaWaveforms()
+    arena[0] = lazy[0]
+    np.testing.assert_array_equal(arena[0][1], wave2)
+
+    with pytest.raises(ValueError):
+        LazyWave(lambda start, stop: wave1[start:stop])
+    with pytest.raises(ValueError):
+        LazyWave(np.ones((2, 2)))
+    with pytest.raises(TypeError):
+        LazyWave(1)
+    with pytest.raises(ValueError):
+        np.asarray(LazyWave(lambda start, stop: wave1, length=10))
+
+
 def test_assign():
     waveform = Waveforms()
     wave = np.ones(1008)
@@ -242,6 +433,28 @@ def test_validate_ok():
     waveform.validate(seq)
 
 
+def test_parse_waveform_descriptors(data_dir):
+    descriptors = (data_dir / "waveform_descriptors.json").read_text()
+    parsed = parse_waveform_descriptors(descriptors)
+    assert parse_waveform_descriptors(descriptors) is parsed
+    assert parsed.names[:3] == ("__playWave_8_12", "__playWave_9_13", "__filler_10_15")
+    np.testing.assert_array_equal(parsed.table["length"][:3], [1008, 1008, 32])
+    np.testing.assert_array_equal(parsed.table["channels"][:3], [2, 2, 1])
+    np.testing.assert_array_equal(parsed.table["marker_bits"][:3], [3, 0, 0])
+    np.testing.assert_array_equal(parsed.table["kind"][:3], [1, 1, 2])
+    np.testing.assert_array_equal(parsed.table["play_config"][:3], [5218051] * 2 + [0])
+    assert not parsed.table.flags.writeable
+
+    waveform = Waveforms()
+    waveform[1] = (np.ones(512), np.ones(512), 15 * np.ones(512))
+    seq, _ = compile_seqc(waveform.get_sequence_snippet(), "HDAWG8", "", samplerate=0.0)
+    parsed = parse_waveform_descriptors(seq)
+    assert parse_waveform_descriptors(seq) is parsed
+    assert parse_waveform_descriptors(json.loads(descriptors)) is not parsed
+    with pytest.raises(TypeError):
+        parse_waveform_descriptors(1)
+
+
 def test_validate_str():
     waveform = Waveforms()
     waveform[1] = (np.ones(512), np.ones(512), 15 * np.ones(512))